@@ -1,131 +1,64 @@
-import gspread
-import pandas as pd
 import os
-import time
-from google.oauth2.service_account import Credentials
+
+import pandas as pd
+
+from trading_journal.metrics import stage, start_recording
+from trading_journal.pipeline import publish
+from trading_journal.sinks import REQUIRED_COLUMNS, sheets_sink
+from trading_journal.trade_store import TradeStore
 
 # -----------------------------
 # 👉 STEP 1: Google Sheets Setup
 # -----------------------------
 SHEET_NAME = "Trading Data"  # Change to your actual sheet name
 CREDENTIALS_FILE = "google_sheets_credentials.json"  # Replace with your credentials file path
+REFRESH_SHEET_KEYS = False  # Re-read the sheet's trades instead of trusting sheets_keys.json (e.g. after editing it by hand)
+METRICS_FILE = "Run-Logs/metrics.jsonl"  # API calls, retries and rate-limit waits of each run
 
-# Google Sheets Authentication
-scope = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
-creds = Credentials.from_service_account_file(CREDENTIALS_FILE, scopes=scope)
-client = gspread.authorize(creds)
+if __name__ == "__main__":
+    start_recording(METRICS_FILE, label="Google-Uploader")
 
-def get_gsheet():
+    # The key cache, failed-trade log and in-place updates are SheetsSink's, the same path
+    # Run-Pipeline.py and `python -m trading_journal upload-sheets` take
     try:
-        sheet = client.open(SHEET_NAME).sheet1  # Access the first sheet
-        return sheet
+        sink = sheets_sink(CREDENTIALS_FILE, SHEET_NAME, refresh_keys=REFRESH_SHEET_KEYS)
     except Exception as e:
         print(f"❌ Error: Unable to access Google Sheet - {e}")
         exit()
+    print("✅ Connected to Google Sheets!")
 
-sheet = get_gsheet()
-print("✅ Connected to Google Sheets!")
-
-# -----------------------------
-# 👉 STEP 2: Load the Cleaned Trade Data
-# -----------------------------
-trade_data_folder = "Trade-Data"
-files = [f for f in os.listdir(trade_data_folder) if f.startswith("Cleaned_Trades_") and f.endswith(".csv")]
-
-if not files:
-    print("❌ No cleaned trade data found. Run the first script first!")
-    exit()
-
-files.sort(reverse=True)
-csv_file = os.path.join(trade_data_folder, files[0])
-df = pd.read_csv(csv_file)
-print(f"✅ Loaded cleaned trade data from {csv_file}")
+    # -----------------------------
+    # 👉 STEP 2: Check for Unsynced Trades
+    # -----------------------------
+    # Only trades stored (or changed) since the last Google Sheets sync are sent
+    trade_store = TradeStore()
+    has_pending = trade_store.last_seq > trade_store.synced_seq(sink.name)
 
-# -----------------------------
-# 👉 STEP 3: Validate & Clean Data
-# -----------------------------
-def validate_and_clean_data(df):
-    required_columns = ["Quantity", "Symbol", "Side", "Pnl", "Pts", "Result", "Drt Category", "Session", 
-                        "ATR 1M", "ATR 5M", "Duration", "Buy Price", "Sell Price", "Bought Time", "Sold Time"]
-    missing_cols = [col for col in required_columns if col not in df.columns]
-    if missing_cols:
-        print(f"❌ Missing columns: {missing_cols}. Ensure the CSV format is correct.")
+    if not has_pending and not os.path.exists(sink.failed_path):
+        print("✅ No new or changed trades to upload. Run the first script to add trades!")
         exit()
-    
-    df["Bought Time"] = pd.to_datetime(df["Bought Time"], errors='coerce').dt.strftime("%Y-%m-%d %H:%M:%S")
-    df["Sold Time"] = pd.to_datetime(df["Sold Time"], errors='coerce').dt.strftime("%Y-%m-%d %H:%M:%S")
-    
-    numeric_fields = ["Pnl", "Pts", "ATR 1M", "ATR 5M", "Duration", "Buy Price", "Sell Price"]
-    for field in numeric_fields:
-        df[field] = pd.to_numeric(df[field], errors='coerce')
-    
-    df = df.dropna(subset=["Symbol", "Side", "Pnl", "Bought Time", "Sold Time"])
-    
-    # Replace NaN values in Duration with 1
-    df.fillna({"Duration": 1}, inplace=True)
-    
-    return df
-
-df = validate_and_clean_data(df)
-print(f"📊 Total trades before upload: {len(df)}")
-
-# -----------------------------
-# 👉 STEP 4: Fetch Existing Trades from Google Sheets
-# -----------------------------
-def fetch_existing_trades(sheet):
-    try:
-        existing_records = sheet.get_all_values()
-        headers = existing_records[0]  # First row contains headers
-        
-        # Find correct column indices for "Symbol" and "Bought Time"
-        symbol_index = headers.index("Symbol")
-        bought_time_index = headers.index("Bought Time")
-        
-        existing_trades = set()
-        
-        for row in existing_records[1:]:  # Skip headers
-            if len(row) > bought_time_index:
-                symbol = row[symbol_index].strip()
-                bought_time = row[bought_time_index].strip()
-
-                # Convert to standardized datetime format
-                bought_time = pd.to_datetime(bought_time, errors="coerce").strftime("%Y-%m-%d %H:%M:%S")
-                existing_trades.add((symbol, bought_time))
-        
-        return existing_trades
-    except Exception as e:
-        print(f"❌ Error fetching existing trades: {e}")
-        return set()
-
-existing_trades = fetch_existing_trades(sheet)
-print(f"🔍 Found {len(existing_trades)} existing trades in Google Sheets.")
-
-# -----------------------------
-# 👉 STEP 5: Upload New Trades to Google Sheets
-# -----------------------------
-def upload_trades_in_batches(sheet, trades):
-    try:
-        batch_data = []
-        for row in trades:
-            batch_data.append(row.tolist())
-
-        last_row = len(sheet.get_all_values()) + 1  # Find the last row
-        sheet.insert_rows(batch_data, row=last_row)  # Insert new trades below table
-        
-        print(f"✅ Uploaded {len(batch_data)} trades inside the table.")
-    except Exception as e:
-        print(f"❌ Error during batch upload: {e}")
 
-failed_trades = []
-print("🚀 Uploading new trades to Google Sheets in batch mode...")
-new_trades = [row for _, row in df.iterrows() if (row["Symbol"], row["Bought Time"]) not in existing_trades]
-
-if new_trades:
-    upload_trades_in_batches(sheet, new_trades)
-
-if failed_trades:
-    failed_df = pd.DataFrame(failed_trades)
-    failed_df.to_csv("failed_trades.csv", index=False)
-    print(f"⚠️ Some trades failed to upload. Saved to failed_trades.csv")
+    # -----------------------------
+    # 👉 STEP 3: Append New Trades & Rewrite Changed Ones
+    # -----------------------------
+    # New trades are appended in chunks, changed ones get just their changed cells rewritten in one request
+    if has_pending:
+        print("🚀 Uploading new and changed trades to Google Sheets in batch mode...")
+        result = publish(trade_store, [sink])[sink.name]
+    else:
+        # Nothing new, only failed_sheets_trades.csv is re-sent
+        with stage("google_sheets.replay") as s:
+            result = s.rows_out = sink.write(pd.DataFrame(columns=REQUIRED_COLUMNS))
+
+    # -----------------------------
+    # 👉 STEP 4: Report
+    # -----------------------------
+    if isinstance(result, Exception):
+        print("⚠️ The upload failed, these trades stay pending for the next run.")
+        exit()
 
-print("🎉 All new trades uploaded successfully!")
+    print(f"✅ {result} trades uploaded or updated in Google Sheets.")
+    if os.path.exists(sink.failed_path):
+        print(f"⚠️ Some trades failed to upload, they will be retried on the next run ({sink.failed_path}).")
+    else:
+        print("🎉 All new trades uploaded successfully!")
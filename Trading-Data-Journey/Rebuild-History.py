@@ -0,0 +1,55 @@
+import os
+import time
+
+from trading_journal.cleaning import fee_dict
+from trading_journal.market_data import BarCache
+from trading_journal.metrics import stage, start_recording
+from trading_journal.rebuild import rebuild_history
+from trading_journal.trade_store import TradeStore
+
+# -----------------------------
+# 📌 Settings
+# -----------------------------
+
+# Every export to re-clean; cleaned files from older versions in these folders are skipped
+history_sources = ["Old-Trade-Data", "Trade-Data"]
+
+# The rebuilt history goes to a fresh store, swap it in for Trade-Store/ once it looks right
+rebuild_store_folder = "Trade-Store-Rebuild"
+
+# Fee table to apply (edit fee_dict in trading_journal/cleaning.py, or pass a different dict here)
+fees = fee_dict
+
+# Worker processes, None uses every core
+max_workers = None
+
+merge_interleaved = False
+atr_timeframes = ["1m", "5m"]
+atr_periods = [14]
+
+# Each stage's time, rows, memory and API calls are appended here (see `python -m trading_journal metrics`)
+metrics_file = os.path.join("Run-Logs", "metrics.jsonl")
+
+# Worker processes re-import this file on some platforms, so only the main process runs the steps
+if __name__ == "__main__":
+    start_recording(metrics_file, label="Rebuild-History")
+
+    # -----------------------------
+    # 📌 STEP 1: Clean, Merge & Join ATR in Parallel
+    # -----------------------------
+    if os.path.exists(rebuild_store_folder):
+        print(f"❌ Error: {rebuild_store_folder} already exists, move it away before rebuilding")
+        exit()
+
+    started = time.perf_counter()
+    df = rebuild_history(history_sources, bar_cache=BarCache(), interleaved=merge_interleaved,
+                         timeframes=atr_timeframes, periods=atr_periods, fees=fees, max_workers=max_workers)
+    print(f"✅ Rebuilt {len(df)} trades in {time.perf_counter() - started:.1f}s")
+
+    # -----------------------------
+    # 📌 STEP 2: Save the Rebuilt History
+    # -----------------------------
+    trade_store = TradeStore(rebuild_store_folder)
+    with stage("store", rows_in=len(df)) as s:
+        new_count = s.rows_out = trade_store.insert(df)
+    print(f"✅ Saved {new_count} trades to: {trade_store.folder} ({len(df) - new_count} duplicates across exports)")
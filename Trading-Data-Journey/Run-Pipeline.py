@@ -0,0 +1,71 @@
+import os
+
+from trading_journal.analytics import AnalyticsCube
+from trading_journal.market_data import BarCache
+from trading_journal.metrics import start_recording
+from trading_journal.pipeline import run_pipeline
+from trading_journal.sinks import build_sinks
+from trading_journal.trade_store import TradeStore
+
+# -----------------------------
+# 👉 STEP 1: Settings
+# -----------------------------
+# One run instead of Data-Cleaner.py, Notion-Uploader.py and Google-Uploader.py one after another:
+# the exports are cleaned once and every enabled sink is updated at the same time.
+
+TRADE_DATA_PATH = os.path.join("Trade-Data", "trades.csv")  # One CSV, a folder or a glob
+STREAM_CHUNK_ROWS = None  # Rows per chunk for very large exports, None cleans everything at once
+MERGE_INTERLEAVED = False
+ATR_TIMEFRAMES = ["1m", "5m"]
+ATR_PERIODS = [14]
+
+# Notion
+ENABLE_NOTION = True
+NOTION_TOKEN = os.environ.get("NOTION_TOKEN", "")  # Your Notion integration token
+DATABASE_ID = "186e69f71a04806197eed7edba0a7000"  # Replace with your Notion database ID
+
+# Google Sheets
+ENABLE_GOOGLE_SHEETS = True
+SHEET_NAME = "Trading Data"  # Change to your actual sheet name
+CREDENTIALS_FILE = "google_sheets_credentials.json"  # Replace with your credentials file path
+
+# Local copy of every trade, set to a file name like "trades.sqlite" to enable
+SQLITE_PATH = None
+
+# Keep the analytics cube in Analytics/ up to date (see Trade-Analytics.py)
+UPDATE_ANALYTICS = True
+
+# Each stage's time, rows, memory and API calls are appended here (see `python -m trading_journal metrics`)
+METRICS_FILE = os.path.join("Run-Logs", "metrics.jsonl")
+PROFILE = None  # "cprofile" or "pyinstrument" to also write a profile of every stage to Run-Logs/profiles
+
+if __name__ == "__main__":
+    start_recording(METRICS_FILE, profile=PROFILE, label="Run-Pipeline")
+
+    # -----------------------------
+    # 👉 STEP 2: Set Up the Sinks
+    # -----------------------------
+    # Each sink's API client is only imported when that sink is enabled
+    sinks = build_sinks(notion_token=NOTION_TOKEN, database_id=DATABASE_ID if ENABLE_NOTION else None,
+                        credentials_file=CREDENTIALS_FILE, sheet_name=SHEET_NAME if ENABLE_GOOGLE_SHEETS else None,
+                        sqlite_path=SQLITE_PATH)
+
+    # -----------------------------
+    # 👉 STEP 3: Clean Once & Upload Everywhere
+    # -----------------------------
+    trade_store = TradeStore()
+    new_count, results = run_pipeline(TRADE_DATA_PATH, trade_store, sinks, chunk_rows=STREAM_CHUNK_ROWS,
+                                      bar_cache=BarCache(), interleaved=MERGE_INTERLEAVED,
+                                      timeframes=ATR_TIMEFRAMES, periods=ATR_PERIODS)
+    print(f"✅ {new_count} new or changed trades saved to: {trade_store.folder}")
+
+    for name, result in results.items():
+        if isinstance(result, Exception):
+            print(f"⚠️ {name}: failed, will retry next run")
+        else:
+            print(f"✅ {name}: {result} trades uploaded")
+
+    if UPDATE_ANALYTICS:
+        print(f"✅ {AnalyticsCube().update(trade_store)} trades folded into the analytics cube")
+
+    print("🎉 Pipeline finished!")
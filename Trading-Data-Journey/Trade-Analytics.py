@@ -0,0 +1,45 @@
+import os
+
+import pandas as pd
+
+from trading_journal.analytics import DEFAULT_ATR_BUCKETS, AnalyticsCube
+from trading_journal.metrics import start_recording
+from trading_journal.trade_store import TradeStore
+
+# -----------------------------
+# 📌 Settings
+# -----------------------------
+
+# Upper edges of the ATR regimes to slice by (changing them rebuilds the cube once)
+atr_buckets = DEFAULT_ATR_BUCKETS
+
+# Breakdowns to print: dimensions to group by, e.g. ["Session", "Side"] or ["ATR 5M Bucket"]
+breakdowns = [["Session"], ["Drt Category"], ["Side"], ["ATR 1M Bucket"], ["ATR 5M Bucket"]]
+
+# Only count trades in this range of trade dates and matching these dimensions (None / {} for all)
+since = None
+until = None
+where = {}  # e.g. {"Symbol": "MNQ", "Side": ["Long"]}
+
+# Each stage's time, rows, memory and API calls are appended here (see `python -m trading_journal metrics`)
+metrics_file = os.path.join("Run-Logs", "metrics.jsonl")
+
+if __name__ == "__main__":
+    start_recording(metrics_file, label="Trade-Analytics")
+
+    # -----------------------------
+    # 📌 STEP 1: Fold New Trades Into the Cube
+    # -----------------------------
+    trade_store = TradeStore()
+    cube = AnalyticsCube(atr_buckets=atr_buckets)
+    new_count = cube.update(trade_store)
+    print(f"✅ {new_count} trades folded into the analytics cube ({len(cube.cells)} cells)")
+
+    # -----------------------------
+    # 📌 STEP 2: Print the Breakdowns
+    # -----------------------------
+    with pd.option_context("display.max_columns", None, "display.width", 200):
+        print(cube.query(where=where, since=since, until=until).to_string(index=False))
+        for by in breakdowns:
+            print(f"\n📊 By {', '.join(by)}")
+            print(cube.query(by=by, where=where, since=since, until=until))
@@ -0,0 +1,57 @@
+import os
+
+from trading_journal.market_data import BarCache
+from trading_journal.metrics import start_recording
+from trading_journal.sinks import build_sinks
+from trading_journal.trade_store import TradeStore
+from trading_journal.watch import ExportWatcher
+
+# -----------------------------
+# 👉 STEP 1: Settings
+# -----------------------------
+# Leave this running while you trade: every fill appended to an export in TRADE_DATA_FOLDER is
+# cleaned, merged and ATR-tagged as it arrives, then sent to the enabled sinks. Stop with Ctrl+C.
+
+TRADE_DATA_FOLDER = "Trade-Data"
+POLL_INTERVAL = 1.0  # Seconds between checks when inotify is unavailable (non-Linux)
+MERGE_INTERLEAVED = False
+ATR_TIMEFRAMES = ["1m", "5m"]
+ATR_PERIODS = [14]
+
+# Notion
+ENABLE_NOTION = True
+NOTION_TOKEN = os.environ.get("NOTION_TOKEN", "")  # Your Notion integration token
+DATABASE_ID = "186e69f71a04806197eed7edba0a7000"  # Replace with your Notion database ID
+
+# Google Sheets
+ENABLE_GOOGLE_SHEETS = True
+SHEET_NAME = "Trading Data"  # Change to your actual sheet name
+CREDENTIALS_FILE = "google_sheets_credentials.json"  # Replace with your credentials file path
+
+# Local copy of every trade, set to a file name like "trades.sqlite" to enable
+SQLITE_PATH = None
+
+# Each publish's time, rows and API calls are appended here (see `python -m trading_journal metrics`)
+METRICS_FILE = os.path.join("Run-Logs", "metrics.jsonl")
+
+if __name__ == "__main__":
+    start_recording(METRICS_FILE, label="Watch-Trades")
+
+    # -----------------------------
+    # 👉 STEP 2: Set Up the Sinks
+    # -----------------------------
+    # Each sink's API client is only imported when that sink is enabled
+    sinks = build_sinks(notion_token=NOTION_TOKEN, database_id=DATABASE_ID if ENABLE_NOTION else None,
+                        credentials_file=CREDENTIALS_FILE, sheet_name=SHEET_NAME if ENABLE_GOOGLE_SHEETS else None,
+                        sqlite_path=SQLITE_PATH)
+
+    # -----------------------------
+    # 👉 STEP 3: Watch for New Fills
+    # -----------------------------
+    if not os.path.isdir(TRADE_DATA_FOLDER):
+        print(f"❌ Error: Trade data folder not found at {TRADE_DATA_FOLDER}")
+        exit()
+
+    watcher = ExportWatcher(TRADE_DATA_FOLDER, TradeStore(), sinks, bar_cache=BarCache(), poll_interval=POLL_INTERVAL,
+                            interleaved=MERGE_INTERLEAVED, timeframes=ATR_TIMEFRAMES, periods=ATR_PERIODS)
+    watcher.run()
@@ -0,0 +1 @@
+"""Offline benchmarks for the trade journal pipeline: synthetic exports, API fakes and stage timings."""
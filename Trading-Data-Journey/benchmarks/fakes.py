@@ -0,0 +1,378 @@
+import copy
+import re
+import sys
+import threading
+import time
+import types
+import uuid
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# 📌 Latency & Rate Limits
+# -----------------------------
+
+class FakeService:
+    """Shared behaviour of the fakes: a fixed latency per call and a rate limit.
+
+    Calls over `rate` per second (bursts of `burst`) are rejected the way the
+    real service does, with a 429 and a Retry-After header, so the client's
+    own pacing and retry code is what gets measured.
+    """
+
+    def __init__(self, latency=0.0, rate=None, burst=None):
+        self.latency = latency
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate or 1)
+        self.calls = Counter()
+        self.throttled = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _call(self, endpoint, error):
+        with self._lock:
+            self.calls[endpoint] += 1
+            if self.rate is not None:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens < 1:
+                    self.throttled += 1
+                    raise error(429, "rate_limited", (1 - self._tokens) / self.rate)
+                self._tokens -= 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def stats(self):
+        return {"calls": dict(self.calls), "throttled": self.throttled}
+
+
+# -----------------------------
+# 📌 yfinance
+# -----------------------------
+
+class FakeMarket(FakeService):
+    """Deterministic 1-minute random-walk bars for any ticker over a fixed span of days."""
+
+    def __init__(self, start="2025-02-03", end="2025-02-07", latency=0.0, rate=None, regular_hours=True):
+        super().__init__(latency=latency, rate=rate)
+        self.start = pd.Timestamp(start)
+        self.end = pd.Timestamp(end)
+        self.regular_hours = regular_hours
+        self._bars = {}
+
+    def bars(self, ticker):
+        """Every bar the market has for `ticker`, indexed by New York time like yfinance."""
+        if ticker not in self._bars:
+            minutes = pd.date_range(self.start.normalize(), self.end.normalize() + pd.Timedelta(days=1),
+                                    freq="1min", inclusive="left", tz="America/New_York", name="Datetime")
+            if self.regular_hours:
+                minute_of_day = minutes.hour * 60 + minutes.minute
+                minutes = minutes[(minutes.dayofweek < 5) & (minute_of_day >= 570) & (minute_of_day < 960)]
+
+            rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+            close = 21000 + np.cumsum(rng.normal(0, 3, len(minutes)))
+            open_ = np.concatenate([[close[0]] if len(close) else [], close[:-1]])
+            spread = np.abs(rng.normal(0, 2, len(minutes)))
+            self._bars[ticker] = pd.DataFrame({"Open": open_, "High": np.maximum(open_, close) + spread,
+                                               "Low": np.minimum(open_, close) - spread, "Close": close,
+                                               "Volume": rng.integers(1, 500, len(minutes))}, index=minutes)
+        return self._bars[ticker]
+
+    def history(self, ticker, period=None, interval="1m", start=None, end=None):
+        self._call("history", _YahooError)
+        bars = self.bars(ticker)
+        if interval != "1m":
+            bars = bars.resample(interval.replace("m", "min")).agg(
+                {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}).dropna()
+        if start is not None:
+            bars = bars[bars.index >= pd.Timestamp(start)]
+        if end is not None:
+            bars = bars[bars.index < pd.Timestamp(end)]
+        return bars.copy()
+
+    def module(self):
+        """A stand-in for the `yfinance` module backed by this market."""
+        market = self
+
+        class Ticker:
+            def __init__(self, ticker):
+                self.ticker = ticker
+
+            def history(self, period=None, interval="1m", start=None, end=None):
+                return market.history(self.ticker, period=period, interval=interval, start=start, end=end)
+
+        module = types.ModuleType("yfinance")
+        module.Ticker = Ticker
+        return module
+
+
+class _YahooError(Exception):
+    def __init__(self, status, code, retry_after=None):
+        super().__init__(f"{status} {code}")
+        self.status = status
+        self.headers = {"retry-after": f"{retry_after:.3f}"} if retry_after is not None else {}
+
+
+# -----------------------------
+# 📌 notion_client
+# -----------------------------
+
+class NotionAPIError(Exception):
+    """Shaped like notion_client's APIResponseError: `status`, `code` and `headers`."""
+
+    def __init__(self, status, code, retry_after=None):
+        super().__init__(f"{status} {code}")
+        self.status = status
+        self.code = code
+        self.headers = {"retry-after": f"{retry_after:.3f}"} if retry_after is not None else {}
+
+
+class FakeNotion(FakeService):
+    """An in-memory Notion workspace with the endpoints the uploader uses."""
+
+    def __init__(self, latency=0.0, rate=3, burst=None):
+        super().__init__(latency=latency, rate=rate, burst=burst)
+        self.pages = {}  # page id -> page, in creation order
+        self._pages_lock = threading.Lock()
+
+    def _now(self):
+        return pd.Timestamp.now(tz="UTC").strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+    def create_page(self, parent, properties):
+        self._call("pages.create", NotionAPIError)
+        page = {"object": "page", "id": str(uuid.uuid4()), "parent": parent, "last_edited_time": self._now(),
+                "properties": _notion_property_values(properties)}
+        with self._pages_lock:
+            self.pages[page["id"]] = page
+        return page
+
+    def update_page(self, page_id, properties):
+        self._call("pages.update", NotionAPIError)
+        with self._pages_lock:
+            if page_id not in self.pages:
+                raise NotionAPIError(404, "object_not_found")
+            page = self.pages[page_id]
+            page["properties"].update(_notion_property_values(properties))
+            page["last_edited_time"] = self._now()
+        return page
+
+    def query(self, database_id, filter=None, start_cursor=None, page_size=100, **_):
+        self._call("databases.query", NotionAPIError)
+        with self._pages_lock:
+            pages = [p for p in self.pages.values() if p["parent"].get("database_id") == database_id]
+        if filter is not None and "last_edited_time" in filter:
+            after = filter["last_edited_time"].get("on_or_after") or filter["last_edited_time"].get("after")
+            pages = [p for p in pages if p["last_edited_time"] >= after]
+
+        offset = int(start_cursor or 0)
+        results = pages[offset:offset + page_size]
+        has_more = offset + page_size < len(pages)
+        return {"object": "list", "results": results, "has_more": has_more,
+                "next_cursor": str(offset + page_size) if has_more else None}
+
+    def client(self, auth=None, **_):
+        """An object with the same `pages` / `databases` endpoints as notion_client.Client."""
+        workspace = self
+        return types.SimpleNamespace(
+            pages=types.SimpleNamespace(create=workspace.create_page, update=workspace.update_page),
+            databases=types.SimpleNamespace(query=workspace.query))
+
+    def module(self):
+        module = types.ModuleType("notion_client")
+        module.Client = self.client
+        module.APIResponseError = NotionAPIError
+        return module
+
+
+def _notion_date(start):
+    """Notion answers a date-time in its own form: milliseconds and a UTC offset ("...T18:34:13.000+00:00")."""
+    if not start or "T" not in start:
+        return start
+    moment = datetime.fromisoformat(start)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.isoformat(timespec="milliseconds")
+
+
+def _notion_property_values(properties):
+    """A copy of the sent properties as Notion stores them, so later changes by the caller don't leak in."""
+    properties = copy.deepcopy(properties)
+    for prop in properties.values():
+        if prop.get("date"):
+            prop["date"]["start"] = _notion_date(prop["date"].get("start"))
+    return properties
+
+
+# -----------------------------
+# 📌 gspread
+# -----------------------------
+
+class SheetsAPIError(Exception):
+    """Shaped like gspread's APIError, which carries the HTTP `response`."""
+
+    def __init__(self, status, code, retry_after=None):
+        super().__init__(f"{status} {code}")
+        headers = {"Retry-After": f"{retry_after:.3f}"} if retry_after is not None else {}
+        self.response = types.SimpleNamespace(status_code=status, headers=headers)
+
+
+_A1 = re.compile(r"^([A-Z]+)(\d*)(?::([A-Z]+)(\d*))?$")
+
+
+def _column_number(letters):
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - 64
+    return number
+
+
+def _a1_bounds(a1, row_count):
+    """(first row, last row, first column, last column), 1-based and inclusive."""
+    match = _A1.match(a1.split("!")[-1].upper())
+    if not match:
+        raise ValueError(f"Unsupported range: {a1}")
+    first_col, first_row, last_col, last_row = match.groups()
+    if last_col is None and first_row:
+        return int(first_row), int(first_row), _column_number(first_col), _column_number(first_col)  # "B2"
+
+    # "A:B", "B2:B" and "B" run to the last row
+    last_col = last_col or first_col
+    first_row = int(first_row) if first_row else 1
+    last_row = int(last_row) if last_row else row_count
+    return first_row, last_row, _column_number(first_col), _column_number(last_col)
+
+
+class FakeWorksheet:
+    """A worksheet as a list of string rows, with the gspread calls the uploader makes."""
+
+    def __init__(self, service, rows=None):
+        self.service = service
+        self.rows = [list(map(str, row)) for row in rows or []]
+        self._lock = threading.Lock()
+
+    @property
+    def row_count(self):
+        return len(self.rows)
+
+    def _range(self, a1):
+        first_row, last_row, first_col, last_col = _a1_bounds(a1, len(self.rows))
+        return [row[first_col - 1:last_col] for row in self.rows[first_row - 1:last_row]]
+
+    def get_all_values(self):
+        self.service._call("values.get", SheetsAPIError)
+        with self._lock:
+            return [list(row) for row in self.rows]
+
+    def row_values(self, row):
+        self.service._call("values.get", SheetsAPIError)
+        with self._lock:
+            return list(self.rows[row - 1]) if row <= len(self.rows) else []
+
+    def col_values(self, col):
+        self.service._call("values.get", SheetsAPIError)
+        with self._lock:
+            return [row[col - 1] if len(row) >= col else "" for row in self.rows]
+
+    def batch_get(self, ranges, **_):
+        self.service._call("values.batchGet", SheetsAPIError)
+        with self._lock:
+            return [self._range(a1) for a1 in ranges]
+
+    def insert_rows(self, values, row=1, **_):
+        self.service._call("values.batchUpdate", SheetsAPIError)
+        with self._lock:
+            self.rows[row - 1:row - 1] = [list(map(str, v)) for v in values]
+
+    def append_rows(self, values, **_):
+        self.service._call("values.append", SheetsAPIError)
+        with self._lock:
+            self.rows.extend(list(map(str, v)) for v in values)
+
+    def batch_update(self, data, **_):
+        self.service._call("values.batchUpdate", SheetsAPIError)
+        with self._lock:
+            for update in data:
+                first_row, _, first_col, _ = _a1_bounds(update["range"], len(self.rows))
+                for offset, values in enumerate(update["values"]):
+                    row_index = first_row - 1 + offset
+                    while len(self.rows) <= row_index:
+                        self.rows.append([])
+                    row = self.rows[row_index]
+                    row.extend([""] * (first_col - 1 + len(values) - len(row)))
+                    row[first_col - 1:first_col - 1 + len(values)] = list(map(str, values))
+
+
+class FakeSheets(FakeService):
+    """One fake spreadsheet per name, each with a single worksheet."""
+
+    def __init__(self, latency=0.0, rate=1, burst=None, header=None):
+        super().__init__(latency=latency, rate=rate, burst=burst)
+        self.header = header
+        self.spreadsheets = {}
+
+    def open(self, name):
+        if name not in self.spreadsheets:
+            worksheet = FakeWorksheet(self, [self.header] if self.header else [])
+            self.spreadsheets[name] = types.SimpleNamespace(title=name, sheet1=worksheet)
+        return self.spreadsheets[name]
+
+    def module(self):
+        module = types.ModuleType("gspread")
+        module.authorize = lambda credentials=None: self
+        module.exceptions = types.SimpleNamespace(APIError=SheetsAPIError)
+        return module
+
+
+# -----------------------------
+# 📌 Sinks
+# -----------------------------
+
+class FakeSink:
+    """A pipeline sink that only records when each trade reached it (see trading_journal/sinks.py)."""
+
+    def __init__(self, name="fake", latency=0.0):
+        self.name = name
+        self.latency = latency
+        self.trades = []
+        self.received_at = []  # time.perf_counter() of each trade's arrival
+
+    def write(self, trades):
+        if self.latency:
+            time.sleep(self.latency)
+        self.trades.append(trades)
+        self.received_at += [time.perf_counter()] * len(trades)
+        return len(trades)
+
+
+# -----------------------------
+# 📌 Installing the Fakes
+# -----------------------------
+
+def install_fakes(market=None, notion=None, sheets=None):
+    """Make `import yfinance` / `notion_client` / `gspread` return the given fakes.
+
+    Google service-account credentials are stubbed too, so the uploader
+    scripts themselves can run offline.
+    """
+    if market is not None:
+        sys.modules["yfinance"] = market.module()
+    if notion is not None:
+        sys.modules["notion_client"] = notion.module()
+    if sheets is not None:
+        sys.modules["gspread"] = sheets.module()
+
+        credentials = types.SimpleNamespace(from_service_account_file=lambda *args, **kwargs: None)
+        google = sys.modules.setdefault("google", types.ModuleType("google"))
+        oauth2 = types.ModuleType("google.oauth2")
+        service_account = types.ModuleType("google.oauth2.service_account")
+        service_account.Credentials = credentials
+        oauth2.service_account = service_account
+        google.oauth2 = oauth2
+        sys.modules["google.oauth2"] = oauth2
+        sys.modules["google.oauth2.service_account"] = service_account
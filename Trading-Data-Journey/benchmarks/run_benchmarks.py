@@ -0,0 +1,155 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.fakes import FakeMarket, FakeNotion, FakeSheets, install_fakes
+from benchmarks.synthetic import export_days, write_export
+from trading_journal.atr import atr_warmup, attach_atr, build_atr_frame
+from trading_journal.cleaning import clean_trades, finalize_trades
+from trading_journal.market_data import BarCache, data_ticker
+from trading_journal.merging import merge_trades
+from trading_journal.notion_sync import NotionUploader
+from trading_journal.sheets_sync import SheetsSync
+from trading_journal.trade_store import TradeStore
+
+# -----------------------------
+# 📌 Stage Timer
+# -----------------------------
+
+class StageTimer:
+    """Wall time, row counts and peak traced memory of each pipeline stage."""
+
+    def __init__(self, label):
+        self.label = label
+        self.stages = []
+
+    def run(self, stage, rows_in, func):
+        """Run `func()`, record how long it took; returns its result."""
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - started
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+
+        rows_out = len(result) if hasattr(result, "__len__") else result
+        self.stages.append({"benchmark": self.label, "stage": stage, "seconds": round(seconds, 4),
+                            "rows_in": rows_in, "rows_out": rows_out,
+                            "rows_per_sec": round(rows_in / seconds) if seconds else None,
+                            "peak_mb": round(peak_mb, 1)})
+        print(f"⏱️ {self.label:>10} {stage:<12} {seconds:9.3f}s {rows_in:>10} → {rows_out:<10} {peak_mb:8.1f} MB")
+        return result
+
+
+# -----------------------------
+# 📌 Pipeline Stages
+# -----------------------------
+
+def run_pipeline(rows, workdir, upload_rows=50, api_latency=0.05, api_rate=3, seed=0):
+    """Run every stage on a synthetic export of `rows` fills against the offline fakes."""
+    export_path = os.path.join(workdir, f"trades_{rows}.csv")
+    write_export(export_path, rows, seed=seed)
+
+    first_day, last_day = export_days(rows)
+    market = FakeMarket(start=first_day - pd.Timedelta(days=3), end=last_day + pd.Timedelta(days=1),
+                        latency=api_latency)
+    notion = FakeNotion(latency=api_latency, rate=api_rate)
+    sheets = FakeSheets(latency=api_latency, rate=api_rate)
+    install_fakes(market=market, notion=notion, sheets=sheets)
+
+    timer = StageTimer(f"{rows:,}")
+    raw = timer.run("read", rows, lambda: pd.read_csv(export_path))
+    cleaned = timer.run("clean", len(raw), lambda: clean_trades(raw))
+    merged = timer.run("merge", len(cleaned), lambda: merge_trades(cleaned))
+
+    def join_atr():
+        tickers = {symbol: data_ticker(symbol) for symbol in merged["symbol"].unique()}
+        since = merged["Trade Entry Time"].min() - atr_warmup()
+        bars = BarCache(os.path.join(workdir, f"Market-Data-{rows}")).history_many(tickers.values(), "1m",
+                                                                                   since=since)
+        atr = build_atr_frame({symbol: bars[ticker] for symbol, ticker in tickers.items()})
+        return finalize_trades(attach_atr(merged, atr))
+
+    trades = timer.run("atr join", len(merged), join_atr)
+
+    store = TradeStore(os.path.join(workdir, f"Trade-Store-{rows}"))
+    timer.run("store", len(trades), lambda: store.insert(trades))
+    timer.run("dedup", len(trades), lambda: store.insert(trades))  # Every trade is already stored
+
+    upload = trades.head(upload_rows)
+    uploader = NotionUploader(notion.client(), "benchmark-database")
+    timer.run("upload", len(upload), lambda: len(upload) - len(uploader.upload(upload, {})))
+
+    # Every trade goes to the sheet, it takes whole chunks per request
+    worksheet = sheets.open("Trading Data").sheet1
+    worksheet.append_rows([list(trades.columns)])
+    sheets_sync = SheetsSync(worksheet, "Trading Data", keys_path=os.path.join(workdir, f"sheets_keys_{rows}.json"),
+                             rate=api_rate)
+
+    def append_new():
+        new_trades = sheets_sync.new_trades(trades)  # Trades sharing a key go in once
+        return len(new_trades) - len(sheets_sync.append(new_trades))
+
+    timer.run("sheets", len(trades), append_new)
+
+    print(f"📡 Fake API calls: yfinance {market.stats()}, notion {notion.stats()}, sheets {sheets.stats()}")
+    return timer.stages
+
+
+# -----------------------------
+# 📌 Regression Check
+# -----------------------------
+
+def load_report(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_regressions(stages, baseline, tolerance=0.2):
+    """Stages that got more than `tolerance` slower than the same stage in `baseline`."""
+    previous = {(s["benchmark"], s["stage"]): s["seconds"] for s in baseline}
+    regressions = []
+    for stage in stages:
+        before = previous.get((stage["benchmark"], stage["stage"]))
+        if before and stage["seconds"] > before * (1 + tolerance):
+            regressions.append((stage, before))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time each pipeline stage on synthetic exports, fully offline.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="export sizes to benchmark (1k to 10M)")
+    parser.add_argument("--upload-rows", type=int, default=50, help="trades sent to the fake Notion per run")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="seconds each fake API call takes")
+    parser.add_argument("--api-rate", type=float, default=3, help="requests per second the fake Notion allows")
+    parser.add_argument("--report", help="write the stage timings here as JSON lines")
+    parser.add_argument("--baseline", help="earlier --report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    stages = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            print(f"🚀 Benchmarking {rows:,} rows...")
+            stages += run_pipeline(rows, workdir, upload_rows=args.upload_rows, api_latency=args.api_latency,
+                                   api_rate=args.api_rate)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            f.writelines(json.dumps(stage) + "\n" for stage in stages)
+        print(f"✅ Report saved to: {args.report}")
+
+    if args.baseline:
+        regressions = find_regressions(stages, load_report(args.baseline), args.tolerance)
+        for stage, before in regressions:
+            print(f"⚠️ {stage['benchmark']} {stage['stage']}: {before:.3f}s → {stage['seconds']:.3f}s")
+        if regressions:
+            sys.exit(1)
+        print("✅ No stage slower than the baseline.")
@@ -0,0 +1,135 @@
+import argparse
+import math
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# 📌 Synthetic Tradovate Exports
+# -----------------------------
+
+EXPORT_COLUMNS = ["symbol", "_priceFormat", "_priceFormatType", "_tickSize", "buyFillId", "sellFillId", "qty",
+                  "buyPrice", "sellPrice", "pnl", "boughtTimestamp", "soldTimestamp", "duration"]
+
+# Contract code, tick size, dollars per point, price level and how often it is traded
+CONTRACTS = {"MNQH5": (0.25, 2, 21000.0, 0.6), "NQH5": (0.25, 20, 21000.0, 0.25), "MYMH5": (1.0, 0.5, 44000.0, 0.15)}
+
+# Trades are stamped 8 hours ahead of New York, so the 09:30 open reads 17:30
+SESSION_OPEN = pd.Timedelta(hours=17, minutes=30)
+SESSION_LENGTH = 6.5 * 3600
+
+FIRST_FILL_ID = 173778820000
+
+
+def _format_pnl(pnl):
+    """Dollar amounts the way Tradovate writes them: "$12.50" and "$(2.50)"."""
+    amounts = pd.Series(np.abs(pnl)).map("{:.2f}".format)
+    return np.where(pnl < 0, "$(" + amounts + ")", "$" + amounts)
+
+
+def _format_duration(seconds):
+    """"1min 53sec" style durations, "30sec" under a minute."""
+    minutes = pd.Series(seconds // 60).astype(str)
+    rest = pd.Series(seconds % 60).astype(str) + "sec"
+    return np.where(seconds >= 60, minutes + "min " + rest, rest)
+
+
+def generate_export(rows, seed=0, start="2025-02-03", trades_per_day=2000, partial_fill_rate=0.2,
+                    first_fill_id=FIRST_FILL_ID):
+    """Build `rows` fills of a Tradovate export, in entry-time order.
+
+    Roughly `partial_fill_rate` of the fills continue the previous trade a
+    few seconds later at the same price level, so the merge step has real
+    work to do. Trading days are consecutive business days from `start`.
+    """
+    rng = np.random.default_rng(seed)
+
+    # Each fill either opens a new trade or adds to the one before it
+    continues = rng.random(rows) < partial_fill_rate
+    continues[0] = False
+    trade_ids = np.cumsum(~continues) - 1
+    trades = trade_ids[-1] + 1 if rows else 0
+
+    codes = list(CONTRACTS)
+    contract = rng.choice(len(codes), size=trades, p=[spec[3] for spec in CONTRACTS.values()])[trade_ids]
+    tick_size = np.array([spec[0] for spec in CONTRACTS.values()])[contract]
+    multiplier = np.array([spec[1] for spec in CONTRACTS.values()])[contract]
+    level = np.array([spec[2] for spec in CONTRACTS.values()])[contract]
+    is_long = (rng.random(trades) < 0.5)[trade_ids]
+
+    # Entry times spread over the regular session of each trading day
+    days = pd.bdate_range(start, periods=max(1, math.ceil(rows / trades_per_day)))
+    day_of_fill = np.sort(rng.integers(0, len(days), size=trades))[trade_ids]
+    second_of_day = np.sort(rng.random(trades) * SESSION_LENGTH)[trade_ids]
+    trade_start = (days.values[day_of_fill] + SESSION_OPEN.to_timedelta64()
+                   + (second_of_day * 1e9).astype("timedelta64[ns]"))
+    fill_delay = np.where(continues, rng.integers(0, 4, size=rows), 0).astype("timedelta64[s]")
+    entry_time = (trade_start + fill_delay).astype("datetime64[s]")
+
+    # A random walk keeps prices plausible, exits land on whole ticks
+    drift = np.cumsum(rng.normal(0, 2, size=trades))[trade_ids]
+    entry_price = np.round((level + drift) / tick_size) * tick_size
+    entry_price += np.where(continues, rng.integers(-2, 3, size=rows), 0) * tick_size
+    exit_price = entry_price + rng.integers(-40, 41, size=rows) * tick_size
+    qty = rng.integers(1, 6, size=rows)
+
+    duration = np.maximum(1, rng.lognormal(3.5, 1.2, size=rows)).astype(np.int64)
+    exit_time = entry_time + duration.astype("timedelta64[s]")
+
+    # The opening fill always has the lower id
+    fill_ids = first_fill_id + np.arange(rows, dtype=np.int64) * 100
+    entry_fill, exit_fill = fill_ids + rng.integers(1, 20, size=rows), fill_ids + rng.integers(20, 99, size=rows)
+
+    buy_price = np.where(is_long, entry_price, exit_price)
+    sell_price = np.where(is_long, exit_price, entry_price)
+    bought = np.where(is_long, entry_time, exit_time)
+    sold = np.where(is_long, exit_time, entry_time)
+
+    return pd.DataFrame({
+        "symbol": np.array(codes)[contract],
+        "_priceFormat": -2,
+        "_priceFormatType": 0,
+        "_tickSize": tick_size,
+        "buyFillId": np.where(is_long, entry_fill, exit_fill),
+        "sellFillId": np.where(is_long, exit_fill, entry_fill),
+        "qty": qty,
+        "buyPrice": buy_price,
+        "sellPrice": sell_price,
+        "pnl": _format_pnl((sell_price - buy_price) * qty * multiplier),
+        "boughtTimestamp": pd.Series(bought).dt.strftime("%m/%d/%Y %H:%M:%S"),
+        "soldTimestamp": pd.Series(sold).dt.strftime("%m/%d/%Y %H:%M:%S"),
+        "duration": _format_duration(duration),
+    }, columns=EXPORT_COLUMNS)
+
+
+def export_days(rows, trades_per_day=2000, start="2025-02-03"):
+    """First and last trading day an export of `rows` fills covers."""
+    days = pd.bdate_range(start, periods=max(1, math.ceil(rows / trades_per_day)))
+    return days[0], days[-1]
+
+
+def write_export(path, rows, seed=0, chunk_rows=1_000_000, start="2025-02-03", trades_per_day=2000, **options):
+    """Write a synthetic export to `path` in chunks, so 10M rows never sit in memory at once."""
+    chunk_rows = max(trades_per_day, chunk_rows // trades_per_day * trades_per_day)  # Whole days per chunk
+    written = 0
+    for chunk in range(math.ceil(rows / chunk_rows)):
+        size = min(chunk_rows, rows - written)
+        chunk_start = pd.bdate_range(start, periods=1 + written // trades_per_day)[-1]
+        export = generate_export(size, seed=seed + chunk, start=chunk_start, trades_per_day=trades_per_day,
+                                 first_fill_id=FIRST_FILL_ID + written * 100, **options)
+        export.to_csv(path, index=False, mode="w" if chunk == 0 else "a", header=chunk == 0)
+        written += size
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic Tradovate export.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("path")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", default="2025-02-03")
+    parser.add_argument("--trades-per-day", type=int, default=2000)
+    args = parser.parse_args()
+
+    write_export(args.path, args.rows, seed=args.seed, start=args.start, trades_per_day=args.trades_per_day)
+    print(f"✅ Wrote {args.rows} synthetic fills to {args.path}")
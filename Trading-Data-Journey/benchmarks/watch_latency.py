@@ -0,0 +1,132 @@
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fakes import FakeMarket, FakeSink, install_fakes
+from benchmarks.synthetic import EXPORT_COLUMNS, generate_export
+from trading_journal.market_data import BarCache
+from trading_journal.merging import MERGE_WINDOW_SECONDS
+from trading_journal.trade_store import TradeStore
+from trading_journal.watch import ExportWatcher, trade_clock_now
+
+# -----------------------------
+# 📌 Live Fill Writer
+# -----------------------------
+
+def live_trade(template, fill_id, now, rng, is_long, partial_fill_rate=0.3):
+    """One trade's fill rows (sometimes two partial fills), entered at `now` like a fill that just happened."""
+    row = template.copy()
+    # Longs and shorts trade different contracts, so a long bought at the same second as
+    # an earlier short (bought 7 seconds after its entry) doesn't share its store key
+    row["symbol"], row["_tickSize"] = ("MNQH5", 0.25) if is_long else ("NQH5", 0.25)
+    entry = now.floor("s")
+    exit_ = entry + pd.Timedelta(seconds=7)
+    fills = []
+    for n in range(2 if rng.random() < partial_fill_rate else 1):
+        fill = row.copy()
+        fill_entry = entry + pd.Timedelta(seconds=n)
+        bought, sold = (fill_entry, exit_) if is_long else (exit_, fill_entry)
+        entry_fill, exit_fill = fill_id + 2 * n, fill_id + 2 * n + 1  # The opening fill has the lower id
+        fill["buyFillId"], fill["sellFillId"] = (entry_fill, exit_fill) if is_long else (exit_fill, entry_fill)
+        fill["boughtTimestamp"] = bought.strftime("%m/%d/%Y %H:%M:%S")
+        fill["soldTimestamp"] = sold.strftime("%m/%d/%Y %H:%M:%S")
+        fill["duration"] = f"{int((exit_ - fill_entry).total_seconds())}sec"
+        fills.append(fill)
+    return pd.DataFrame(fills, columns=EXPORT_COLUMNS)
+
+
+def write_fills(path, trades, interval, written_at, held_for, seed=0):
+    """Append `trades` trades to `path`, one write every `interval` seconds, like a live export.
+
+    `held_for` gets how long the watcher has to hold each trade back: until the
+    next trade's fills show it is finished, or its merge window runs out.
+    """
+    rng = np.random.default_rng(seed)
+    templates = generate_export(trades, seed=seed, partial_fill_rate=0)
+    pd.DataFrame(columns=EXPORT_COLUMNS).to_csv(path, index=False)
+    rows = 0
+    window_left = []
+    for i in range(trades):
+        # Sides alternate so back-to-back trades aren't merged into one
+        now = trade_clock_now()
+        fills = live_trade(templates.iloc[i], 900_000_000_000 + i * 10, now, rng, is_long=i % 2 == 0)
+        with open(path, "a") as f:
+            fills.to_csv(f, index=False, header=False)
+        written_at.append(time.perf_counter())
+        window_left.append(MERGE_WINDOW_SECONDS - (now - now.floor("s")).total_seconds())
+        rows += len(fills)
+        time.sleep(interval)
+    next_write = np.append(np.diff(written_at), np.inf)
+    held_for += np.minimum(next_write, window_left).tolist()
+    return rows
+
+
+# -----------------------------
+# 📌 Latency Run
+# -----------------------------
+
+def run_watch(trades=30, interval=1.0, sink_latency=0.05, use_inotify=True):
+    """Watch a folder while fills are written to it.
+
+    Returns per-trade latencies from write to sink, how much of each was the
+    merge hold-back, and the rows written and parsed.
+    """
+    now = pd.Timestamp.now(tz="America/New_York")
+    install_fakes(market=FakeMarket(start=now - pd.Timedelta(days=4), end=now, regular_hours=False))
+    sinks = [FakeSink("fake_notion", latency=sink_latency), FakeSink("fake_sheets", latency=sink_latency)]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        folder = os.path.join(workdir, "Trade-Data")
+        os.makedirs(folder)
+        watcher = ExportWatcher(folder, TradeStore(os.path.join(workdir, "Trade-Store")), sinks,
+                                bar_cache=BarCache(os.path.join(workdir, "Market-Data")), use_inotify=use_inotify,
+                                poll_interval=0.5 if use_inotify else 0.1)
+        stop = threading.Event()
+        thread = threading.Thread(target=watcher.run, args=(stop,))
+        thread.start()
+
+        written_at, held_for = [], []
+        rows = write_fills(os.path.join(folder, "trades.csv"), trades, interval, written_at, held_for)
+        deadline = time.perf_counter() + 30
+        while min(len(sink.received_at) for sink in sinks) < trades and time.perf_counter() < deadline:
+            time.sleep(0.05)
+        stop.set()
+        thread.join()
+
+    latencies = {sink.name: np.array(sink.received_at[:trades]) - np.array(written_at[:len(sink.received_at)])
+                 for sink in sinks}
+    return latencies, np.array(held_for), rows, watcher.rows_read
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure write-to-sink latency of the live watch mode, offline.")
+    parser.add_argument("--trades", type=int, default=30)
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="seconds between writes (trades are stamped to the second, so keep it at 1 or more)")
+    parser.add_argument("--sink-latency", type=float, default=0.05, help="seconds each fake sink write takes")
+    parser.add_argument("--poll", action="store_true", help="use the polling fallback instead of inotify")
+    args = parser.parse_args()
+
+    latencies, held_for, rows, rows_read = run_watch(args.trades, args.interval, args.sink_latency,
+                                                     use_inotify=not args.poll)
+    print(f"⏸️ merge hold-back: p50 {np.median(held_for):.3f}s, max {held_for.max():.3f}s "
+          f"(a trade waits for the next fill or for its {MERGE_WINDOW_SECONDS}s merge window)")
+    worst = 0.0
+    for name, latency in latencies.items():
+        past_hold = latency - held_for[:len(latency)]
+        print(f"⏱️ {name}: {len(latency)} trades, write to sink p50 {np.median(latency):.3f}s, "
+              f"max {latency.max():.3f}s; past the hold-back p50 {np.median(past_hold):.3f}s, "
+              f"p95 {np.percentile(past_hold, 95):.3f}s, max {past_hold.max():.3f}s")
+        worst = max(worst, past_hold.max())
+    print(f"📄 {rows} fill rows written, {rows_read} parsed")
+
+    if rows_read != rows or worst >= 1.0:
+        print("⚠️ Rows were parsed more than once or a trade took a second or more past its hold-back")
+        sys.exit(1)
+    print("✅ Every trade reached the sinks within a second of its hold-back, each row parsed once.")
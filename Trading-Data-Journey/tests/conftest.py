@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The scripts run from Trading-Data-Journey/, so the tests import trading_journal and benchmarks from there too
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
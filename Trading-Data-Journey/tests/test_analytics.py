@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_journal.analytics import AnalyticsCube
+from trading_journal.schema import DURATION_CATEGORIES, SESSIONS
+from trading_journal.sinks import REQUIRED_COLUMNS
+from trading_journal.trade_store import TradeStore
+
+
+def random_trades(count, seed=0):
+    rng = np.random.default_rng(seed)
+    bought = pd.Timestamp("2025-02-03 18:00:00") + pd.to_timedelta(np.sort(rng.choice(10 * 86400, count,
+                                                                                      replace=False)), unit="s")
+    pts = rng.integers(-20, 21, count) * 0.25
+    duration = rng.integers(5, 900, count)
+    return pd.DataFrame({
+        "Quantity": rng.integers(1, 4, count), "Symbol": rng.choice(["MNQ", "NQ", "MYM"], count),
+        "Side": rng.choice(["Long", "Short"], count), "Pnl": (pts * 2 - 1.57).round(2), "Pts": pts,
+        "Result": np.select([pts > 0, pts < 0], ["Win", "Loss"], "Breakeven"),
+        "Drt Category": rng.choice(DURATION_CATEGORIES, count), "Session": rng.choice(SESSIONS, count),
+        "ATR 1M": rng.uniform(2, 50, count).round(1), "ATR 5M": rng.uniform(5, 100, count).round(1),
+        "Duration": duration, "Buy Price": 21000.0, "Sell Price": 21000.0 + pts, "Bought Time": bought,
+        "Sold Time": bought + pd.to_timedelta(duration, unit="s"),
+    })[REQUIRED_COLUMNS]
+
+
+def test_batches_fold_into_the_same_cells_as_one_pass(tmp_path):
+    trades = random_trades(600)
+    store = TradeStore(str(tmp_path / "Trade-Store"))
+    cube = AnalyticsCube(str(tmp_path / "batched"))
+    for batch in np.array_split(np.arange(len(trades)), 3):
+        store.insert(trades.iloc[batch])
+        assert cube.update(store) == len(batch)
+
+    one_pass = AnalyticsCube(str(tmp_path / "one-pass"))
+    assert one_pass.update(store) == 600
+    # Reopened from disk there is nothing left to fold in
+    assert AnalyticsCube(str(tmp_path / "batched")).update(store) == 0
+
+    by = ["Symbol", "Session"]
+    pd.testing.assert_frame_equal(cube.query(by=by), one_pass.query(by=by))
+
+    expected = trades.groupby(by).agg(Trades=("Pnl", "size"), Wins=("Result", lambda r: (r == "Win").sum()),
+                                      Total=("Pnl", "sum"))
+    result = cube.query(by=by)
+    expected = expected.reindex(result.index.tolist())  # The cube lists labels in the journal's order
+    assert result["Trades"].tolist() == expected["Trades"].tolist()
+    assert result["Wins"].tolist() == expected["Wins"].tolist()
+    np.testing.assert_allclose(result["Total Pnl"], expected["Total"].round(2))
+
+    long_mnq = trades[(trades["Symbol"] == "MNQ") & (trades["Side"] == "Long")]
+    assert cube.query(where={"Symbol": "MNQ", "Side": "Long"})["Trades"].iloc[0] == len(long_mnq)
+
+
+def test_changed_trade_is_not_counted_twice(tmp_path):
+    trades = random_trades(100)
+    store = TradeStore(str(tmp_path / "Trade-Store"))
+    store.insert(trades)
+    cube = AnalyticsCube(str(tmp_path / "Analytics"))
+    cube.update(store)
+
+    changed = trades.iloc[[10]].assign(Pnl=trades["Pnl"].iloc[10] + 100)
+    store.insert(changed)
+    cube.update(store)
+    total = cube.query()
+    assert total["Trades"].iloc[0] == 100
+    assert total["Total Pnl"].iloc[0] == pytest.approx(round(trades["Pnl"].sum() + 100, 2))
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_journal.atr import IncrementalATR, atr_warmup, compute_atr
+
+
+def minute_bars(start, days, seed=0):
+    """A 1-minute random walk, with the market closed on Saturdays."""
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(start, periods=days * 24 * 60, freq="min", tz="UTC")
+    times = times[times.dayofweek != 5]
+    close = 21000 + np.cumsum(rng.normal(0, 2, len(times)))
+    wick = rng.uniform(0, 3, (2, len(times)))
+    return pd.DataFrame({"Datetime": times, "Open": close, "High": close + wick[0], "Low": close - wick[1],
+                         "Close": close, "Volume": 1.0})
+
+
+def test_incremental_atr_matches_compute_atr_once_bars_close():
+    bars = minute_bars("2025-02-03", days=1)
+    batch = compute_atr(bars, timeframes=("1m", "5m"), periods=(14, 20))
+    # Bars arrive in chunks, as they would while watching
+    atr = IncrementalATR(("1m", "5m"), (14, 20))
+    incremental = pd.concat([atr.update(bars.iloc[start:start + 200]) for start in range(0, len(bars), 200)],
+                            ignore_index=True)
+
+    assert (incremental["Datetime"] == batch["Datetime"]).all()
+    for column in ("ATR 1M", "ATR 1M (20)"):
+        np.testing.assert_allclose(incremental[column], batch[column])
+    # A 5-minute bar has closed at its last minute
+    closed = (bars["Datetime"].dt.minute % 5 == 4).to_numpy()
+    for column in ("ATR 5M", "ATR 5M (20)"):
+        np.testing.assert_allclose(incremental[column][closed], batch[column][closed])
+
+
+def test_warmup_is_enough_for_the_longest_timeframe():
+    bars = minute_bars("2025-01-01", days=60)
+    trade_time = bars["Datetime"].iloc[-1]
+    full = compute_atr(bars, timeframes=("1m", "4h")).iloc[-1]
+    since = trade_time - atr_warmup(("1m", "4h"))
+    warmed = compute_atr(bars[bars["Datetime"] >= since], timeframes=("1m", "4h")).iloc[-1]
+    # Trades carry ATR rounded to 0.1
+    assert warmed["ATR 4H"] == pytest.approx(full["ATR 4H"], abs=0.05)
+    assert warmed["ATR 1M"] == pytest.approx(full["ATR 1M"], abs=1e-9)
@@ -0,0 +1,48 @@
+import glob
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_journal.cleaning import (categorize_duration, categorize_session, clean_pnl_column, clean_trades,
+                                      finalize_trades, parse_duration, parse_pnl, round_cents)
+from trading_journal.merging import merge_trades
+
+TRADE_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Trade-Data")
+
+# Each cleaned file sits next to the Tradovate export it was made from. The "1st eval" output predates
+# the current fee table and merge order, so it isn't a reference for today's cleaner.
+CLEANED_FILES = sorted(glob.glob(os.path.join(TRADE_DATA, "Cleaned_Trades_*.csv")))
+
+
+@pytest.mark.parametrize("cleaned_path", CLEANED_FILES, ids=os.path.basename)
+def test_cleaning_matches_committed_output(cleaned_path):
+    expected = pd.read_csv(cleaned_path)
+    export = pd.read_csv(os.path.join(os.path.dirname(cleaned_path), "trades.csv"))
+
+    # ATR comes from Yahoo bars rather than from the export, so only the cleaned columns are compared
+    columns = [col for col in expected.columns if not col.startswith("ATR")]
+    cleaned = finalize_trades(merge_trades(clean_trades(export)), atr_columns=[])
+
+    # Compare what the cleaner writes, read back the same way as the committed file
+    written = pd.read_csv(io.StringIO(cleaned[columns].to_csv(index=False)))
+    pd.testing.assert_frame_equal(written, expected[columns])
+
+
+def test_column_parsers():
+    assert parse_pnl(pd.Series(["$12.50", "$(2.50)", "$1,234.00"])).tolist() == [12.5, -2.5, 1234.0]
+    # Half-cent ties round like Python's round(), not like np.round
+    ties = [-3.285, 2.675, 1.005, 0.125]
+    assert round_cents(pd.Series(ties)).tolist() == [round(value, 2) for value in ties]
+    assert clean_pnl_column(pd.Series(["$(2.50)"]), pd.Series(["MNQ"]), pd.Series([2])).tolist() == [-4.07]
+
+    assert parse_duration(pd.Series(["1min 53sec", "30sec"])).tolist() == [113, 30]
+    assert parse_duration(pd.Series(["2min 0sec", "n/a"])).isna().tolist() == [False, True]
+    assert categorize_duration(pd.Series([30, 31, 120, 300, 301, np.nan])).tolist() == [
+        "0-30 sec", "30-120 sec", "30-120 sec", "2-5 min", "5+ min", "5+ min"]
+
+    entries = pd.Series(pd.to_datetime(["2025-02-03 17:29:59", "2025-02-03 17:30:00", "2025-02-03 18:00:00",
+                                        "2025-02-03 18:30:00", "2025-02-03 19:30:00"]))
+    assert categorize_session(entries).tolist() == ["2+ hour", "0-30 min", "30-60 min", "1-2 hour", "2+ hour"]
@@ -0,0 +1,37 @@
+import sys
+
+import pandas as pd
+import pytest
+
+from benchmarks.fakes import FakeMarket
+from benchmarks.synthetic import write_export
+from trading_journal.ingest import StreamingCleaner, clean_exports, read_exports
+from trading_journal.market_data import BarCache
+
+
+@pytest.fixture
+def bar_cache(tmp_path, monkeypatch):
+    market = FakeMarket(start="2024-12-20", end="2025-02-20", regular_hours=False)
+    monkeypatch.setitem(sys.modules, "yfinance", market.module())
+    return BarCache(str(tmp_path / "Market-Data"))
+
+
+def by_key(trades):
+    trades = trades.drop_duplicates(subset=["Symbol", "Bought Time"], keep="last")
+    return trades.sort_values(["Symbol", "Bought Time"]).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("interleaved", [False, True])
+def test_streaming_matches_the_batch_clean(tmp_path, bar_cache, interleaved):
+    path = write_export(str(tmp_path / "export.csv"), 3000, trades_per_day=400)
+    timeframes = ("1m", "5m", "4h")
+    batch = clean_exports([path], bar_cache=bar_cache, interleaved=interleaved, timeframes=timeframes)
+
+    # Chunks end in the middle of trades, which the cleaner has to hold back
+    cleaner = StreamingCleaner(bar_cache=bar_cache, interleaved=interleaved, timeframes=timeframes)
+    stream = pd.concat([cleaner.process(chunk) for chunk in read_exports([path], chunksize=487)]
+                       + [cleaner.flush()], ignore_index=True)
+
+    assert batch["ATR 4H"].notna().all()
+    assert len(stream) == len(batch)
+    pd.testing.assert_frame_equal(by_key(stream), by_key(batch))
@@ -0,0 +1,52 @@
+import pandas as pd
+
+from trading_journal.market_data import MAX_LOOKBACK, BarCache
+
+
+class RecordingFetcher:
+    """Minute bars up to each request's end, remembering every request."""
+
+    def __init__(self, first_bar):
+        self.first_bar = pd.Timestamp(first_bar)
+        self.requests = []
+
+    def fetch(self, ticker, interval, start=None, end=None, period="7d"):
+        self.requests.append((start, end))
+        start = self.first_bar if start is None else max(pd.Timestamp(start), self.first_bar)
+        end = self.first_bar + pd.Timedelta(hours=2) if end is None else pd.Timestamp(end)
+        times = pd.date_range(start.ceil("min"), end, freq="min", inclusive="left")
+        close = pd.Series(range(len(times)), dtype=float) + 21000
+        return pd.DataFrame({"Datetime": times, "Open": close, "High": close + 1, "Low": close - 1,
+                             "Close": close, "Volume": 10.0})
+
+
+def test_update_fetches_only_the_missing_tail(tmp_path):
+    fetcher = RecordingFetcher("2025-02-03 14:00:00+00:00")
+    cache = BarCache(str(tmp_path), fetcher=fetcher)
+    assert cache.update("MNQ=F", "1m") == 120
+    assert cache.last_bar_time("MNQ=F", "1m") == pd.Timestamp("2025-02-03 15:59:00+00:00")
+
+    # Only the bars after the last cached one, which is fetched again in case it was still forming
+    now = pd.Timestamp("2025-02-03 16:30:00+00:00")
+    assert cache.update("MNQ=F", "1m", now=now) == 31
+    assert fetcher.requests[-1] == (pd.Timestamp("2025-02-03 15:59:00+00:00"), now)
+    bars = cache.load("MNQ=F", "1m")
+    assert len(bars) == 150 and bars["Datetime"].is_unique and bars["Datetime"].is_monotonic_increasing
+
+    # Up to date while the last cached bar is still the current one: no request at all
+    assert cache.update("MNQ=F", "1m", now=pd.Timestamp("2025-02-03 16:29:40+00:00")) == 0
+    assert len(fetcher.requests) == 2
+
+
+def test_gap_longer_than_the_lookback_starts_at_the_limit(tmp_path):
+    fetcher = RecordingFetcher("2025-02-03 14:00:00+00:00")
+    cache = BarCache(str(tmp_path), fetcher=fetcher)
+    cache.update("MNQ=F", "1m")
+
+    now = pd.Timestamp("2025-02-20 14:00:00+00:00")
+    cache.update("MNQ=F", "1m", now=now)
+    assert fetcher.requests[-1][0] == now - MAX_LOOKBACK["1m"]
+    # The older days stay cached next to the new ones
+    bars = cache.load("MNQ=F", "1m")
+    assert (bars["Datetime"] < now - MAX_LOOKBACK["1m"]).sum() == 120
+    assert len(cache.load("MNQ=F", "1m", since="2025-02-13")) == 7 * 24 * 60
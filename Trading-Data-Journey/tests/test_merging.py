@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_journal.cleaning import clean_trades
+from trading_journal.merging import MAX_VECTOR_PASSES, MERGE_WINDOW_SECONDS, assign_merge_groups, merge_trades
+
+
+def make_fills(fills):
+    """A raw export from (symbol, side, entry time, seconds held, qty) tuples."""
+    rows = []
+    for fill_id, (symbol, side, entry, held, qty) in enumerate(fills):
+        entry = pd.Timestamp(entry)
+        exit_ = entry + pd.Timedelta(seconds=held)
+        bought, sold = (entry, exit_) if side == "Long" else (exit_, entry)
+        rows.append({"symbol": symbol, "_priceFormat": -2, "_priceFormatType": 0, "_tickSize": 0.25,
+                     "buyFillId": 10 * fill_id + (1 if side == "Long" else 2),
+                     "sellFillId": 10 * fill_id + (2 if side == "Long" else 1), "qty": qty,
+                     "buyPrice": 21000.0, "sellPrice": 21002.0, "pnl": f"${4 * qty:.2f}",
+                     "boughtTimestamp": bought.strftime("%m/%d/%Y %H:%M:%S"),
+                     "soldTimestamp": sold.strftime("%m/%d/%Y %H:%M:%S"), "duration": f"{held}sec"})
+    return pd.DataFrame(rows)
+
+
+def reference_groups(df, interleaved=False, window=MERGE_WINDOW_SECONDS):
+    """The merge as a plain loop: each row joins the current trade or starts the next one."""
+    order = range(len(df))
+    if interleaved:
+        order = np.lexsort((np.arange(len(df)), df["Trade Entry Time"].to_numpy(), df["Side"].to_numpy(),
+                            df["symbol"].to_numpy()))
+    contract = df["symbol"] if interleaved else df["symbol"].str[:2]
+    entry = df["Trade Entry Time"].astype("datetime64[ns]").astype(np.int64) / 1e9
+    groups, head = np.empty(len(df), dtype=np.int64), None
+    for row in order:
+        if head is not None:
+            gap = entry[row] - entry[head]
+            if (contract[row] == contract[head] and df["Side"][row] == df["Side"][head] and gap <= window
+                    and df["duration"][row] > gap and df["duration"][head] > gap):
+                groups[row] = head
+                continue
+        head = groups[row] = row
+    return groups
+
+
+def test_partial_fills_merge_into_one_trade():
+    raw = make_fills([("MNQH5", "Long", "2025-02-03 18:00:00", 60, 1),
+                      ("MNQH5", "Long", "2025-02-03 18:00:03", 60, 2),
+                      ("MNQH5", "Short", "2025-02-03 18:00:04", 60, 1),
+                      ("MNQH5", "Short", "2025-02-03 18:00:20", 60, 1)])
+    trades = merge_trades(clean_trades(raw))
+    assert trades["qty"].tolist() == [3, 1, 1]
+    assert trades["Side"].tolist() == ["Long", "Short", "Short"]
+    # Merged trades are priced from the points, less the fees of the entry and the last fill
+    assert trades["Pnl"].iloc[0] == pytest.approx(3 * 2.0 * 2 - (3 + 2) * 1.57 / 2)
+
+
+def test_interleaved_merges_fills_split_by_another_symbol():
+    raw = make_fills([("MNQH5", "Long", "2025-02-03 18:00:00", 60, 1),
+                      ("NQH5", "Long", "2025-02-03 18:00:01", 60, 1),
+                      ("MNQH5", "Long", "2025-02-03 18:00:02", 60, 1)])
+    cleaned = clean_trades(raw)
+    assert len(merge_trades(cleaned)) == 3  # In file order the NQ fill ends the first MNQ trade
+    merged = merge_trades(cleaned, interleaved=True)
+    assert sorted(zip(merged["symbol"], merged["qty"])) == [("MNQ", 2), ("NQ", 1)]
+
+
+@pytest.mark.parametrize("interleaved", [False, True])
+def test_groups_match_the_row_by_row_merge(interleaved):
+    rng = np.random.default_rng(7)
+    entries = pd.Timestamp("2025-02-03 18:00:00") + pd.to_timedelta(np.cumsum(rng.integers(0, 8, 3000)), unit="s")
+    cleaned = clean_trades(make_fills(zip(rng.choice(["MNQH5", "NQH5"], 3000), rng.choice(["Long", "Short"], 3000),
+                                          entries, rng.integers(1, 12, 3000), rng.integers(1, 4, 3000))))
+    assert (assign_merge_groups(cleaned, interleaved=interleaved)
+            == reference_groups(cleaned, interleaved=interleaved)).all()
+
+
+def test_long_run_of_close_fills_is_finished_by_the_sweep():
+    # Fills a second apart, each held 3 seconds: every third one starts a new trade, which takes
+    # one vector pass per trade, far more than MAX_VECTOR_PASSES
+    start = pd.Timestamp("2025-02-03 18:00:00")
+    fills = [("MNQH5", "Long", start + pd.Timedelta(seconds=i), 3, 1) for i in range(30 * MAX_VECTOR_PASSES)]
+    cleaned = clean_trades(make_fills(fills))
+    groups = assign_merge_groups(cleaned)
+    assert (groups == reference_groups(cleaned)).all()
+    assert len(np.unique(groups)) == len(fills) // 3
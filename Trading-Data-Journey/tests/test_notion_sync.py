@@ -0,0 +1,49 @@
+import pandas as pd
+
+from benchmarks.fakes import FakeNotion
+from trading_journal.notion_sync import NotionTradeIndex, property_digests, trade_key, trade_properties
+
+
+def add_pages(notion, count):
+    """`count` trade pages, edited a minute apart from 2025-01-01 on; returns their rows."""
+    template = pd.Series({"Quantity": 1, "Symbol": "MNQ", "Side": "Long", "Pnl": -2.58, "Pts": -1.25,
+                          "Result": "Loss", "Drt Category": "30-120 sec", "Session": "1-2 hour", "ATR 1M": 5.1,
+                          "ATR 5M": 12.0, "Duration": 113, "Buy Price": 21500.25, "Sell Price": 21499.0,
+                          "Bought Time": pd.Timestamp("2025-02-03 18:34:13"),
+                          "Sold Time": pd.Timestamp("2025-02-03 18:36:06")})
+    rows = []
+    for i in range(count):
+        row = template.copy()
+        row["Bought Time"] = template["Bought Time"] + pd.Timedelta(minutes=i)
+        page = notion.create_page({"database_id": "db"}, trade_properties(row))
+        page["last_edited_time"] = (pd.Timestamp("2025-01-01") + pd.Timedelta(minutes=i)).strftime(
+            "%Y-%m-%dT%H:%M:00.000Z")
+        rows.append(row)
+    return rows
+
+
+def test_sync_follows_cursors_then_reads_only_edited_pages(tmp_path):
+    notion = FakeNotion(rate=None)
+    rows = add_pages(notion, 250)
+    path = str(tmp_path / "notion_index.json")
+
+    index = NotionTradeIndex(notion.client(), "db", path=path)
+    assert index.sync() == 250
+    assert notion.calls["databases.query"] == 3  # 100 pages per response
+    assert len(index.trades) == 250
+    assert index.high_water == "2025-01-01T04:09:00.000Z"
+
+    # One page edited, one added: a later run only reads those and the boundary minute
+    edited = rows[0].copy()
+    edited["Pnl"] = 99.5
+    notion.update_page(index.trades[trade_key(edited)], {"Pnl": {"number": 99.5}})
+    added = rows[0].copy()
+    added["Bought Time"] = pd.Timestamp("2025-03-03 18:00:00")
+    notion.create_page({"database_id": "db"}, trade_properties(added))
+
+    index = NotionTradeIndex(notion.client(), "db", path=path)
+    assert index.sync() == 3
+    assert len(index.trades) == 251 and trade_key(added) in index.trades
+    assert index.digests[trade_key(edited)] == property_digests(trade_properties(edited))
+
+    assert NotionTradeIndex(notion.client(), "db", path=path).sync(full=True) == 251
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from trading_journal.rate_limit import TokenBucket, call_with_retries
+
+
+class APIError(Exception):
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+
+
+def failing(errors, result="ok"):
+    """A call that raises each of `errors` in turn, then returns `result`."""
+    calls = []
+
+    def call():
+        calls.append(time.monotonic())
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return call, calls
+
+
+def test_bucket_paces_calls_after_the_burst():
+    bucket = TokenBucket(rate=20, capacity=2)
+    start = time.monotonic()
+    for _ in range(8):
+        bucket.acquire()
+    # Two go out at once, the other six wait 1/20 s each
+    assert time.monotonic() - start >= 6 / 20 * 0.9
+
+
+def test_retry_after_is_honoured_for_every_caller():
+    bucket = TokenBucket(rate=100)
+    call, calls = failing([APIError(429, retry_after=0.2)])
+    assert call_with_retries(call, bucket=bucket, base_delay=0.01) == "ok"
+    assert len(calls) == 2 and calls[1] - calls[0] >= 0.2
+
+    # The pause holds the shared bucket too
+    bucket.pause(0.2)
+    assert bucket.acquire() >= 0.15
+
+
+def test_transient_errors_are_retried_with_backoff():
+    call, calls = failing([APIError(503), APIError(502), ConnectionError("reset")])
+    assert call_with_retries(call, base_delay=0.01) == "ok"
+    assert len(calls) == 4
+
+
+def test_client_errors_are_not_retried():
+    call, calls = failing([APIError(400)])
+    with pytest.raises(APIError):
+        call_with_retries(call, base_delay=0.01)
+    assert len(calls) == 1
+
+
+def test_gives_up_after_max_retries():
+    call, calls = failing([APIError(429)] * 5)
+    with pytest.raises(APIError):
+        call_with_retries(call, max_retries=2, base_delay=0.01)
+    assert len(calls) == 3
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from benchmarks.synthetic import write_export
+from test_ingest import bar_cache, by_key  # noqa: F401 (bar_cache is a fixture)
+from trading_journal.ingest import clean_exports
+from trading_journal.rebuild import rebuild_history
+
+
+def test_rebuild_matches_the_batch_clean(tmp_path, bar_cache):
+    folder = tmp_path / "Trade-Data"
+    folder.mkdir()
+    path = write_export(str(folder / "export.csv"), 3000, trades_per_day=400)
+    timeframes = ("1m", "5m", "4h")
+    batch = clean_exports([path], bar_cache=bar_cache, timeframes=timeframes)
+
+    # The batch clean filled the bar cache, the workers only read it
+    rebuilt = rebuild_history([str(folder)], bar_cache=bar_cache, timeframes=timeframes, max_workers=2,
+                              min_task_rows=500, refresh=False)
+
+    assert len(rebuilt) == len(batch)
+    pd.testing.assert_frame_equal(by_key(rebuilt), by_key(batch))
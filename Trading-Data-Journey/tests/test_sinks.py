@@ -0,0 +1,105 @@
+import sqlite3
+
+import pandas as pd
+
+from benchmarks.fakes import FakeNotion, FakeSheets
+from trading_journal.pipeline import publish
+from trading_journal.sheets_sync import SheetsSync
+from trading_journal.sinks import REQUIRED_COLUMNS, NotionSink, SheetsSink, SQLiteSink
+from trading_journal.trade_store import TradeStore
+
+
+def make_trades():
+    bought = pd.to_datetime(["2025-02-03 18:34:13", "2025-02-03 18:39:33", "2025-02-04 09:31:05"])
+    duration = [113, 240, 45]
+    return pd.DataFrame({
+        "Quantity": [1, 2, 1], "Symbol": ["MNQ", "MNQ", "NQ"], "Side": ["Long", "Short", "Long"],
+        "Pnl": [-2.58, 56.8, 120.0], "Pts": [-1.25, 10.0, 6.0], "Result": ["Loss", "Win", "Win"],
+        "Drt Category": ["30-120 sec", "2-5 min", "30-120 sec"], "Session": ["1-2 hour", "1-2 hour", "2+ hour"],
+        "ATR 1M": [5.1, 6.2, 7.3], "ATR 5M": [12.0, 13.5, 15.25], "Duration": duration,
+        "Buy Price": [21500.25, 21490.0, 21600.5], "Sell Price": [21499.0, 21500.0, 21606.5],
+        "Bought Time": bought, "Sold Time": bought + pd.to_timedelta(duration, unit="s"),
+    })[REQUIRED_COLUMNS]
+
+
+def test_changed_trade_reaches_every_sink(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Sink state files (index, key cache, failed trades) are relative paths
+    notion = FakeNotion(rate=None)
+    worksheet = FakeSheets(rate=None, header=REQUIRED_COLUMNS).open("Trading Data").sheet1
+    store = TradeStore("Trade-Store")
+
+    def sinks():
+        return [NotionSink(notion.client(), "db"), SheetsSink(worksheet, "Trading Data", rate=100),
+                SQLiteSink("trades.sqlite")]
+
+    trades = make_trades()
+    assert store.insert(trades) == 3
+    assert publish(store, sinks()) == {"notion": 3, "google_sheets": 3, "sqlite": 3}
+
+    # Nothing changed: nothing is pending and no sink writes
+    assert store.insert(trades) == 0
+    assert publish(store, sinks()) == {"notion": 0, "google_sheets": 0, "sqlite": 0}
+
+    changed = trades.copy()
+    changed.loc[1, "Pnl"] = 380.08
+    assert store.insert(changed) == 1
+    assert publish(store, sinks()) == {"notion": 1, "google_sheets": 1, "sqlite": 1}
+
+    assert len(notion.pages) == 3
+    assert sorted(page["properties"]["Pnl"]["number"] for page in notion.pages.values()) == [-2.58, 120.0, 380.08]
+
+    header = worksheet.rows[0]
+    assert len(worksheet.rows) == 4
+    assert [row[header.index("Pnl")] for row in worksheet.rows[1:]] == ["-2.58", "380.08", "120.0"]
+
+    with sqlite3.connect("trades.sqlite") as db:
+        assert db.execute('SELECT COUNT(*) FROM trades').fetchone() == (3,)
+        assert db.execute('SELECT "Pnl" FROM trades WHERE "Bought Time" = ?',
+                          ("2025-02-03 18:39:33",)).fetchone() == (380.08,)
+
+
+def test_sheets_append_follows_the_header_order(tmp_path):
+    header = ["Symbol", "Bought Time", "Pnl", "Side"]
+    worksheet = FakeSheets(rate=None, header=header).open("Trading Data").sheet1
+    sync = SheetsSync(worksheet, "Trading Data", keys_path=str(tmp_path / "keys.json"), rate=100)
+
+    assert sync.append(make_trades()).empty
+    # Columns the header lacked are added to its end, the existing ones keep their place
+    assert worksheet.rows[0] == header + [col for col in REQUIRED_COLUMNS if col not in header]
+    assert worksheet.rows[1][:4] == ["MNQ", "2025-02-03 18:34:13", "-2.58", "Long"]
+    assert worksheet.rows[3][worksheet.rows[0].index("Duration")] == "45"
+
+
+def test_lost_sheets_key_cache_only_rewrites_changed_cells(tmp_path):
+    sheets = FakeSheets(rate=None, header=REQUIRED_COLUMNS)
+    worksheet = sheets.open("Trading Data").sheet1
+    keys_path = str(tmp_path / "keys.json")
+    trades = make_trades()
+    SheetsSink(worksheet, "Trading Data", keys_path=keys_path, failed_path=str(tmp_path / "failed.csv"),
+               rate=100).write(trades)
+
+    (tmp_path / "keys.json").unlink()
+    sheets.calls.clear()
+    unchanged = SheetsSync(worksheet, "Trading Data", keys_path=keys_path, rate=100)
+    assert unchanged.changed_trades(trades).empty
+    assert "values.batchUpdate" not in sheets.calls
+
+    (tmp_path / "keys.json").unlink()
+    changed = trades.copy()
+    changed.loc[1, "Pnl"] = 380.08
+    sync = SheetsSync(worksheet, "Trading Data", keys_path=keys_path, rate=100)
+    assert sync.changed_trades(changed).index.tolist() == [1]
+    assert sync.update(sync.changed_trades(changed)).empty
+    assert sheets.calls["values.batchUpdate"] == 1
+    assert worksheet.rows[2][REQUIRED_COLUMNS.index("Pnl")] == "380.08"
+
+
+def test_sqlite_sink_adds_new_columns(tmp_path):
+    path = str(tmp_path / "trades.sqlite")
+    trades = make_trades()
+    assert SQLiteSink(path).write(trades) == 3
+    assert SQLiteSink(path).write(trades.assign(**{"ATR 4H": [30.5, 31.0, 32.25]})) == 3
+
+    with sqlite3.connect(path) as db:
+        assert db.execute('SELECT "ATR 4H" FROM trades ORDER BY "Bought Time"').fetchall() == [(30.5,), (31.0,),
+                                                                                            (32.25,)]
@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from test_sinks import make_trades
+from trading_journal import trade_store
+from trading_journal.trade_store import TradeStore
+
+
+def test_duplicate_keys_keep_the_last_row_in_any_chunking(tmp_path):
+    first = make_trades().iloc[[1]]
+    last = first.assign(Pnl=1.0)
+
+    one_batch = TradeStore(str(tmp_path / "one-batch"))
+    assert one_batch.insert(pd.concat([first, last])) == 1
+
+    two_batches = TradeStore(str(tmp_path / "two-batches"))
+    assert two_batches.insert(first) == 1
+    assert two_batches.insert(last) == 1  # Changed, stored again under a new Seq
+
+    for store in (one_batch, two_batches):
+        assert store.load()["Pnl"].tolist() == [1.0]
+        assert store.insert(pd.concat([first, last])) == 0  # Same fills again: nothing flips back
+
+
+def test_reopened_store_reads_the_index_deltas_and_their_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(trade_store, "INDEX_DELTA_FILES", 2)
+    trades = make_trades()
+    path = str(tmp_path / "Trade-Store")
+    store = TradeStore(path)
+    assert store.insert(trades) == 3  # Into an empty index, so it is compacted right away
+
+    assert store.insert(trades.iloc[[0]].assign(Pnl=1.0)) == 1
+    assert len(os.listdir(store.deltas_folder)) == 1
+    reopened = TradeStore(path)
+    assert len(reopened) == 3 and reopened.last_seq == 3
+    assert reopened.changed_after(2) == 1
+    assert reopened.load()["Pnl"].tolist() == [56.8, 120.0, 1.0]
+
+    # A third index file is past the limit, everything is folded into index.feather
+    assert reopened.insert(trades.iloc[[1]].assign(Pnl=2.0)) == 1
+    assert os.listdir(reopened.deltas_folder) == []
+    reopened = TradeStore(path)
+    assert reopened.load()["Pnl"].tolist() == [120.0, 1.0, 2.0]
+    assert reopened.insert(trades.assign(Pnl=[1.0, 2.0, 120.0])) == 0
+
+
+def test_missing_prices_and_tick_sizes_round_trip(tmp_path):
+    trades = make_trades().assign(**{"Tick Size": [0.25, np.nan, 0.25]})
+    trades.loc[2, "Sell Price"] = np.nan
+    store = TradeStore(str(tmp_path / "Trade-Store"))
+    store.insert(trades)
+
+    loaded = store.load()
+    assert loaded["Sell Price"].isna().tolist() == [False, False, True]
+    # The second trade's prices were stored with the tick size of the contract's other rows
+    assert loaded["Buy Price"].tolist() == trades["Buy Price"].tolist()
+
+    with pytest.raises(ValueError, match="no Tick Size for NQ"):
+        store.insert(trades.assign(**{"Tick Size": [0.25, 0.25, np.nan]}, Pnl=0.0))
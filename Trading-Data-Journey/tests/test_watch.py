@@ -0,0 +1,66 @@
+import sys
+
+import pandas as pd
+
+from benchmarks.fakes import FakeMarket, FakeSink
+from benchmarks.synthetic import generate_export
+from trading_journal.cleaning import clean_trades
+from trading_journal.market_data import BarCache
+from trading_journal.merging import merge_trades
+from trading_journal.trade_store import TradeStore
+from trading_journal.watch import ExportTail, ExportWatcher
+
+
+def test_tail_reads_only_complete_new_lines(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text("a,b\n1,2\n3,")
+    tail = ExportTail(str(path))
+    assert tail.read_new().to_dict("list") == {"a": [1], "b": [2]}
+    assert tail.read_new() is None  # "3," is still being written
+
+    with open(path, "a") as f:
+        f.write("4\n5,6\n")
+    assert tail.read_new().to_dict("list") == {"a": [3, 5], "b": [4, 6]}
+    assert tail.offset == path.stat().st_size
+
+    # A shorter file is a new export, read from the top
+    path.write_text("a,b\n7,8\n")
+    assert tail.read_new().to_dict("list") == {"a": [7], "b": [8]}
+
+
+def test_watcher_resumes_from_the_saved_offsets(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "yfinance", FakeMarket(start="2025-01-06", end="2025-02-07",
+                                                            regular_hours=False).module())
+    folder = tmp_path / "Trade-Data"
+    folder.mkdir()
+    path = folder / "export.csv"
+    export = generate_export(300, partial_fill_rate=0)
+    export.iloc[:200].to_csv(path, index=False)
+
+    store = TradeStore(str(tmp_path / "Trade-Store"))
+    bar_cache = BarCache(str(tmp_path / "Market-Data"))
+
+    def watcher():
+        # Long after the fills, so nothing is held back for the merge window
+        return ExportWatcher(str(folder), store, [FakeSink()], bar_cache=bar_cache, use_inotify=False,
+                             clock=lambda: pd.Timestamp("2030-01-01"))
+
+    def trades_in(rows):
+        # The store keeps one trade per (Symbol, Bought Time)
+        return len(merge_trades(clean_trades(rows.copy())).drop_duplicates(["symbol", "boughtTimestamp"]))
+
+    first = watcher()
+    assert first.step()[0] == trades_in(export.iloc[:200])
+    assert first.rows_read == 200
+
+    # A restart picks up after the rows already read
+    export.iloc[200:].to_csv(path, index=False, header=False, mode="a")
+    second = watcher()
+    inserted, results = second.step()
+    assert inserted == trades_in(export.iloc[200:]) and results == {"fake": inserted}
+    assert second.rows_read == 100
+    assert len(store.load()) == trades_in(export.iloc[:200]) + inserted
+
+    third = watcher()
+    assert third.step() == (0, {})
+    assert third.rows_read == 0
@@ -0,0 +1,39 @@
+"""Reusable building blocks for the Tradovate trade journal scripts."""
+
+import importlib
+
+# Public names and the module each lives in; the module is only imported the first time the name is
+# used, so `import trading_journal` stays cheap and pandas/pyarrow load only when something needs them
+_EXPORTS = {
+    "attach_atr": "atr", "build_atr_frame": "atr", "compute_atr": "atr", "IncrementalATR": "atr",
+    "atr_warmup": "atr",
+    "clean_trades": "cleaning", "finalize_trades": "cleaning",
+    "merge_trades": "merging",
+    "clean_exports": "ingest", "find_exports": "ingest", "read_exports": "ingest",
+    "stream_clean_exports": "ingest", "StreamingCleaner": "ingest",
+    "BarCache": "market_data", "data_ticker": "market_data",
+    "TradeStore": "trade_store", "content_hash": "hashing",
+    "NotionSink": "sinks", "SheetsSink": "sinks", "SQLiteSink": "sinks", "Sink": "sinks",
+    "validate_trades": "sinks",
+    "NotionTradeIndex": "notion_sync", "NotionUploader": "notion_sync", "replay_failed_trades": "notion_sync",
+    "SheetsSync": "sheets_sync",
+    "publish": "pipeline", "run_pipeline": "pipeline",
+    "AnalyticsCube": "analytics",
+    "ExportWatcher": "watch",
+    "store_status": "status",
+    "Recorder": "metrics", "start_recording": "metrics", "stage": "metrics",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
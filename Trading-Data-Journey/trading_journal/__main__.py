@@ -0,0 +1,5 @@
+import sys
+
+from trading_journal.cli import main
+
+sys.exit(main())
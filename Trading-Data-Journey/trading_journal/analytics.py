@@ -0,0 +1,195 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from trading_journal.metrics import stage
+from trading_journal.schema import LABEL_COLUMNS
+
+# -----------------------------
+# 📌 Performance Cube
+# -----------------------------
+
+ANALYTICS_FOLDER = "Analytics"
+
+# Upper edges of the ATR regimes, e.g. [5, 10] gives "<5", "5-10" and "10+"
+DEFAULT_ATR_BUCKETS = {"ATR 1M": [5, 10, 20, 40], "ATR 5M": [10, 20, 40, 80]}
+
+LABEL_DIMENSIONS = ["Symbol", "Side", "Session", "Drt Category"]
+MEASURES = ["count", "wins", "losses", "pnl_sum", "pnl_sumsq", "pts_sum", "pts_sumsq"]
+
+
+def _edge(value):
+    return f"{value:g}"
+
+
+def bucket_labels(edges):
+    """Names of the ATR regimes between `edges`."""
+    labels = [f"<{_edge(edges[0])}"]
+    labels += [f"{_edge(low)}-{_edge(high)}" for low, high in zip(edges[:-1], edges[1:])]
+    return labels + [f"{_edge(edges[-1])}+"]
+
+
+def atr_bucket(values, edges):
+    """ATR regime of each value; "n/a" where there was no ATR."""
+    buckets = pd.cut(values.astype(float), [-np.inf, *edges, np.inf], right=False, labels=bucket_labels(edges))
+    return buckets.cat.add_categories("n/a").fillna("n/a")
+
+
+class AnalyticsCube:
+    """Win/loss and PnL/Pts aggregates for every combination of the journal's dimensions.
+
+    One cell per (Trade Date, Symbol, Side, Session, Drt Category, ATR
+    regimes) holds count, wins, losses and the sum and sum of squares of Pnl
+    and Pts. New trades are folded into the cells as they arrive, and any
+    slice or roll-up is a group-by over the cells, never over the trades.
+    """
+
+    def __init__(self, folder=ANALYTICS_FOLDER, atr_buckets=None):
+        self.path = os.path.join(folder, "cube.feather")
+        self.atr_buckets = {col: list(edges) for col, edges in (atr_buckets or DEFAULT_ATR_BUCKETS).items()}
+        self.dimensions = ["Trade Date", *LABEL_DIMENSIONS, *(f"{col} Bucket" for col in self.atr_buckets)]
+        self.seq = -1  # Last store Seq folded in
+        self.cells = self._empty_cells()
+        self._load()
+
+    def _empty_cells(self):
+        return pd.DataFrame({**{dim: pd.Series(dtype="category") for dim in self.dimensions},
+                             **{measure: pd.Series(dtype=float) for measure in MEASURES}}).astype(
+            {"Trade Date": "datetime64[ns]"})
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        table = feather.read_table(self.path, memory_map=True)
+        state = json.loads(table.schema.metadata.get(b"analytics", b"{}"))
+        if state.get("atr_buckets") != self.atr_buckets:
+            return  # Different regimes, the cube is rebuilt from the store
+        self.seq = state["seq"]
+        self.cells = table.to_pandas()
+
+    def save(self):
+        """Write the cells and the Seq they cover in one file, so they can't get out of step."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        table = pa.Table.from_pandas(self.cells, preserve_index=False)
+        state = json.dumps({"seq": self.seq, "atr_buckets": self.atr_buckets})
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"analytics": state.encode()})
+        tmp_path = self.path + ".tmp"
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, self.path)
+
+    def _cells_of(self, trades):
+        trades = trades.dropna(subset=["Pnl", "Bought Time"])
+        if trades.empty:
+            return pd.DataFrame()
+        keys = {"Trade Date": pd.to_datetime(trades["Bought Time"]).dt.normalize().astype("datetime64[ns]")}
+        for dim in LABEL_DIMENSIONS:
+            keys[dim] = trades[dim].astype(str)
+        for col, edges in self.atr_buckets.items():
+            values = trades[col] if col in trades else pd.Series(np.nan, index=trades.index)
+            keys[f"{col} Bucket"] = atr_bucket(values, edges).astype(str)
+        keys = pd.DataFrame({dim: keys[dim] for dim in self.dimensions}).reset_index(drop=True)
+
+        pnl, pts = trades["Pnl"].to_numpy(float), trades["Pts"].fillna(0).to_numpy(float)
+        measures = {"count": None, "wins": (trades["Result"] == "Win").to_numpy(float),
+                    "losses": (trades["Result"] == "Loss").to_numpy(float),
+                    "pnl_sum": pnl, "pnl_sumsq": pnl ** 2, "pts_sum": pts, "pts_sumsq": pts ** 2}
+
+        # One integer id per combination, summed with bincount (a multi-key group-by crawls past millions of them)
+        codes = [pd.factorize(keys[dim])[0] for dim in self.dimensions]
+        cell = pd.factorize(np.ravel_multi_index(codes, [code.max() + 1 for code in codes]))[0]
+        first = np.unique(cell, return_index=True)[1]
+        cells = keys.iloc[first].reset_index(drop=True)
+        for measure, values in measures.items():
+            cells[measure] = np.bincount(cell, weights=values, minlength=len(first)).astype(float)
+        return cells
+
+    def add(self, trades):
+        """Fold trades into the cells.
+
+        Only cells from the earliest new trade date on are looked at: the
+        ones the trades hit are added to in place, the rest are appended.
+        """
+        new = self._cells_of(trades)
+        if new.empty:
+            return
+        cells = self.cells
+        dtypes = {dim: self._category(dim, [*cells[dim].cat.categories, *new[dim].unique()])
+                  for dim in self.dimensions[1:]}
+        cells, new = cells.astype(dtypes), new.astype(dtypes)
+
+        recent = np.flatnonzero((cells["Trade Date"] >= new["Trade Date"].min()).to_numpy())
+        recent_keys = pd.MultiIndex.from_frame(cells[self.dimensions].iloc[recent])
+        position = recent_keys.get_indexer(pd.MultiIndex.from_frame(new[self.dimensions]))
+        hit = position >= 0
+
+        totals = cells[MEASURES].to_numpy(copy=True)
+        totals[recent[position[hit]]] += new[MEASURES].to_numpy()[hit]
+        cells[MEASURES] = totals
+        self.cells = pd.concat([cells, new[~hit]], ignore_index=True)
+
+    def _category(self, dim, values):
+        """Categorical dtype listing a dimension's labels in the journal's order, not alphabetically."""
+        order = LABEL_COLUMNS.get(dim, [])
+        if dim.endswith(" Bucket"):
+            order = bucket_labels(self.atr_buckets[dim[:-len(" Bucket")]]) + ["n/a"]
+        return pd.CategoricalDtype(order + sorted(set(values) - set(order)))
+
+    def update(self, store):
+        """Fold in the trades stored since the last update; returns how many there were.
+
+        A trade stored again because its fields changed can't be taken back
+        out of the sums, so the cube is rebuilt from the store when any did.
+        """
+        with stage("analytics") as s:
+            if self.seq >= 0 and store.changed_after(self.seq):
+                self.cells, self.seq = self._empty_cells(), -1
+            trades = store.after(self.seq)
+            s.rows_in = len(trades)
+            if trades.empty:
+                return 0
+            self.add(trades)
+            self.seq = int(trades["Seq"].max())
+            self.save()
+            s.rows_out = len(self.cells)
+        return len(trades)
+
+    def query(self, by=(), where=None, since=None, until=None):
+        """Win rate, PnL and Pts statistics grouped `by` some dimensions.
+
+        `where` maps dimensions to a value or a list of values to keep, and
+        `since` / `until` limit the trade dates. With no `by` the result is a
+        single row for the whole slice.
+        """
+        cells = self.cells
+        mask = np.ones(len(cells), dtype=bool)
+        for dim, values in (where or {}).items():
+            values = [values] if isinstance(values, str) or not np.iterable(values) else list(values)
+            mask &= cells[dim].isin(values).to_numpy()
+        if since is not None:
+            mask &= (cells["Trade Date"] >= pd.Timestamp(since).normalize()).to_numpy()
+        if until is not None:
+            mask &= (cells["Trade Date"] <= pd.Timestamp(until).normalize()).to_numpy()
+        cells = cells[mask]
+
+        by = list(by)
+        totals = cells.groupby(by, observed=True)[MEASURES].sum() if by else cells[MEASURES].sum().to_frame().T
+        return summarize(totals)
+
+
+def summarize(totals):
+    """Turn summed cells into counts, win rate and mean/standard deviation of Pnl and Pts."""
+    count = totals["count"]
+    stats = pd.DataFrame({"Trades": count.astype(np.int64), "Wins": totals["wins"].astype(np.int64),
+                          "Losses": totals["losses"].astype(np.int64)}, index=totals.index)
+    stats["Win Rate"] = (totals["wins"] / count).round(4)
+    for name, prefix in (("Pnl", "pnl"), ("Pts", "pts")):
+        mean = totals[f"{prefix}_sum"] / count
+        variance = (totals[f"{prefix}_sumsq"] - count * mean ** 2) / (count - 1)
+        stats[f"Total {name}"] = totals[f"{prefix}_sum"].round(2)
+        stats[f"Avg {name}"] = mean.round(2)
+        stats[f"{name} Std"] = np.sqrt(variance.clip(lower=0)).where(count > 1).round(2)
+    return stats
@@ -0,0 +1,212 @@
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# 📌 ATR From a 1-Minute Bar Stream
+# -----------------------------
+
+ATR_PERIOD = 14
+
+# Trade timestamps are 8 hours ahead of New York exchange time
+TRADE_CLOCK_OFFSET = pd.Timedelta(hours=8)
+
+# Timeframes that can be built from 1-minute bars, with their pandas frequency
+TIMEFRAMES = {"1m": "1min", "2m": "2min", "5m": "5min", "15m": "15min", "30m": "30min",
+              "1h": "1h", "4h": "4h"}
+
+
+# Wilder's average keeps (period - 1) / period of its seed per bar, so after this many periods
+# of bars (112 at period 14) under 0.03% of it is left
+ATR_SETTLE_PERIODS = 8
+
+# Extra calendar time for the bars a weekend or a holiday leaves out
+MARKET_CLOSED_MARGIN = pd.Timedelta(days=4)
+
+
+def atr_warmup(timeframes=("1m", "5m"), periods=(ATR_PERIOD,)):
+    """How long before a trade bars have to start for every ATR to have settled by then."""
+    longest = max(pd.Timedelta(TIMEFRAMES[timeframe]) for timeframe in timeframes)
+    return longest * max(periods) * ATR_SETTLE_PERIODS + MARKET_CLOSED_MARGIN
+
+
+def atr_column(timeframe, period=ATR_PERIOD):
+    """Column name for an ATR series, e.g. "ATR 5M" or "ATR 5M (20)"."""
+    name = f"ATR {timeframe.upper()}"
+    return name if period == ATR_PERIOD else f"{name} ({period})"
+
+
+def resample_bars(bars, timeframe):
+    """Build `timeframe` OHLC bars from 1-minute bars indexed by Datetime."""
+    ohlc = bars[["Open", "High", "Low", "Close"]]
+    if timeframe == "1m":
+        return ohlc
+    ohlc = ohlc.resample(TIMEFRAMES[timeframe]).agg({"Open": "first", "High": "max", "Low": "min", "Close": "last"})
+    return ohlc.dropna(subset=["Close"])  # Drop bins with no trading
+
+
+def true_range(bars):
+    """Wilder's true range: the bar's range extended to the previous close."""
+    prev_close = bars["Close"].shift()
+    return np.fmax(bars["High"] - bars["Low"],
+                   np.fmax((bars["High"] - prev_close).abs(), (bars["Low"] - prev_close).abs()))
+
+
+def wilder_atr(tr, period=ATR_PERIOD):
+    """Wilder-smoothed ATR, seeded with the mean of the first `period` true ranges."""
+    seeded = tr.astype(float).copy()
+    if len(seeded) < period:
+        return seeded * np.nan
+    seeded.iloc[:period - 1] = np.nan
+    seeded.iloc[period - 1] = tr.iloc[:period].mean()
+    return seeded.ewm(alpha=1 / period, adjust=False).mean()
+
+
+def compute_atr(bars, timeframes=("1m", "5m"), periods=(ATR_PERIOD,)):
+    """Compute ATR for every timeframe and period from one 1-minute bar frame.
+
+    Returns one frame keyed by bar start time ("Datetime") with a column per
+    (timeframe, period), forward-filled so a single backward `merge_asof`
+    attaches all of them at once.
+    """
+    bars = bars.set_index("Datetime").sort_index()
+
+    columns = {}
+    for timeframe in timeframes:
+        tr = true_range(resample_bars(bars, timeframe))
+        for period in periods:
+            columns[atr_column(timeframe, period)] = wilder_atr(tr, period)
+
+    return pd.DataFrame(columns).sort_index().ffill().rename_axis("Datetime").reset_index()
+
+
+def build_atr_frame(bars_by_symbol, timeframes=("1m", "5m"), periods=(ATR_PERIOD,)):
+    """ATR of each contract root's own bars, on the trades' clock, labelled by `symbol`."""
+    frames = []
+    for symbol, bars in bars_by_symbol.items():
+        atr = compute_atr(bars, timeframes=timeframes, periods=periods)
+
+        # Convert ATR timestamps to New York time and adjust for the 8-hour delay
+        atr["Datetime"] = atr["Datetime"].dt.tz_convert("America/New_York").dt.tz_localize(None) + TRADE_CLOCK_OFFSET
+        frames.append(atr.assign(symbol=symbol))
+
+    if not frames:
+        columns = [atr_column(tf, p) for tf in timeframes for p in periods]
+        return pd.DataFrame({"Datetime": pd.Series(dtype="datetime64[ns]"), "symbol": pd.Series(dtype=object),
+                             **{col: pd.Series(dtype=float) for col in columns}})
+    return pd.concat(frames, ignore_index=True)
+
+
+def attach_atr(trades, atr_df):
+    """As-of join every ATR column of the trade's own instrument onto its entry time."""
+    atr_columns = [col for col in atr_df.columns if col not in ("Datetime", "symbol")]
+    trades = trades.assign(**{"Trade Entry Time": pd.to_datetime(trades["Trade Entry Time"])})
+    atr_df = atr_df.assign(Datetime=atr_df["Datetime"].astype(trades["Trade Entry Time"].dtype))
+
+    trades = pd.merge_asof(trades.sort_values("Trade Entry Time"), atr_df.sort_values("Datetime"),
+                           left_on="Trade Entry Time", right_on="Datetime", by="symbol",
+                           direction="backward").drop(columns=["Datetime"])
+    trades[atr_columns] = trades[atr_columns].round(1)
+    return trades
+
+
+# -----------------------------
+# 📌 Incremental Updates
+# -----------------------------
+
+class _TimeframeState:
+    """The forming bar of one timeframe plus the Wilder state of each period."""
+
+    def __init__(self, freq, periods):
+        self.freq = freq
+        self.periods = periods
+        self.bar_start = None
+        self.high = self.low = self.close = math.nan
+        self.prev_close = math.nan
+        self.seeds = {period: deque(maxlen=period) for period in periods}  # First true ranges
+        self.atr = {period: math.nan for period in periods}
+
+    def _true_range(self):
+        tr = self.high - self.low
+        if not math.isnan(self.prev_close):
+            tr = max(tr, abs(self.high - self.prev_close), abs(self.low - self.prev_close))
+        return tr
+
+    def _smooth(self, period, tr):
+        """ATR after a bar with true range `tr`, without changing the state."""
+        atr = self.atr[period]
+        if not math.isnan(atr):
+            return (1 - 1 / period) * atr + tr / period
+        seeds = self.seeds[period]
+        if len(seeds) + 1 == period:
+            return (sum(seeds) + tr) / period
+        return math.nan
+
+    def add(self, bar_start, high, low, close):
+        """Add a 1-minute bar that falls in the `bar_start` bar of this timeframe."""
+        if self.bar_start is not None and bar_start != self.bar_start:
+            # The forming bar is complete, fold it into each period's ATR
+            tr = self._true_range()
+            for period in self.periods:
+                if math.isnan(self.atr[period]):
+                    self.seeds[period].append(tr)
+                    if len(self.seeds[period]) == period:
+                        self.atr[period] = sum(self.seeds[period]) / period
+                else:
+                    self.atr[period] = self._smooth(period, tr)
+            self.prev_close = self.close
+            self.bar_start = None
+
+        if self.bar_start is None:
+            self.bar_start, self.high, self.low = bar_start, high, low
+        else:
+            self.high, self.low = max(self.high, high), min(self.low, low)
+        self.close = close
+
+    def current(self):
+        """ATR including the forming bar (provisional until the bar closes)."""
+        if self.bar_start is None:
+            return dict(self.atr)
+        tr = self._true_range()
+        return {period: self._smooth(period, tr) for period in self.periods}
+
+
+class IncrementalATR:
+    """Keep ATR values current as 1-minute bars arrive, at O(1) cost per bar.
+
+    Each timeframe only remembers its forming bar, the previous close and the
+    last ATR (plus up to `period` true ranges while the ATR is seeding), so
+    appending bars never recomputes the window. Once a higher-timeframe bar
+    closes its value matches compute_atr().
+    """
+
+    def __init__(self, timeframes=("1m", "5m"), periods=(ATR_PERIOD,)):
+        self.timeframes = list(timeframes)
+        self.periods = list(periods)
+        self._states = {tf: _TimeframeState(TIMEFRAMES[tf], self.periods) for tf in self.timeframes}
+
+    def latest(self):
+        """Current ATR value of every configured column."""
+        values = {}
+        for timeframe, state in self._states.items():
+            for period, value in state.current().items():
+                values[atr_column(timeframe, period)] = value
+        return values
+
+    def update(self, bars):
+        """Append new 1-minute bars; returns the ATR columns as of each bar."""
+        bars = bars.sort_values("Datetime")
+        # Bin every bar once up front, flooring Timestamps one at a time dominates the loop otherwise
+        bar_starts = [bars["Datetime"].dt.floor(state.freq).to_numpy() for state in self._states.values()]
+        rows = []
+        for i, (high, low, close) in enumerate(zip(bars["High"], bars["Low"], bars["Close"])):
+            for state, starts in zip(self._states.values(), bar_starts):
+                state.add(starts[i], high, low, close)
+            rows.append(self.latest())
+
+        columns = [atr_column(tf, p) for tf in self.timeframes for p in self.periods]
+        atr = pd.DataFrame(rows, columns=columns)
+        atr.insert(0, "Datetime", bars["Datetime"].reset_index(drop=True))
+        return atr
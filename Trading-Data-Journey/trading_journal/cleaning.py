@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# 📌 Contract Fees & Multipliers
+# -----------------------------
+
+# Define contract fee structure
+# fee_dict = {"NQ": 4.68/2, "MNQ": 1.54/2, "MYM": 2.2/2}
+fee_dict = {"NQ": 4.73/2, "MNQ": 1.57/2, "MYM": 2.2/2}
+
+
+def fees_per_contract(symbols, fees=None):
+    """Look up the per-contract fee for a column of symbols (0 when unknown)."""
+    fees = fee_dict if fees is None else fees
+    return symbols.astype(str).str[:3].map(fees).fillna(0).astype(float)
+
+
+def multipliers(symbols):
+    """Dollars per point for a column of symbols (NQ 20, MNQ 2, MYM 0.5, otherwise 1)."""
+    symbols = symbols.astype(str)
+    return pd.Series(np.select([symbols.str.startswith("NQ"), symbols.str.startswith("MNQ"),
+                                symbols.str.startswith("MYM")], [20, 2, 0.5], 1.0),
+                     index=symbols.index)
+
+
+# -----------------------------
+# 📌 Column Parsers
+# -----------------------------
+
+def round_cents(values):
+    """Round to 2 decimals exactly like Python's round(x, 2).
+
+    np.round scales by 100 first, which lands on the other side of half-cent
+    ties (e.g. -3.285). Only values sitting close to a tie fall back to round().
+    """
+    values = pd.Series(values, dtype=float)
+    rounded = values.round(2)
+    scaled = (values.abs() * 100) % 1
+    near_tie = (scaled - 0.5).abs() < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(v, 2) for v in values[near_tie]]
+    return rounded
+
+
+def parse_pnl(pnl):
+    """Convert Tradovate "$12.50" / "$(2.50)" strings into signed floats."""
+    if pd.api.types.is_numeric_dtype(pnl):
+        return pnl.astype(float)
+
+    text = pnl.astype(str)
+    numeric = pd.to_numeric(text.str.replace(r"[\$\(\),]", "", regex=True)).astype(float)
+    is_loss = text.str.contains("(", regex=False)
+    return (-numeric.abs()).where(is_loss, numeric)  # Convert losses to negative
+
+
+def clean_pnl_column(pnl, symbols, quantities, fees=None):
+    """Parse PnL, deduct fees and round to cents."""
+    return round_cents(parse_pnl(pnl) - quantities * fees_per_contract(symbols, fees))
+
+
+def parse_duration(duration):
+    """Convert "1min 53sec" style durations into total seconds (NaN if invalid)."""
+    parts = duration.astype(str).str.extract(r"^(?:(\d+)min\s*)?(\d+)sec")
+    minutes = pd.to_numeric(parts[0]).fillna(0)
+    seconds = pd.to_numeric(parts[1])
+    total = minutes * 60 + seconds
+
+    # Keep integer seconds when every row parsed, like the committed cleaned files
+    if total.notna().all():
+        return total.astype("int64")
+    return total.astype(float)
+
+
+# -----------------------------
+# 📌 Bucketing
+# -----------------------------
+
+def categorize_duration(seconds):
+    """Categorize Duration into Groups (NaN falls into "5+ min")."""
+    labels = np.select([seconds <= 30, seconds <= 120, seconds <= 300],
+                       ["0-30 sec", "30-120 sec", "2-5 min"], "5+ min")
+    return pd.Series(labels, index=seconds.index)
+
+
+def categorize_session(timestamps):
+    """Categorize Session based on market opening time (17:30:00)."""
+    seconds_of_day = timestamps.dt.hour * 3600 + timestamps.dt.minute * 60 + timestamps.dt.second
+    minutes_since_open = (seconds_of_day - (17 * 3600 + 30 * 60)) / 60
+
+    labels = np.select([(minutes_since_open >= 0) & (minutes_since_open < 30),
+                        (minutes_since_open >= 30) & (minutes_since_open < 60),
+                        (minutes_since_open >= 60) & (minutes_since_open < 120)],
+                       ["0-30 min", "30-60 min", "1-2 hour"], "2+ hour")
+    return pd.Series(labels, index=timestamps.index)
+
+
+# -----------------------------
+# 📌 STEP 1: Columnar Clean
+# -----------------------------
+
+def clean_trades(df, fees=None):
+    """Run the STEP 1 cleaning on a raw Tradovate export using whole-column operations."""
+    # _tickSize is kept, the store uses it to save prices as whole ticks
+    df = df.drop(columns=["_priceFormat", "_priceFormatType"], errors="ignore")
+
+    # Extract only the main contract symbol (removing last 2 characters)
+    df["symbol"] = df["symbol"].astype(str).str[:-2]
+
+    # Determine if the trade is Long or Short
+    df["Side"] = np.where(df["buyFillId"] < df["sellFillId"], "Long", "Short")
+
+    df["Pts"] = (df["sellPrice"] - df["buyPrice"]).astype(float)
+
+    # PnL after fees, with the Win/Loss/Breakeven result taken from the points
+    pnl = parse_pnl(df["pnl"]) - df["qty"] * fees_per_contract(df["symbol"], fees)
+    df["Result"] = pd.Series(np.select([df["Pts"] > 0, df["Pts"] < 0], ["Win", "Loss"], "Breakeven"),
+                             index=df.index)
+    df["Pnl"] = pnl.where(df["Result"] != "Breakeven", 0.0)
+
+    # Convert timestamps to datetime
+    df["boughtTimestamp"] = pd.to_datetime(df["boughtTimestamp"], format="%m/%d/%Y %H:%M:%S")
+    df["soldTimestamp"] = pd.to_datetime(df["soldTimestamp"], format="%m/%d/%Y %H:%M:%S")
+
+    # Trade entry is the buy for Longs and the sell for Shorts
+    df["Trade Entry Time"] = df["boughtTimestamp"].where(df["Side"] == "Long", df["soldTimestamp"])
+
+    df["duration"] = parse_duration(df["duration"])
+    df["Duration Category"] = categorize_duration(df["duration"])
+    df["Session"] = categorize_session(df["Trade Entry Time"])
+
+    # Point is the absolute price move, negative for losses
+    move = (df["sellPrice"] - df["buyPrice"]).abs()
+    df["Point"] = (-move).where(df["Result"] == "Loss", move)
+
+    return df
+
+
+# -----------------------------
+# 📌 STEP 5: Rename Columns & Order
+# -----------------------------
+
+OUTPUT_COLUMNS = {"qty": "Quantity", "symbol": "Symbol", "duration": "Duration",
+                  "Duration Category": "Drt Category", "buyPrice": "Buy Price", "sellPrice": "Sell Price",
+                  "boughtTimestamp": "Bought Time", "soldTimestamp": "Sold Time", "_tickSize": "Tick Size"}
+
+
+def finalize_trades(df, atr_columns=("ATR 1M", "ATR 5M"), fees=None):
+    """Rename to the journal's column names, order them and apply the final PnL pass."""
+    df = df.rename(columns=OUTPUT_COLUMNS)
+    extra_columns = ["Tick Size"] if "Tick Size" in df.columns else []
+    df = df[["Quantity", "Symbol", "Side", "Pnl", "Pts", "Result", "Drt Category", "Session", *atr_columns,
+             "Duration", "Buy Price", "Sell Price", "Bought Time", "Sold Time", *extra_columns]].copy()
+    df["Pnl"] = clean_pnl_column(df["Pnl"], df["Symbol"], df["Quantity"], fees)
+    return df
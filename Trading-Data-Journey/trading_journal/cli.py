@@ -0,0 +1,310 @@
+import argparse
+import json
+import os
+
+from trading_journal.metrics import METRICS_FILE, PROFILERS, Recorder, read_runs
+
+# -----------------------------
+# 👉 Command Line
+# -----------------------------
+# python -m trading_journal <command>. Only this module's standard-library imports are paid up front:
+# each command imports pandas, the store and the Notion/Google clients inside its own handler, so
+# `status` never loads pandas and only the commands that talk to Notion load notion_client.
+# Every command except status/metrics appends its stage metrics to Run-Logs/metrics.jsonl.
+
+DEFAULT_DATABASE_ID = "186e69f71a04806197eed7edba0a7000"  # Same default as the scripts
+
+
+def _add_clean_options(parser):
+    parser.add_argument("--source", default=os.path.join("Trade-Data", "trades.csv"),
+                        help="Tradovate export: one CSV, a folder or a glob (default: %(default)s)")
+    parser.add_argument("--chunk-rows", type=int, default=None, help="stream the exports this many rows at a time")
+    parser.add_argument("--interleaved", action="store_true",
+                        help="also merge fills split up by trades in other symbols or sides")
+    parser.add_argument("--timeframes", nargs="+", default=["1m", "5m"], help="ATR timeframes (default: 1m 5m)")
+    parser.add_argument("--periods", nargs="+", type=int, default=[14], help="ATR periods (default: 14)")
+
+
+def _add_notion_options(parser):
+    parser.add_argument("--token", default=os.environ.get("NOTION_TOKEN", ""),
+                        help="Notion integration token (default: $NOTION_TOKEN)")
+    parser.add_argument("--database-id", default=os.environ.get("NOTION_DATABASE_ID", DEFAULT_DATABASE_ID))
+    parser.add_argument("--concurrency", type=int, default=3, help="parallel page uploads (default: 3)")
+    parser.add_argument("--full-index-rebuild", action="store_true",
+                        help="re-read every Notion page instead of only recently edited ones")
+
+
+def _add_sheets_options(parser):
+    parser.add_argument("--sheet-name", default="Trading Data")
+    parser.add_argument("--credentials", default="google_sheets_credentials.json",
+                        help="service account file (default: %(default)s)")
+    parser.add_argument("--refresh-keys", action="store_true",
+                        help="re-read the sheet's trades instead of trusting sheets_keys.json")
+
+
+def _add_sink_choices(parser):
+    parser.add_argument("--no-notion", action="store_true", help="skip the Notion sink")
+    parser.add_argument("--no-sheets", action="store_true", help="skip the Google Sheets sink")
+    parser.add_argument("--sqlite", metavar="PATH", help="also keep a local SQLite copy of every trade")
+
+
+# -----------------------------
+# 👉 Sinks (clients imported on demand)
+# -----------------------------
+
+def _notion_options(args, replay_failed=True):
+    if not args.token:
+        raise SystemExit("❌ Error: no Notion token, set NOTION_TOKEN or pass --token")
+    return {"concurrency": args.concurrency, "replay_failed": replay_failed,
+            "full_index_rebuild": args.full_index_rebuild}
+
+
+def _notion_sink(args, replay_failed=True):
+    from trading_journal.sinks import notion_sink
+
+    return notion_sink(args.token, args.database_id, **_notion_options(args, replay_failed))
+
+
+def _sheets_sink(args):
+    from trading_journal.sinks import sheets_sink
+
+    return sheets_sink(args.credentials, args.sheet_name, refresh_keys=args.refresh_keys)
+
+
+def _chosen_sinks(args):
+    from trading_journal.sinks import build_sinks
+
+    return build_sinks(notion_token=args.token, database_id=None if args.no_notion else args.database_id,
+                       credentials_file=args.credentials, sheet_name=None if args.no_sheets else args.sheet_name,
+                       sqlite_path=args.sqlite, notion_options=None if args.no_notion else _notion_options(args),
+                       sheets_options={"refresh_keys": args.refresh_keys})
+
+
+def _report(results):
+    """Print publish()'s per-sink results; returns the exit code."""
+    failed = False
+    for name, result in results.items():
+        if isinstance(result, Exception):
+            print(f"⚠️ {name}: failed, will retry next run")
+            failed = True
+        else:
+            print(f"✅ {name}: {result} trades uploaded")
+    return 1 if failed else 0
+
+
+# -----------------------------
+# 👉 Commands
+# -----------------------------
+
+def cmd_status(args):
+    from trading_journal.status import store_status
+
+    status = store_status(args.store, args.analytics)
+    if args.json:
+        print(json.dumps(status, indent=2))
+        return 0
+    if not status["trades"]:
+        print(f"📦 {status['folder']}: no trades stored yet")
+    else:
+        print(f"📦 {status['folder']}: {status['trades']} trades from {status['first_date']} to "
+              f"{status['last_date']}, last seq {status['last_seq']}")
+    for sink, state in status["sinks"].items():
+        failed = f", {state['failed']} failed" if state["failed"] else ""
+        print(f"   {sink}: synced to seq {state['synced_seq']}, {state['pending']} pending{failed}")
+    return 0
+
+
+def _format_stage(record):
+    rows = " → ".join(str(record[key]) for key in ("rows_in", "rows_out") if record.get(key) is not None)
+    parts = [f"{record['wall_s']:8.3f}s", f"{record['stage']:<24}", f"{rows:>15}"]
+    if record.get("rows_per_s"):
+        parts.append(f"{record['rows_per_s']:>12,.0f} rows/s")
+    if record.get("peak_rss_mb") is not None:
+        parts.append(f"{record['peak_rss_mb']:>8.1f} MB")
+    for service, counts in record.get("api", {}).items():
+        parts.append(f"{service}: {counts['calls']} calls, {counts['retries']} retries, "
+                     f"{counts['rate_limit_waits']} waits ({counts['wait_s']:.1f}s)")
+    if record.get("error"):
+        parts.append(f"❌ {record['error']}")
+    return "  ".join(parts)
+
+
+def cmd_metrics(args):
+    runs = read_runs(args.metrics)
+    if not runs:
+        print(f"📈 No metrics recorded in {args.metrics} yet")
+        return 0
+    if args.list:
+        for run_id, records in list(runs.items())[-args.list:]:
+            total = next((record for record in records if "stages" in record), None)
+            summary = f"{total['stage']:<14} {total['wall_s']:8.3f}s, slowest: {total['slowest']}" if total else \
+                "(did not finish)"
+            print(f"{run_id}  {summary}")
+        return 0
+
+    run_id = args.run or next(reversed(runs))
+    if run_id not in runs:
+        print(f"❌ Error: no run {run_id} in {args.metrics}")
+        return 1
+    print(f"📈 Run {run_id}")
+    for record in runs[run_id]:
+        if "stages" in record:
+            print(f"🏁 {_format_stage(record)}  ({record['stages']} stages, slowest: {record['slowest']})")
+        else:
+            print(f"   {_format_stage(record)}")
+    return 0
+
+
+def cmd_clean(args):
+    from trading_journal.market_data import BarCache
+    from trading_journal.pipeline import run_pipeline
+    from trading_journal.trade_store import TradeStore
+
+    store = TradeStore(args.store)
+    try:
+        new_count, _ = run_pipeline(args.source, store, [], chunk_rows=args.chunk_rows, bar_cache=BarCache(),
+                                    interleaved=args.interleaved, timeframes=args.timeframes, periods=args.periods)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    print(f"✅ {new_count} new or changed trades saved to: {store.folder}")
+    return 0
+
+
+def _upload(args, sink):
+    from trading_journal.pipeline import publish
+    from trading_journal.trade_store import TradeStore
+
+    return _report(publish(TradeStore(args.store), [sink]))
+
+
+def cmd_upload_notion(args):
+    return _upload(args, _notion_sink(args, replay_failed=not args.no_replay))
+
+
+def cmd_upload_sheets(args):
+    return _upload(args, _sheets_sink(args))
+
+
+def cmd_replay_failed(args):
+    import pandas as pd
+
+    from trading_journal.sinks import REQUIRED_COLUMNS
+
+    sink = _notion_sink(args) if args.sink == "notion" else _sheets_sink(args)
+    if not os.path.exists(sink.failed_path):
+        print(f"✅ No failed {sink.name} trades to replay")
+        return 0
+    sink.write(pd.DataFrame(columns=REQUIRED_COLUMNS))  # Nothing new, only the failed log is re-sent
+    if os.path.exists(sink.failed_path):
+        print(f"⚠️ Some trades still fail, kept in {sink.failed_path}")
+        return 1
+    print(f"🎉 Every failed {sink.name} trade went through!")
+    return 0
+
+
+def cmd_run(args):
+    from trading_journal.analytics import AnalyticsCube
+    from trading_journal.market_data import BarCache
+    from trading_journal.pipeline import run_pipeline
+    from trading_journal.trade_store import TradeStore
+
+    sinks = _chosen_sinks(args)
+    store = TradeStore(args.store)
+    try:
+        new_count, results = run_pipeline(args.source, store, sinks, chunk_rows=args.chunk_rows, bar_cache=BarCache(),
+                                          interleaved=args.interleaved, timeframes=args.timeframes,
+                                          periods=args.periods)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    print(f"✅ {new_count} new or changed trades saved to: {store.folder}")
+    code = _report(results)
+    if not args.no_analytics:
+        print(f"✅ {AnalyticsCube(args.analytics).update(store)} trades folded into the analytics cube")
+    return code
+
+
+def cmd_watch(args):
+    from trading_journal.market_data import BarCache
+    from trading_journal.trade_store import TradeStore
+    from trading_journal.watch import ExportWatcher
+
+    if not os.path.isdir(args.folder):
+        print(f"❌ Error: Trade data folder not found at {args.folder}")
+        return 1
+    sinks = _chosen_sinks(args)
+    watcher = ExportWatcher(args.folder, TradeStore(args.store), sinks, bar_cache=BarCache(),
+                            poll_interval=args.poll_interval, interleaved=args.interleaved,
+                            timeframes=args.timeframes, periods=args.periods)
+    watcher.run()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m trading_journal",
+                                     description="Clean Tradovate exports and keep the trade journal in sync.")
+    parser.add_argument("--store", default="Trade-Store", help="trade store folder (default: %(default)s)")
+    parser.add_argument("--analytics", default="Analytics", help="analytics cube folder (default: %(default)s)")
+    parser.add_argument("--metrics", default=METRICS_FILE, help="stage metrics file (default: %(default)s)")
+    parser.add_argument("--no-metrics", action="store_true", help="don't record stage metrics")
+    parser.add_argument("--profile", choices=PROFILERS, help="also write a profile of every stage to Run-Logs/profiles")
+    parser.add_argument("--profile-stage", action="append", metavar="STAGE",
+                        help="only profile this stage (repeatable), e.g. merge or publish.notion")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    status = commands.add_parser("status", help="stored trades, sync marks and failed trades (no pandas)")
+    status.add_argument("--json", action="store_true", help="print the status as JSON")
+    status.set_defaults(func=cmd_status, recorded=False)
+
+    metrics = commands.add_parser("metrics", help="stage timings, rows, memory and API calls of a recorded run")
+    metrics.add_argument("--run", help="run id to show (default: the latest)")
+    metrics.add_argument("--list", type=int, nargs="?", const=20, metavar="N", help="list the last N runs instead")
+    metrics.set_defaults(func=cmd_metrics, recorded=False)
+
+    clean = commands.add_parser("clean", help="clean the exports into the trade store")
+    _add_clean_options(clean)
+    clean.set_defaults(func=cmd_clean)
+
+    upload_notion = commands.add_parser("upload-notion", help="upload stored trades Notion hasn't seen")
+    _add_notion_options(upload_notion)
+    upload_notion.add_argument("--no-replay", action="store_true", help="keep failed_trades.csv for a later run")
+    upload_notion.set_defaults(func=cmd_upload_notion)
+
+    upload_sheets = commands.add_parser("upload-sheets", help="append stored trades Google Sheets hasn't seen")
+    _add_sheets_options(upload_sheets)
+    upload_sheets.set_defaults(func=cmd_upload_sheets)
+
+    replay = commands.add_parser("replay-failed", help="re-send one sink's failed trade log")
+    replay.add_argument("sink", choices=["notion", "sheets"])
+    _add_notion_options(replay)
+    _add_sheets_options(replay)
+    replay.set_defaults(func=cmd_replay_failed)
+
+    run = commands.add_parser("run", help="clean once and upload to every sink")
+    _add_clean_options(run)
+    _add_sink_choices(run)
+    _add_notion_options(run)
+    _add_sheets_options(run)
+    run.add_argument("--no-analytics", action="store_true", help="don't update the analytics cube")
+    run.set_defaults(func=cmd_run)
+
+    watch = commands.add_parser("watch", help="tail the export folder and publish trades as they close")
+    watch.add_argument("--folder", default="Trade-Data", help="folder of live exports (default: %(default)s)")
+    watch.add_argument("--poll-interval", type=float, default=1.0, help="seconds between checks without inotify")
+    watch.add_argument("--interleaved", action="store_true")
+    watch.add_argument("--timeframes", nargs="+", default=["1m", "5m"])
+    watch.add_argument("--periods", nargs="+", type=int, default=[14])
+    _add_sink_choices(watch)
+    _add_notion_options(watch)
+    _add_sheets_options(watch)
+    watch.set_defaults(func=cmd_watch)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.no_metrics or not getattr(args, "recorded", True):
+        return args.func(args)
+    with Recorder(args.metrics, profile=args.profile, profile_stages=args.profile_stage, label=args.command):
+        return args.func(args)
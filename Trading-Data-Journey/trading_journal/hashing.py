@@ -0,0 +1,44 @@
+import hashlib
+
+import pandas as pd
+
+from trading_journal.schema import expand_trades
+
+# -----------------------------
+# 📌 Content Hashes
+# -----------------------------
+
+# Bookkeeping columns that say nothing about the trade itself (Tick Size follows from the Symbol)
+HASH_EXCLUDED_COLUMNS = {"Seq", "Tick Size"}
+
+
+def content_hash(trades):
+    """One uint64 per trade over all of its fields.
+
+    Values are brought to one form first (numbers as rounded floats, times as
+    nanoseconds, labels as text), so a cleaner frame and its stored, compact
+    or expanded copy hash the same, and the hash only changes when a value does.
+    """
+    trades = expand_trades(trades)
+    canonical = {}
+    for col in sorted(col for col in trades.columns if col not in HASH_EXCLUDED_COLUMNS):
+        values = trades[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            canonical[col] = values.to_numpy(dtype="datetime64[ns]").view("int64")
+        elif pd.api.types.is_numeric_dtype(values):
+            canonical[col] = values.astype(float).round(9).to_numpy()
+        else:
+            canonical[col] = values.astype(str).to_numpy(dtype=object)
+    return pd.util.hash_pandas_object(pd.DataFrame(canonical, index=trades.index), index=False).to_numpy()
+
+
+def value_digest(value):
+    """Short digest of one field as a sink wrote it, to tell which fields of a trade changed."""
+    return hashlib.blake2b(str(value).encode(), digest_size=4).hexdigest()
+
+
+def changed_fields(new_digests, old_digests):
+    """Names of the fields whose digest differs; every field when nothing was recorded for the trade."""
+    if not old_digests:
+        return list(new_digests)
+    return [name for name, digest in new_digests.items() if old_digests.get(name) != digest]
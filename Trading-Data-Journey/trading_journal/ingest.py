@@ -0,0 +1,217 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from trading_journal.atr import ATR_PERIOD, atr_column, atr_warmup, attach_atr, build_atr_frame
+from trading_journal.cleaning import clean_trades, finalize_trades
+from trading_journal.market_data import BarCache, data_ticker
+from trading_journal.merging import MERGE_WINDOW_SECONDS, assign_merge_groups, merge_trades
+from trading_journal.metrics import stage
+
+# -----------------------------
+# 📌 Finding & Reading Exports
+# -----------------------------
+
+# Columns every Tradovate fill export has
+EXPORT_COLUMNS = ["symbol", "buyFillId", "sellFillId", "qty", "buyPrice", "sellPrice", "pnl",
+                  "boughtTimestamp", "soldTimestamp", "duration"]
+
+
+def is_tradovate_export(path):
+    """True when the CSV header has the Tradovate fill columns (not a cleaned journal file)."""
+    try:
+        columns = pd.read_csv(path, nrows=0).columns
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError):
+        return False
+    # Intermediate files from older cleaner versions kept the raw columns next to the cleaned ones
+    return set(EXPORT_COLUMNS) <= set(columns) and not {"Side", "Trade Entry Time"} & set(columns)
+
+
+def find_exports(source):
+    """Expand a CSV path, a folder or a glob into the Tradovate exports it names."""
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, "*.csv"))
+    else:
+        paths = glob.glob(source)
+
+    # Skip files written by the cleaner itself (and older cleaned versions lying around)
+    return sorted(p for p in paths
+                  if not os.path.basename(p).startswith("Cleaned_Trades_") and is_tradovate_export(p))
+
+
+def read_exports(paths, chunksize=None):
+    """Yield the raw rows of each export, in chunks of at most `chunksize` rows."""
+    for path in paths:
+        if chunksize is None:
+            yield pd.read_csv(path)
+        else:
+            yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def clean_exports(paths, bar_cache=None, interleaved=False, timeframes=("1m", "5m"), periods=(ATR_PERIOD,)):
+    """Clean, merge and ATR-tag whole exports in memory (the Data-Cleaner batch path)."""
+    bar_cache = bar_cache if bar_cache is not None else BarCache()
+    with stage("read") as s:
+        df = pd.concat(read_exports(paths), ignore_index=True)
+        s.rows_out = len(df)
+    with stage("clean", rows_in=len(df)) as s:
+        df = clean_trades(df)
+        s.rows_out = len(df)
+    with stage("merge", rows_in=len(df)) as s:
+        df = merge_trades(df, interleaved=interleaved)
+        s.rows_out = len(df)
+
+    with stage("bars") as s:
+        contract_tickers = {root: data_ticker(root) for root in sorted(df["symbol"].unique())}
+        bars_by_ticker = bar_cache.history_many(contract_tickers.values(), "1m",
+                                                since=df["Trade Entry Time"].min() - atr_warmup(timeframes, periods))
+        s.rows_out = bar_rows = sum(len(bars) for bars in bars_by_ticker.values())
+    with stage("atr", rows_in=bar_rows) as s:
+        atr_df = build_atr_frame({root: bars_by_ticker[ticker] for root, ticker in contract_tickers.items()},
+                                 timeframes=timeframes, periods=periods)
+        s.rows_out = len(atr_df)
+    with stage("attach_atr", rows_in=len(df)) as s:
+        df = attach_atr(df, atr_df)
+        s.rows_out = len(df)
+    with stage("finalize", rows_in=len(df)) as s:
+        df = finalize_trades(df, [atr_column(tf, p) for tf in timeframes for p in periods])
+        s.rows_out = len(df)
+    return df
+
+
+# -----------------------------
+# 📌 Streaming Cleaner
+# -----------------------------
+
+class StreamingCleaner:
+    """Clean, merge and ATR-tag exports chunk by chunk with bounded memory.
+
+    Between chunks it only keeps the fills of trades that can still absorb a
+    later fill, and the ATR of the bar window around the previous chunk. In
+    interleaved mode the exports have to be in time order for that carried
+    state to be enough. ATR is computed from `warmup` worth of earlier bars,
+    by default enough for the longest timeframe's Wilder average to settle.
+    """
+
+    def __init__(self, bar_cache=None, interleaved=False, timeframes=("1m", "5m"), periods=(ATR_PERIOD,),
+                 warmup=None, window=MERGE_WINDOW_SECONDS):
+        self.bar_cache = bar_cache if bar_cache is not None else BarCache()
+        self.interleaved = interleaved
+        self.timeframes = list(timeframes)
+        self.periods = list(periods)
+        self.warmup = warmup if warmup is not None else atr_warmup(timeframes, periods)
+        self.window = window
+
+        self._pending = None  # Cleaned fills of trades that are still open
+        self._atr = {}  # symbol -> (first, last, ATR frame) covering that range of entry times
+        self._refreshed = set()
+
+    @property
+    def atr_columns(self):
+        return [atr_column(tf, p) for tf in self.timeframes for p in self.periods]
+
+    def _open_rows(self, frame, groups):
+        """Rows of trades that a fill in the next chunk could still merge into."""
+        if not self.interleaved:
+            return groups == groups[-1]  # Fills are only compared with the last trade
+
+        heads = np.unique(groups)
+        cutoff = frame["Trade Entry Time"].max() - pd.Timedelta(seconds=self.window)
+        open_heads = heads[frame["Trade Entry Time"].to_numpy()[heads] >= cutoff]
+        return np.isin(groups, open_heads)
+
+    def _merge(self, cleaned, final=False):
+        frame = cleaned if self._pending is None else pd.concat([self._pending, cleaned], ignore_index=True)
+        self._pending = None
+        if frame.empty or final:
+            return merge_trades(frame, interleaved=self.interleaved, window=self.window)
+
+        groups = assign_merge_groups(frame, interleaved=self.interleaved, window=self.window)
+        is_open = self._open_rows(frame, groups)
+        self._pending = frame[is_open].reset_index(drop=True)
+        return merge_trades(frame[~is_open], interleaved=self.interleaved, window=self.window)
+
+    def _atr_frame(self, trades):
+        """ATR for the trades' symbols, reusing the last window when it still covers them."""
+        first, last = trades["Trade Entry Time"].min(), trades["Trade Entry Time"].max()
+        stale = [symbol for symbol in trades["symbol"].unique()
+                 if symbol not in self._atr or first < self._atr[symbol][0] or last > self._atr[symbol][1]]
+
+        if stale:
+            since, until = first - self.warmup, last + pd.Timedelta(days=1)
+            tickers = {symbol: data_ticker(symbol) for symbol in stale}
+            new_tickers = [t for t in tickers.values() if t not in self._refreshed]
+            old_tickers = [t for t in tickers.values() if t in self._refreshed]
+
+            # Download the missing tail once per ticker, later windows come from disk
+            bars = self.bar_cache.history_many(new_tickers, "1m", since=since, until=until)
+            bars.update(self.bar_cache.history_many(old_tickers, "1m", since=since, until=until, refresh=False))
+            self._refreshed.update(new_tickers)
+
+            for symbol, ticker in tickers.items():
+                atr = build_atr_frame({symbol: bars[ticker]}, timeframes=self.timeframes, periods=self.periods)
+                covered_until = atr["Datetime"].max() if not atr.empty else last
+                self._atr[symbol] = (first, max(last, covered_until), atr)
+
+        return pd.concat([self._atr[symbol][2] for symbol in trades["symbol"].unique()], ignore_index=True)
+
+    def _finish(self, merged):
+        if merged.empty:
+            return merged.iloc[0:0]
+        return finalize_trades(attach_atr(merged, self._atr_frame(merged)), self.atr_columns)
+
+    def process(self, raw_chunk):
+        """Clean one chunk of raw export rows; returns the trades that are complete."""
+        return self._finish(self._merge(clean_trades(raw_chunk)))
+
+    @property
+    def pending_rows(self):
+        return 0 if self._pending is None else len(self._pending)
+
+    def release(self, now):
+        """Finish the held-back trades that no fill entered at or after `now` could still join."""
+        if not self.pending_rows:
+            return pd.DataFrame()
+        frame, cutoff = self._pending, now - pd.Timedelta(seconds=self.window)
+        groups = assign_merge_groups(frame, interleaved=self.interleaved, window=self.window)
+        heads = np.unique(groups)
+        is_open = np.isin(groups, heads[frame["Trade Entry Time"].to_numpy()[heads] >= cutoff])
+        self._pending = frame[is_open].reset_index(drop=True) if is_open.any() else None
+        return self._finish(merge_trades(frame[~is_open], interleaved=self.interleaved, window=self.window))
+
+    def flush(self):
+        """Return the trades still held back at the end of the stream."""
+        if self._pending is None:
+            return pd.DataFrame()
+        return self._finish(self._merge(self._pending.iloc[0:0], final=True))
+
+
+def _clean_stream(cleaner, chunks, counter):
+    for chunk in chunks:
+        counter.rows_in += len(chunk)
+        yield cleaner.process(chunk)
+    yield cleaner.flush()
+
+
+def stream_clean_exports(source, store, chunksize=50_000, bar_cache=None, **options):
+    """Clean every export under `source` in chunks, inserting finished trades into `store`.
+
+    Returns the number of trades cleaned and the number that were new to the store.
+    """
+    paths = find_exports(source)
+    if not paths:
+        raise FileNotFoundError(f"No Tradovate exports found at {source}")
+
+    cleaner = StreamingCleaner(bar_cache=bar_cache, **options)
+    cleaned = inserted = 0
+    # One stage for the whole stream, a line per chunk would bury the rest of the run
+    with stage("stream_clean", rows_in=0) as s:
+        for trades in _clean_stream(cleaner, read_exports(paths, chunksize), s):
+            if trades.empty:
+                continue
+            cleaned += len(trades)
+            inserted += store.insert(trades)
+        s.rows_out = cleaned
+    return cleaned, inserted
@@ -0,0 +1,167 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from trading_journal.metrics import carry_context, count_api
+
+# -----------------------------
+# 📌 On-Disk OHLC Bar Cache
+# -----------------------------
+
+CACHE_FOLDER = "Market-Data"
+BAR_COLUMNS = ["Datetime", "Open", "High", "Low", "Close", "Volume"]
+
+# Length of one bar, used to decide whether the cache is already up to date
+INTERVALS = {"1m": pd.Timedelta(minutes=1), "2m": pd.Timedelta(minutes=2), "5m": pd.Timedelta(minutes=5),
+             "15m": pd.Timedelta(minutes=15), "30m": pd.Timedelta(minutes=30), "60m": pd.Timedelta(hours=1),
+             "1h": pd.Timedelta(hours=1), "1d": pd.Timedelta(days=1)}
+
+# How far back Yahoo serves each interval in a single request
+MAX_LOOKBACK = {"1m": pd.Timedelta(days=7), "2m": pd.Timedelta(days=59), "5m": pd.Timedelta(days=59),
+                "15m": pd.Timedelta(days=59), "30m": pd.Timedelta(days=59), "60m": pd.Timedelta(days=729),
+                "1h": pd.Timedelta(days=729)}
+
+# Yahoo Finance ticker for each contract root found in the exports
+DATA_TICKERS = {"NQ": "NQ=F", "MNQ": "MNQ=F", "ES": "ES=F", "MES": "MES=F",
+                "YM": "YM=F", "MYM": "MYM=F", "RTY": "RTY=F", "M2K": "M2K=F"}
+
+
+def data_ticker(contract_root):
+    """Return the market-data ticker for a contract root such as "MNQ"."""
+    return DATA_TICKERS.get(contract_root, f"{contract_root}=F")
+
+
+def empty_bars():
+    """An empty bar frame with the cached column types."""
+    return pd.DataFrame({"Datetime": pd.Series(dtype="datetime64[ns, UTC]"),
+                         **{col: pd.Series(dtype=float) for col in BAR_COLUMNS[1:]}})
+
+
+class YahooFetcher:
+    """Download OHLC bars from Yahoo Finance."""
+
+    def fetch(self, ticker, interval, start=None, end=None, period="7d"):
+        import yfinance as yf
+
+        if start is None:
+            bars = yf.Ticker(ticker).history(period=period, interval=interval)
+        else:
+            bars = yf.Ticker(ticker).history(start=start, end=end, interval=interval)
+
+        bars = bars.reset_index()
+        return bars.rename(columns={bars.columns[0]: "Datetime"})
+
+
+class BarCache:
+    """OHLC bars stored as one Feather file per ticker, interval and UTC day.
+
+    Only the bars after the last cached one are downloaded, so history older
+    than Yahoo's intraday limit stays available. Any object with the same
+    `fetch()` signature as YahooFetcher can stand in for Yahoo.
+    """
+
+    def __init__(self, folder=CACHE_FOLDER, fetcher=None):
+        self.folder = folder
+        self.fetcher = fetcher if fetcher is not None else YahooFetcher()
+
+    def _partition_folder(self, ticker, interval):
+        return os.path.join(self.folder, ticker, interval)
+
+    def _day_files(self, ticker, interval):
+        folder = self._partition_folder(ticker, interval)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".feather"))
+
+    def load(self, ticker, interval, since=None, until=None):
+        """Return cached bars, optionally only the UTC days from `since` to `until`."""
+        files = self._day_files(ticker, interval)
+        if since is not None:
+            first_day = pd.Timestamp(since).strftime("%Y-%m-%d")
+            files = [f for f in files if os.path.basename(f)[:10] >= first_day]
+        if until is not None:
+            last_day = pd.Timestamp(until).strftime("%Y-%m-%d")
+            files = [f for f in files if os.path.basename(f)[:10] <= last_day]
+        if not files:
+            return empty_bars()
+
+        # Uncompressed Feather files are memory-mapped instead of read into memory
+        tables = [feather.read_table(f, memory_map=True).to_pandas() for f in files]
+        return pd.concat(tables, ignore_index=True)
+
+    def last_bar_time(self, ticker, interval):
+        files = self._day_files(ticker, interval)
+        if not files:
+            return None
+        return feather.read_table(files[-1], columns=["Datetime"], memory_map=True).to_pandas()["Datetime"].max()
+
+    def store(self, ticker, interval, bars):
+        """Merge bars into their day files, newer downloads replacing older ones."""
+        if bars.empty:
+            return
+        bars = bars[BAR_COLUMNS]
+        folder = self._partition_folder(ticker, interval)
+        os.makedirs(folder, exist_ok=True)
+
+        days = pd.to_datetime(bars["Datetime"], utc=True).dt.strftime("%Y-%m-%d")
+        for day, day_bars in bars.groupby(days):
+            path = os.path.join(folder, f"{day}.feather")
+            if os.path.exists(path):
+                day_bars = pd.concat([feather.read_table(path).to_pandas(), day_bars], ignore_index=True)
+            day_bars = (day_bars.drop_duplicates(subset="Datetime", keep="last")
+                        .sort_values("Datetime").reset_index(drop=True))
+
+            tmp_path = path + ".tmp"
+            feather.write_feather(day_bars, tmp_path, compression="uncompressed")
+            os.replace(tmp_path, path)
+
+    def update(self, ticker, interval, now=None):
+        """Download the bars missing after the last cached one. Returns the number fetched."""
+        now = pd.Timestamp.now(tz="UTC") if now is None else now
+        last_bar = self.last_bar_time(ticker, interval)
+
+        if last_bar is None:
+            count_api("yahoo")
+            bars = self.fetcher.fetch(ticker, interval)
+        else:
+            if now - last_bar < INTERVALS.get(interval, pd.Timedelta(0)):
+                return 0  # Already up to date
+
+            # Re-fetch the last bar too, it may have been cached before it closed
+            start = last_bar.tz_convert("UTC")
+            lookback = MAX_LOOKBACK.get(interval)
+            if lookback is not None and now - start > lookback:
+                start = now - lookback
+            count_api("yahoo")
+            bars = self.fetcher.fetch(ticker, interval, start=start.to_pydatetime(), end=now.to_pydatetime())
+
+        self.store(ticker, interval, bars)
+        return len(bars)
+
+    def refresh(self, ticker, interval):
+        """update() that only warns when the download fails, leaving the cache as it was."""
+        # history_many() runs this on worker threads: each line goes out in a single write, newline
+        # included, so lines from two tickers don't run together
+        try:
+            fetched = self.update(ticker, interval)
+            print(f"✅ {ticker} {interval}: fetched {fetched} new bars\n", end="")
+        except Exception as e:
+            print(f"⚠️ Warning: Could not update {ticker} {interval} bars, using cached data - {e}\n", end="")
+
+    def history(self, ticker, interval, since=None, until=None, refresh=True):
+        """Refresh the cache, falling back to what is on disk if the download fails."""
+        if refresh:
+            self.refresh(ticker, interval)
+        return self.load(ticker, interval, since=since, until=until)
+
+    def history_many(self, tickers, interval, since=None, until=None, refresh=True, max_workers=8):
+        """Fetch several tickers concurrently; returns {ticker: bars}."""
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as pool:
+            results = pool.map(carry_context(lambda ticker: self.history(ticker, interval, since=since, until=until,
+                                                                         refresh=refresh)), tickers)
+            return dict(zip(tickers, results))
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+
+from trading_journal.cleaning import clean_pnl_column, fees_per_contract, multipliers
+
+# Fills entered within this many seconds of the first fill are one trade
+MERGE_WINDOW_SECONDS = 5
+
+# Whole-array passes before the remaining runs of close fills are finished row by row
+MAX_VECTOR_PASSES = 8
+
+
+def _comparison_order(df, interleaved):
+    """Row positions in the order fills are compared with each other."""
+    if not interleaved:
+        return np.arange(len(df))
+    return np.lexsort((np.arange(len(df)), df["Trade Entry Time"].to_numpy(),
+                       df["Side"].to_numpy(), df["symbol"].to_numpy()))
+
+
+def assign_merge_groups(df, interleaved=False, window=MERGE_WINDOW_SECONDS):
+    """Return, for every row, the position of the trade it merges into.
+
+    A row merges into the current trade (the last row that did not merge) when
+    it has the same side and contract, was entered at most `window` seconds
+    after it, and both durations are longer than that gap.
+
+    By default rows are compared in file order, exactly like the original loop.
+    With `interleaved=True` the rows are first ordered by (contract root, Side,
+    Trade Entry Time), so fills split by other symbols or sides still merge.
+    """
+    n = len(df)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    order = _comparison_order(df, interleaved)
+    contract = (df["symbol"] if interleaved else df["symbol"].str[:2]).to_numpy()[order]
+    side = df["Side"].to_numpy()[order]
+    entry = df["Trade Entry Time"].to_numpy()[order].astype("datetime64[ns]").astype(np.int64) / 1e9
+    duration = df["duration"].to_numpy(dtype=float)[order]
+
+    # Rows that can never merge into an earlier row start a new trade
+    heads = np.ones(n, dtype=bool)
+    heads[1:] = (contract[1:] != contract[:-1]) | (side[1:] != side[:-1])
+    heads |= np.isnan(duration)
+    if interleaved:
+        # Entry times only grow inside a (contract, side) block, so any head is
+        # at least as far back as the previous row
+        gap = np.diff(entry, prepend=entry[0])
+        heads[1:] |= (gap[1:] > window) | (duration[1:] <= gap[1:])
+
+    # Each row is compared with the head of its block; the first row that does
+    # not fit becomes a head itself. A pass promotes one head per block, which
+    # settles almost every block within a few passes. A long run of close fills
+    # can need one pass per trade in it, so after MAX_VECTOR_PASSES the blocks
+    # still unsettled are finished in a single row-by-row sweep from their first
+    # misfit. That keeps the stage at O(n) for any input: at most
+    # MAX_VECTOR_PASSES array passes plus one visit per remaining row.
+    for _ in range(MAX_VECTOR_PASSES):
+        segment, head_pos, misfits = _misfits(heads, entry, duration, window)
+        if len(misfits) == 0:
+            break
+        heads[misfits[_first_per_segment(segment, misfits)]] = True
+    else:
+        segment, head_pos, misfits = _misfits(heads, entry, duration, window)
+        if len(misfits):
+            _sweep(heads, entry, duration, window, misfits[_first_per_segment(segment, misfits)])
+            segment = np.cumsum(heads) - 1
+            head_pos = np.flatnonzero(heads)[segment]
+
+    groups = np.empty(n, dtype=np.int64)
+    groups[order] = order[head_pos]
+    return groups
+
+
+def _misfits(heads, entry, duration, window):
+    """Each row's block, the position of its head and the rows that don't fit their head."""
+    segment = np.cumsum(heads) - 1
+    head_pos = np.flatnonzero(heads)[segment]
+    entry_diff = entry - entry[head_pos]
+    fits = heads | ((entry_diff <= window) & (duration > entry_diff) & (duration[head_pos] > entry_diff))
+    return segment, head_pos, np.flatnonzero(~fits)
+
+
+def _first_per_segment(segment, rows):
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = segment[rows[1:]] != segment[rows[:-1]]
+    return first
+
+
+def _sweep(heads, entry, duration, window, starts):
+    """Settle blocks one row at a time from `starts` (each a misfit, so a head) to the block's end."""
+    block_ends = np.append(np.flatnonzero(heads), len(heads))
+    entry_list, duration_list = entry.tolist(), duration.tolist()
+    for start in starts.tolist():
+        end = block_ends[np.searchsorted(block_ends, start, side="right")]
+        heads[start] = True
+        head = start
+        for row in range(start + 1, end):
+            entry_diff = entry_list[row] - entry_list[head]
+            if not (entry_diff <= window and duration_list[row] > entry_diff and duration_list[head] > entry_diff):
+                heads[row] = True
+                head = row
+
+
+def merge_trades(df, interleaved=False, window=MERGE_WINDOW_SECONDS, fees=None):
+    """Merge fills entered within `window` seconds into single trades.
+
+    Merged trades sum `qty`, keep the best `Point` and recompute `Pnl` from the
+    contract multiplier; single fills get their fee-adjusted `pnl`.
+    """
+    df = df.reset_index(drop=True)
+    groups = assign_merge_groups(df, interleaved=interleaved, window=window)
+    if len(df) == 0:
+        return df.assign(Pnl=pd.Series(dtype=float))
+
+    # Aggregate in comparison order so "last" is the last fill merged in
+    order = _comparison_order(df, interleaved)
+    merged = df[["qty", "Point"]].take(order).groupby(groups[order], sort=True).agg(
+        qty=("qty", "sum"), Point=("Point", "max"), last_qty=("qty", "last"), fills=("qty", "size"))
+
+    trades = df.loc[merged.index].copy()
+    trades["qty"] = merged["qty"].to_numpy()
+    trades["Point"] = merged["Point"].to_numpy()
+
+    # Single fills: fee-adjusted PnL. Merged: qty * Point * multiplier - fees.
+    single_pnl = clean_pnl_column(trades["pnl"], trades["symbol"], trades["qty"], fees)
+    merged_pnl = (trades["qty"] * trades["Point"] * multipliers(trades["symbol"])
+                  - (trades["qty"] + merged["last_qty"].to_numpy()) * fees_per_contract(trades["symbol"], fees))
+    trades["Pnl"] = merged_pnl.where(merged["fills"].to_numpy() > 1, single_pnl)
+
+    return trades.reset_index(drop=True)
@@ -0,0 +1,246 @@
+import atexit
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# -----------------------------
+# 📌 Stage Metrics
+# -----------------------------
+# Each pipeline stage is wrapped in `with stage("merge", rows_in=...) as s:`. While a Recorder is
+# running, every stage appends one JSON line to its metrics file: wall time, rows in/out, rows/sec,
+# peak RSS and the API calls, retries and rate-limit waits made for it. Without a Recorder a stage
+# only costs a couple of attribute lookups.
+
+METRICS_FILE = os.path.join("Run-Logs", "metrics.jsonl")
+PROFILE_FOLDER = os.path.join("Run-Logs", "profiles")
+PROFILERS = ("cprofile", "pyinstrument")
+API_COUNTERS = ("calls", "retries", "rate_limit_waits", "wait_s")
+
+_active = None  # The running Recorder
+_current = contextvars.ContextVar("trading_journal_stage", default=None)
+_lock = threading.Lock()
+
+
+def peak_rss_mb():
+    """Highest resident set size of this process so far, in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1)  # Bytes on macOS, KB elsewhere
+
+
+def _new_api():
+    return defaultdict(lambda: dict.fromkeys(API_COUNTERS, 0))
+
+
+def _api_totals(api):
+    return {service: {event: round(value, 3) for event, value in counts.items()} for service, counts in api.items()}
+
+
+def count_api(service, event="calls", amount=1):
+    """Count an API call, retry or rate-limit wait against the running stages and the run."""
+    recorder = _active
+    if recorder is None:
+        return
+    with _lock:
+        recorder.api[service][event] += amount
+        stage_ = _current.get()
+        while stage_ is not None:
+            stage_.api[service][event] += amount
+            stage_ = stage_.parent
+
+
+def carry_context(func):
+    """Wrap `func` for a thread pool so its API calls count against the submitting stage."""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(func, *args, **kwargs)
+
+
+class Stage:
+    """One timed step; set `rows_out` (and `rows_in` if not known up front) inside the block."""
+
+    def __init__(self, name, rows_in=None, parent=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.parent = parent
+        self.thread = threading.get_ident()
+        self.profiling = False
+        self.api = _new_api()
+
+    def record(self, wall, started_at, rss_before):
+        rows = self.rows_in if self.rows_in is not None else self.rows_out
+        peak = peak_rss_mb()
+        return {"stage": self.name, "parent": self.parent.name if self.parent else None, "started_at": started_at,
+                "wall_s": round(wall, 4), "rows_in": self.rows_in, "rows_out": self.rows_out,
+                "rows_per_s": round(rows / wall, 1) if rows is not None and wall > 0 else None,
+                "peak_rss_mb": peak, "rss_growth_mb": round(peak - rss_before, 1) if peak is not None else None,
+                "api": _api_totals(self.api)}
+
+
+@contextmanager
+def stage(name, rows_in=None):
+    """Time a pipeline step and, while a Recorder is running, write its metrics line."""
+    recorder = _active
+    parent = _current.get()
+    current = Stage(name, rows_in, parent)
+    if recorder is None:
+        yield current
+        return
+
+    token = _current.set(current)
+    profiler = recorder._start_profiler(current)
+    started_at = datetime.now().isoformat(timespec="milliseconds")
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield current
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        wall = time.perf_counter() - started
+        _current.reset(token)
+        record = current.record(wall, started_at, rss_before)
+        record["profile"] = recorder._stop_profiler(current, profiler)
+        if error:
+            record["error"] = error
+        recorder.emit(record)
+
+
+class Recorder:
+    """Collects a run's stage metrics into a JSON lines file, optionally profiling each stage.
+
+    `profile` is "cprofile" (a .prof file for pstats/snakeviz) or
+    "pyinstrument" (an .html call tree) per stage, limited to the stage names
+    in `profile_stages` when given. A stage nested in one that is already
+    being profiled on the same thread is covered by the outer profile.
+    """
+
+    def __init__(self, path=METRICS_FILE, profile=None, profile_stages=None, profile_folder=PROFILE_FOLDER,
+                 label="run"):
+        if profile not in (None, *PROFILERS):
+            raise ValueError(f"Unknown profiler {profile!r}, use one of {PROFILERS}")
+        if profile == "pyinstrument":
+            import pyinstrument  # noqa: F401 - fail now rather than after the first stage
+
+        self.path = path
+        self.profile = profile
+        self.profile_stages = set(profile_stages) if profile_stages else None
+        self.profile_folder = profile_folder
+        self.label = label
+        self.run_id = datetime.now().strftime("%Y%m%d-%H%M%S-") + str(os.getpid())
+        self.api = _new_api()
+        self.stages = []
+        self._started = None
+        self._profiles = 0
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        """Make this the running Recorder; the totals line is written on close() or at exit."""
+        global _active
+        self._started = time.perf_counter()
+        _active = self
+        atexit.register(self.close)  # Scripts that exit() early still get their totals line
+        return self
+
+    def emit(self, record):
+        record = {"run": self.run_id, **record}
+        line = json.dumps(record, default=str)
+        with _lock:
+            self.stages.append(record)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+    def close(self):
+        """Write the run's totals line and stop recording."""
+        global _active
+        if _active is not self:
+            return
+        _active = None
+        atexit.unregister(self.close)
+        stages = [record for record in self.stages if record["parent"] is None]
+        self.emit({"stage": self.label, "parent": None, "started_at": None,
+                   "wall_s": round(time.perf_counter() - self._started, 4), "stages": len(self.stages),
+                   "slowest": max(stages, key=lambda record: record["wall_s"])["stage"] if stages else None,
+                   "peak_rss_mb": peak_rss_mb(), "api": _api_totals(self.api)})
+
+    def _start_profiler(self, stage_):
+        if self.profile is None or (self.profile_stages is not None and stage_.name not in self.profile_stages):
+            return None
+        parent = stage_.parent
+        while parent is not None:
+            if parent.profiling and parent.thread == stage_.thread:
+                return None
+            parent = parent.parent
+
+        if self.profile == "cprofile":
+            import cProfile
+
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # Python 3.12+ allows one cProfile at a time, a concurrent stage has it
+                return None
+        else:
+            from pyinstrument import Profiler
+
+            profiler = Profiler()
+            profiler.start()
+        stage_.profiling = True
+        return profiler
+
+    def _stop_profiler(self, stage_, profiler):
+        if profiler is None:
+            return None
+        with _lock:
+            self._profiles += 1
+            number = self._profiles
+        os.makedirs(self.profile_folder, exist_ok=True)
+        path = os.path.join(self.profile_folder, f"{self.run_id}-{number:02d}-{stage_.name}")
+        if self.profile == "cprofile":
+            profiler.disable()
+            path += ".prof"
+            profiler.dump_stats(path)
+        else:
+            profiler.stop()
+            path += ".html"
+            with open(path, "w") as f:
+                f.write(profiler.output_html())
+        return path
+
+
+def start_recording(path=METRICS_FILE, profile=None, profile_stages=None, label="run"):
+    """Start a Recorder; call .close() on it at the end of the run."""
+    return Recorder(path, profile=profile, profile_stages=profile_stages, label=label).start()
+
+
+def read_runs(path=METRICS_FILE):
+    """{run id: [metrics lines]} from a metrics file, oldest run first."""
+    runs = {}
+    if not os.path.exists(path):
+        return runs
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                runs.setdefault(record["run"], []).append(record)
+    return runs
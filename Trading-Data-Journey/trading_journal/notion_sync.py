@@ -0,0 +1,323 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from trading_journal.hashing import changed_fields, value_digest
+from trading_journal.metrics import carry_context
+from trading_journal.rate_limit import TokenBucket, call_with_retries
+
+# -----------------------------
+# 👉 Notion Upload Engine
+# -----------------------------
+
+# Notion allows an average of three requests per second per integration
+NOTION_REQUESTS_PER_SECOND = 3
+FAILED_TRADES_FILE = "failed_trades.csv"
+NOTION_INDEX_FILE = "notion_index.json"
+
+
+def _number(value):
+    return value if not pd.isna(value) else 0
+
+
+def trade_properties(row):
+    """Notion page properties for one cleaned trade."""
+    return {
+        "Quantity": {"number": row["Quantity"]},
+        "Symbol": {"select": {"name": row["Symbol"]}},
+        "Side": {"select": {"name": row["Side"]}},
+        "Pnl": {"number": _number(row["Pnl"])},
+        "Pts": {"number": row["Pts"]},
+        "Result": {"select": {"name": row["Result"]}},
+        "Drt Category": {"select": {"name": row["Drt Category"]}},
+        "Session": {"select": {"name": row["Session"]}},
+        "ATR 1M": {"number": _number(row["ATR 1M"])},
+        "ATR 5M": {"number": _number(row["ATR 5M"])},
+        "Duration": {"number": _number(row["Duration"])},
+        "Buy Price": {"number": _number(row["Buy Price"])},
+        "Sell Price": {"number": _number(row["Sell Price"])},
+        "Bought Time": {"date": {"start": row["Bought Time"].isoformat()}},
+        "Sold Time": {"date": {"start": row["Sold Time"].isoformat()}},
+    }
+
+
+def trade_key(row):
+    return row["Symbol"], row["Bought Time"].isoformat()
+
+
+def normalize_date(start):
+    """A Notion date `start` in the form trade_key() uses.
+
+    Notion answers "2025-02-03T18:34:13.000+00:00" for a sent "2025-02-03T18:34:13".
+    """
+    start = pd.Timestamp(start)
+    return (start.tz_convert(None) if start.tz is not None else start).isoformat()
+
+
+def _property_value(prop):
+    """A number, select or date property as one comparable value (None for other types)."""
+    if "number" in prop:
+        return "" if prop["number"] is None else repr(round(float(prop["number"]), 6))
+    if "select" in prop:
+        return (prop["select"] or {}).get("name", "")
+    if "date" in prop:
+        start = (prop["date"] or {}).get("start")
+        return normalize_date(start) if start else ""
+    return None
+
+
+def property_digests(properties):
+    """{property: digest} for the properties of a page, or the ones about to be sent."""
+    values = {name: _property_value(prop) for name, prop in properties.items()}
+    return {name: value_digest(value) for name, value in values.items() if value is not None}
+
+
+class NotionUploader:
+    """Create or update Notion pages from several threads, paced by a shared token bucket.
+
+    Throughput is bounded by `rate` requests per second rather than a fixed
+    sleep; transient errors are retried with backoff before a trade counts
+    as failed. Given the property digests of the existing pages, a trade that
+    already has a page only costs a `pages.update` of the properties that
+    changed, and nothing at all when none did; `updated` counts those updates.
+    """
+
+    def __init__(self, notion, database_id, concurrency=3, rate=NOTION_REQUESTS_PER_SECOND, max_retries=5):
+        self.notion = notion
+        self.database_id = database_id
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(rate)
+        self.updated = 0
+        self._lock = threading.Lock()
+
+    def _call(self, func):
+        return call_with_retries(func, bucket=self.bucket, max_retries=self.max_retries, service="notion")
+
+    def _upsert_page(self, row, existing_trades, digests):
+        # Runs on worker threads: each line goes out newline included in a single write, so lines don't run together
+        key = trade_key(row)
+        properties = trade_properties(row)
+        new_digests = property_digests(properties)
+        with self._lock:
+            page_id = existing_trades.get(key)
+            if key not in existing_trades:
+                changed = None
+                existing_trades[key] = None  # Claim the key so no other worker uploads it too
+            elif page_id is None or digests is None:
+                print(f"⏭️ Skipping duplicate trade: {key}\n", end="")
+                return True
+            else:
+                changed = changed_fields(new_digests, digests.get(key))
+                if not changed:
+                    print(f"⏭️ Skipping unchanged trade: {key}\n", end="")
+                    return True
+
+        try:
+            if changed is None:
+                page = self._call(lambda: self.notion.pages.create(parent={"database_id": self.database_id},
+                                                                   properties=properties))
+            else:
+                self._call(lambda: self.notion.pages.update(page_id=page_id,
+                                                            properties={name: properties[name] for name in changed}))
+        except Exception as e:
+            print(f"❌ Error uploading {row['Symbol']} trade at {row['Bought Time']}: {e}\n", end="")
+            if changed is None:
+                with self._lock:
+                    existing_trades.pop(key, None)
+            return False
+
+        with self._lock:
+            if changed is None:
+                existing_trades[key] = page.get("id") if isinstance(page, dict) else None
+            else:
+                self.updated += 1
+            if digests is not None:
+                digests[key] = new_digests
+        if changed is None:
+            print(f"✅ Uploaded trade for {row['Symbol']} ({row['Side']})\n", end="")
+        else:
+            print(f"🔄 Updated {', '.join(changed)} of {row['Symbol']} trade at {row['Bought Time']}\n", end="")
+        return True
+
+    def upload(self, df, existing_trades, digests=None):
+        """Upload every trade not in `existing_trades`; returns the rows that failed.
+
+        With `digests` (key -> property digests of the existing pages), trades
+        that already have a page are updated where their properties changed
+        instead of being skipped, and `digests` is kept up to date.
+        """
+        df = df.drop_duplicates(subset=["Symbol", "Bought Time"], keep="last")  # One worker per trade, last row wins
+        rows = [row for _, row in df.iterrows()]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            results = list(pool.map(carry_context(lambda row: self._upsert_page(row, existing_trades, digests)),
+                                    rows))
+        return [row.to_dict() for row, ok in zip(rows, results) if not ok]
+
+
+# -----------------------------
+# 👉 Local Index of Existing Notion Trades
+# -----------------------------
+
+def parse_trade_page(page):
+    """Return the (Symbol, Bought Time) key of a Notion trade page, or None if it has none."""
+    properties = page["properties"]
+    try:
+        symbol_field = properties["Symbol"].get("select", {})
+        if not symbol_field:
+            print("⚠️ Warning: 'Symbol' is empty in a trade entry, skipping...")
+            return None
+        symbol = symbol_field["name"]
+    except KeyError:
+        print("⚠️ Warning: Missing 'Symbol' select in a trade entry, skipping...")
+        return None
+
+    bought_time = (properties.get("Bought Time", {}).get("date") or {}).get("start", None)
+    if not bought_time:
+        print(f"⚠️ Warning: Missing 'Bought Time' for trade {symbol}, skipping...")
+        return None
+    try:
+        return symbol, normalize_date(bought_time)
+    except ValueError:
+        print(f"⚠️ Warning: Unreadable 'Bought Time' {bought_time!r} for trade {symbol}, skipping...")
+        return None
+
+
+class NotionTradeIndex:
+    """(Symbol, Bought Time) -> page id for the database, persisted between runs.
+
+    Next to each page id it keeps the digests of the page's properties, so
+    the uploader can tell which properties of a re-sent trade changed. A
+    normal sync only asks Notion for pages edited since the stored high-water
+    mark, following `next_cursor` until `has_more` is false, so startup cost
+    depends on what changed rather than on the size of the database. Pages
+    deleted in Notion are only dropped by a full rebuild.
+    """
+
+    def __init__(self, notion, database_id, path=NOTION_INDEX_FILE, bucket=None, max_retries=5):
+        self.notion = notion
+        self.database_id = database_id
+        self.path = path
+        self.bucket = bucket if bucket is not None else TokenBucket(NOTION_REQUESTS_PER_SECOND)
+        self.max_retries = max_retries
+        self.trades = {}
+        self.digests = {}
+        self.high_water = None
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            state = json.load(f)
+        if state.get("database_id") != self.database_id:
+            return  # Index of another database, rebuild from scratch
+        entries = state.get("trades", [])
+        self.trades = {(entry[0], entry[1]): entry[2] for entry in entries}
+        self.digests = {(entry[0], entry[1]): entry[3] for entry in entries if len(entry) > 3}
+        if len(self.digests) == len(self.trades) and state.get("normalized_dates"):
+            self.high_water = state.get("high_water")
+        # Otherwise the index predates property digests or normalized date keys, leaving high_water
+        # unset re-reads every page once
+
+    def save(self):
+        state = {"database_id": self.database_id, "high_water": self.high_water, "normalized_dates": True,
+                 "trades": [[symbol, bought_time, page_id, self.digests.get((symbol, bought_time), {})]
+                            for (symbol, bought_time), page_id in self.trades.items()]}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def _query_pages(self, query_filter=None):
+        """Yield every page matching the filter, one 100-page response at a time."""
+        cursor = None
+        while True:
+            arguments = {"database_id": self.database_id, "page_size": 100}
+            if query_filter is not None:
+                arguments["filter"] = query_filter
+            if cursor is not None:
+                arguments["start_cursor"] = cursor
+
+            response = call_with_retries(lambda: self.notion.databases.query(**arguments),
+                                         bucket=self.bucket, max_retries=self.max_retries, service="notion")
+            yield from response["results"]
+
+            if not response.get("has_more"):
+                return
+            cursor = response["next_cursor"]
+
+    def sync(self, full=False):
+        """Bring the index up to date; returns how many pages were read."""
+        if full or self.high_water is None:
+            self.trades = {}
+            self.digests = {}
+            query_filter = None
+        else:
+            # last_edited_time has minute precision, so re-read the boundary minute
+            query_filter = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": self.high_water}}
+
+        keys_by_page = {page_id: key for key, page_id in self.trades.items()}
+        pages_read = 0
+        for page in self._query_pages(query_filter):
+            pages_read += 1
+            edited = page.get("last_edited_time")
+            if edited and (self.high_water is None or edited > self.high_water):
+                self.high_water = edited
+
+            old_key = keys_by_page.pop(page["id"], None)
+            if old_key is not None:
+                self.trades.pop(old_key, None)  # The trade's key was edited
+                self.digests.pop(old_key, None)
+            key = parse_trade_page(page)
+            if key is not None:
+                self.trades[key] = page["id"]
+                self.digests[key] = property_digests(page["properties"])
+                keys_by_page[page["id"]] = key
+
+        self.save()
+        return pages_read
+
+
+# -----------------------------
+# 👉 Failed Trade Log
+# -----------------------------
+
+def load_failed_trades(path=FAILED_TRADES_FILE):
+    """Trades a previous run could not upload (empty frame when there are none)."""
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    failed = pd.read_csv(path)
+    for column in ("Bought Time", "Sold Time"):
+        if column in failed:
+            failed[column] = pd.to_datetime(failed[column], errors="coerce")
+    return failed
+
+
+def save_failed_trades(failed_rows, path=FAILED_TRADES_FILE):
+    """Rewrite the failed trade log; removes it once nothing is left to retry."""
+    if not failed_rows:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    failed = pd.DataFrame(failed_rows).drop_duplicates(subset=["Symbol", "Bought Time"], keep="last")
+    failed.to_csv(path, index=False)
+
+
+def replay_failed_trades(uploader, existing_trades, path=FAILED_TRADES_FILE, digests=None):
+    """Re-submit failed_trades.csv; entries that now succeed are removed from it.
+
+    Returns the rows that still fail.
+    """
+    failed = load_failed_trades(path)
+    if failed.empty:
+        return []
+    print(f"🔁 Replaying {len(failed)} previously failed trades...")
+    has_times = failed["Bought Time"].notna() & failed["Sold Time"].notna()
+    still_failing = uploader.upload(failed[has_times], existing_trades, digests)
+    still_failing += failed[~has_times].to_dict("records")  # Can't be uploaded, keep them for a look
+    save_failed_trades(still_failing, path)
+    return still_failing
@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from trading_journal.ingest import clean_exports, find_exports, stream_clean_exports
+from trading_journal.metrics import carry_context, stage
+from trading_journal.sinks import validate_trades
+
+# -----------------------------
+# 📌 Clean Once, Fan Out to Every Sink
+# -----------------------------
+
+def publish(store, sinks):
+    """Send each sink the stored trades it hasn't synced yet, all sinks at the same time.
+
+    The pending trades are read from the store once and validated once; a
+    sink's mark only moves when its write() returns. Returns {sink name:
+    trades written, or the exception that stopped it}.
+    """
+    if not sinks:
+        return {}
+    marks = {sink.name: store.synced_seq(sink.name) for sink in sinks}
+    with stage("publish.read") as s:
+        pending = store.after(min(marks.values()))
+        s.rows_in = len(pending)
+        if pending.empty:
+            return {sink.name: 0 for sink in sinks}
+        last_seq = pending["Seq"].max()  # Also covers trades validation drops, so they aren't retried forever
+        pending = validate_trades(pending)
+        s.rows_out = len(pending)
+
+    def write(sink):
+        trades = pending[pending["Seq"] > marks[sink.name]]
+        with stage(f"publish.{sink.name}", rows_in=len(trades)) as s:
+            written = sink.write(trades.drop(columns=["Seq"]).reset_index(drop=True)) if len(trades) else 0
+            s.rows_out = written
+        store.mark_synced(sink.name, last_seq)
+        return written
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(sinks)) as pool:
+        futures = {sink.name: pool.submit(carry_context(write), sink) for sink in sinks}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"❌ Error: {name} sink failed, its trades stay pending - {e}")
+                results[name] = e
+    return results
+
+
+def run_pipeline(source, store, sinks, chunk_rows=None, bar_cache=None, **options):
+    """Clean the exports under `source` into the store, then publish to every sink.
+
+    Returns the number of new or changed trades stored and publish()'s per-sink results.
+    """
+    if chunk_rows:
+        _, inserted = stream_clean_exports(source, store, chunksize=chunk_rows, bar_cache=bar_cache, **options)
+    else:
+        paths = find_exports(source)
+        if not paths:
+            raise FileNotFoundError(f"No Tradovate exports found at {source}")
+        trades = clean_exports(paths, bar_cache=bar_cache, **options)
+        with stage("store", rows_in=len(trades)) as s:
+            inserted = s.rows_out = store.insert(trades)
+    return inserted, publish(store, sinks)
@@ -0,0 +1,102 @@
+import random
+import threading
+import time
+
+from trading_journal.metrics import count_api
+
+# -----------------------------
+# 📌 Token Bucket & Retries
+# -----------------------------
+
+# HTTP statuses worth retrying: rate limited, or the service is having a moment
+RETRY_STATUSES = {409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second with bursts of `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent; returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds):
+        """Hold every caller back for `seconds`, e.g. after a Retry-After response."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+
+def retry_after(error):
+    """Seconds the server asked us to wait, if the error carries a Retry-After header."""
+    headers = getattr(error, "headers", None) or getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error):
+    """Rate limits, server errors, timeouts and dropped connections are retried."""
+    status = getattr(error, "status", None) or getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status in RETRY_STATUSES:
+        return True
+    if "timeout" in str(getattr(error, "code", "")).lower():
+        return True
+    return isinstance(error, (TimeoutError, ConnectionError)) or type(error).__module__.startswith("httpx")
+
+
+def call_with_retries(func, bucket=None, max_retries=5, base_delay=1.0, max_delay=60.0, service="api"):
+    """Call `func()` through the rate limiter, retrying with exponential backoff.
+
+    A Retry-After header wins over the computed backoff and pauses the whole
+    bucket, so other workers stop hammering the API too. Calls, retries and
+    time spent waiting are counted under `service` in the run's metrics.
+    """
+    attempt = 0
+    while True:
+        if bucket is not None:
+            waited = bucket.acquire()
+            if waited:
+                count_api(service, "rate_limit_waits")
+                count_api(service, "wait_s", waited)
+        count_api(service)
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = retry_after(e)
+            if delay is None:
+                delay = min(max_delay, base_delay * 2 ** attempt) * (0.5 + random.random() / 2)
+            else:
+                count_api(service, "rate_limit_waits")
+                if bucket is not None:
+                    bucket.pause(delay)
+            count_api(service, "retries")
+            count_api(service, "wait_s", delay)
+            time.sleep(delay)
+            attempt += 1
@@ -0,0 +1,136 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+from trading_journal.atr import (ATR_PERIOD, TRADE_CLOCK_OFFSET, atr_column, atr_warmup, attach_atr,
+                                 build_atr_frame)
+from trading_journal.cleaning import clean_trades, finalize_trades
+from trading_journal.ingest import find_exports
+from trading_journal.market_data import BarCache, data_ticker
+from trading_journal.merging import merge_trades
+from trading_journal.metrics import carry_context, stage
+
+# -----------------------------
+# 📌 Full-History Rebuild on Every Core
+# -----------------------------
+
+# Smallest batch of fills worth sending to a worker process
+MIN_TASK_ROWS = 5_000
+
+# Futures pause at 17:00 New York, so no trade spans two trading days
+SESSION_ROLLOVER = pd.Timedelta(hours=7)
+
+
+def trading_days(raw):
+    """Trading day (New York, rolling over at 17:00) of each raw fill's entry."""
+    bought = pd.to_datetime(raw["boughtTimestamp"], format="%m/%d/%Y %H:%M:%S")
+    sold = pd.to_datetime(raw["soldTimestamp"], format="%m/%d/%Y %H:%M:%S")
+    entry = bought.where(raw["buyFillId"] < raw["sellFillId"], sold)
+    return (entry - TRADE_CLOCK_OFFSET + SESSION_ROLLOVER).dt.strftime("%Y-%m-%d")
+
+
+def split_tasks(raw, min_rows=MIN_TASK_ROWS):
+    """Split one account's fills into runs of whole trading days of at least `min_rows` rows.
+
+    Fills are first put in trading-day order, keeping their file order within
+    a day, so every run holds the same neighbouring fills however the days are
+    grouped. For an export already in day order (as Tradovate writes them)
+    merging the runs gives the same trades as merging the whole file.
+    """
+    days = trading_days(raw)
+    day_sorted = np.argsort(days.to_numpy(), kind="stable")
+    raw, days = raw.iloc[day_sorted], days.iloc[day_sorted]
+    day_order = np.unique(days)
+    sizes = days.value_counts().reindex(day_order).to_numpy()
+
+    runs, run_rows, start = [], 0, 0
+    for i, size in enumerate(sizes):
+        run_rows += size
+        if run_rows >= min_rows or i == len(sizes) - 1:
+            runs.append(day_order[start:i + 1])
+            run_rows, start = 0, i + 1
+    return [raw[days.isin(run)] for run in runs]
+
+
+def _write_atr(symbol, bars_folder, atr_folder, since, timeframes, periods):
+    """Compute one contract root's ATR from its cached bars and save it for the workers."""
+    bars = BarCache(bars_folder).load(data_ticker(symbol), "1m", since=since)
+    atr = build_atr_frame({symbol: bars}, timeframes=timeframes, periods=periods).drop(columns=["symbol"])
+    path = os.path.join(atr_folder, f"{symbol}.feather")
+    feather.write_feather(atr.sort_values("Datetime").reset_index(drop=True), path, compression="uncompressed")
+    return path
+
+
+def _atr_window(path, first, last):
+    """Rows of a memory-mapped ATR file needed to as-of join entries between `first` and `last`."""
+    table = feather.read_table(path, memory_map=True)
+    times = table.column("Datetime").to_numpy()
+    start = max(np.searchsorted(times, np.datetime64(first), side="right") - 1, 0)
+    stop = np.searchsorted(times, np.datetime64(last), side="right")
+    return table.slice(start, stop - start).to_pandas()
+
+
+def _clean_task(raw, atr_paths, interleaved, atr_columns, fees):
+    """Clean, merge and ATR-join one run of trading days (runs in a worker process)."""
+    df = merge_trades(clean_trades(raw, fees=fees), interleaved=interleaved, fees=fees)
+    first, last = df["Trade Entry Time"].min(), df["Trade Entry Time"].max()
+    windows = [_atr_window(atr_paths[symbol], first, last).assign(symbol=symbol)
+               for symbol in df["symbol"].unique()]
+    return finalize_trades(attach_atr(df, pd.concat(windows, ignore_index=True)), atr_columns, fees=fees)
+
+
+def rebuild_history(sources, bar_cache=None, interleaved=False, timeframes=("1m", "5m"), periods=(ATR_PERIOD,),
+                    fees=None, max_workers=None, min_task_rows=MIN_TASK_ROWS, refresh=True):
+    """Re-clean every export under `sources` across all cores; returns one frame of trades.
+
+    Each export is treated as one account and split into runs of trading
+    days. ATR is computed once per contract root from the bar cache and
+    written as uncompressed Feather, which the workers memory-map and slice
+    instead of receiving a pickled copy. The result is in (trading day,
+    export) order no matter how the work was scheduled.
+    """
+    bar_cache = bar_cache if bar_cache is not None else BarCache()
+    paths = sorted({path for source in sources for path in find_exports(source)})
+    if not paths:
+        raise FileNotFoundError(f"No Tradovate exports found in {sources}")
+
+    with stage("read") as s:
+        exports = [pd.read_csv(path) for path in paths]
+        exports = [export for export in exports if len(export)]  # Header-only exports add nothing
+        s.rows_out = sum(len(export) for export in exports)
+    if not exports:
+        raise ValueError(f"The exports in {sources} have no fills to rebuild")
+    symbols = sorted(set().union(*(export["symbol"].astype(str).str[:-2] for export in exports)))
+    since = min(pd.to_datetime(trading_days(export)).min() for export in exports) - atr_warmup(timeframes, periods)
+
+    if refresh:
+        # Bring the bar cache up to date once, the workers only read it
+        tickers = list(dict.fromkeys(data_ticker(symbol) for symbol in symbols))
+        with stage("bars"), ThreadPoolExecutor(max_workers=max(1, len(tickers))) as pool:
+            list(pool.map(carry_context(lambda ticker: bar_cache.refresh(ticker, "1m")), tickers))
+
+    tasks = []
+    for account, export in enumerate(exports):
+        for run in split_tasks(export, min_task_rows):
+            tasks.append((trading_days(run).min(), account, run))
+    tasks.sort(key=lambda task: task[:2])
+
+    atr_columns = [atr_column(tf, p) for tf in timeframes for p in periods]
+    with tempfile.TemporaryDirectory() as atr_folder, ProcessPoolExecutor(max_workers=max_workers) as pool:
+        # The workers' own time shows up here, the metrics of child processes aren't recorded
+        with stage("atr"):
+            atr_paths = dict(zip(symbols, pool.map(_write_atr, symbols, [bar_cache.folder] * len(symbols),
+                                                   [atr_folder] * len(symbols), [since] * len(symbols),
+                                                   [list(timeframes)] * len(symbols),
+                                                   [list(periods)] * len(symbols))))
+
+        with stage("clean", rows_in=sum(len(run) for _, _, run in tasks)) as s:
+            results = pool.map(_clean_task, [run for _, _, run in tasks], [atr_paths] * len(tasks),
+                               [interleaved] * len(tasks), [atr_columns] * len(tasks), [fees] * len(tasks))
+            trades = pd.concat(list(results), ignore_index=True)
+            s.rows_out = len(trades)
+        return trades
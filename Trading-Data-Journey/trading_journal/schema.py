@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# 📌 Compact Trade Record
+# -----------------------------
+
+# Labels the cleaner can produce, in a fixed order so every file shares the same categories
+SIDES = ["Long", "Short"]
+RESULTS = ["Win", "Loss", "Breakeven"]
+DURATION_CATEGORIES = ["0-30 sec", "30-120 sec", "2-5 min", "5+ min"]
+SESSIONS = ["0-30 min", "30-60 min", "1-2 hour", "2+ hour"]
+
+LABEL_COLUMNS = {"Side": SIDES, "Result": RESULTS, "Drt Category": DURATION_CATEGORIES, "Session": SESSIONS}
+
+# Price columns stored as whole ticks: journal column -> stored column
+TICK_COLUMNS = {"Buy Price": "Buy Ticks", "Sell Price": "Sell Ticks", "Pts": "Pts Ticks"}
+
+
+def is_compact(df):
+    return "Buy Ticks" in df.columns
+
+
+def compact_trades(df):
+    """Cleaned trades in their compact typed form, ready to be written as Arrow.
+
+    Labels become categoricals, prices and points become int32 tick counts of
+    the contract's "Tick Size", Quantity int16, Duration nullable Int32 and
+    ATR float32 (it only has one decimal). Frames without a Tick Size column
+    are returned as they are.
+    """
+    if "Tick Size" not in df.columns or is_compact(df):
+        return df
+
+    # A fill without a tick size gets the one its contract has on other rows
+    tick_size = df["Tick Size"].astype(float)
+    tick_size = tick_size.fillna(tick_size.groupby(df["Symbol"].astype(str)).transform("first"))
+
+    compact = pd.DataFrame(index=df.index)
+    for col in df.columns:
+        values = df[col]
+        if col == "Symbol":
+            compact[col] = values.astype(str).astype("category")
+        elif col in LABEL_COLUMNS:
+            compact[col] = pd.Categorical(values, categories=LABEL_COLUMNS[col])
+        elif col in TICK_COLUMNS:
+            ticks = values.astype(float) / tick_size
+            if (values.notna() & tick_size.isna()).any():
+                symbols = sorted(df.loc[values.notna() & tick_size.isna(), "Symbol"].astype(str).unique())
+                raise ValueError(f"{col} can't be stored as ticks, no Tick Size for {', '.join(symbols)}")
+            if (ticks - ticks.round()).abs().max() > 1e-6:
+                raise ValueError(f"{col} has prices that are not whole ticks")
+            # Missing prices stay missing (nullable Int32), the rest are plain int32
+            ticks = ticks.round()
+            compact[TICK_COLUMNS[col]] = ticks.astype(np.int32) if ticks.notna().all() else ticks.astype("Int32")
+        elif col == "Quantity":
+            compact[col] = values.astype(np.int16)
+        elif col == "Duration":
+            compact[col] = values.round().astype("Int32")
+        elif col == "Tick Size":
+            compact[col] = tick_size.astype(np.float32)
+        elif col.startswith("ATR "):
+            compact[col] = values.astype(np.float32)
+        else:
+            compact[col] = values
+    return compact
+
+
+def expand_trades(df):
+    """The journal columns and dtypes the uploaders expect, from a compact frame.
+
+    Prices and ATR are rounded back to the exact decimals they were written
+    with, so an expanded frame equals the cleaner's output.
+    """
+    if not is_compact(df):
+        return df
+
+    tick_size = df["Tick Size"].astype(float).round(6)
+    expanded = pd.DataFrame(index=df.index)
+    stored_to_journal = {stored: col for col, stored in TICK_COLUMNS.items()}
+    for col in df.columns:
+        values = df[col]
+        if col == "Tick Size":
+            continue
+        elif col in stored_to_journal:
+            expanded[stored_to_journal[col]] = (values.astype(float) * tick_size).round(9)
+        elif col == "Symbol" or col in LABEL_COLUMNS:
+            expanded[col] = values.astype(str)
+        elif col == "Quantity":
+            expanded[col] = values.astype(np.int64)
+        elif col == "Duration":
+            expanded[col] = values.astype(np.int64) if values.notna().all() else values.astype(float)
+        elif col.startswith("ATR "):
+            expanded[col] = values.astype(float).round(1)
+        else:
+            expanded[col] = values
+    return expanded
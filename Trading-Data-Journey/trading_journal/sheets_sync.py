@@ -0,0 +1,341 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from trading_journal.hashing import value_digest
+from trading_journal.rate_limit import TokenBucket, call_with_retries
+
+# -----------------------------
+# 👉 Google Sheets Sync Engine
+# -----------------------------
+
+# Sheets allows 60 requests per minute per user
+SHEETS_REQUESTS_PER_SECOND = 1
+APPEND_CHUNK_ROWS = 500
+SHEETS_KEYS_FILE = "sheets_keys.json"
+
+
+def column_letter(number):
+    """1 -> "A", 27 -> "AA"."""
+    letters = ""
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def row_keys(symbols, bought_times):
+    """(Symbol, "YYYY-mm-dd HH:MM:SS") of each sheet row, None where the time doesn't parse."""
+    symbols = pd.Series(symbols, dtype=object).fillna("").astype(str).str.strip()
+    bought_times = pd.to_datetime(pd.Series(bought_times, dtype=object).astype(str).str.strip(), errors="coerce",
+                                  format="mixed")
+    bought_times = bought_times.dt.strftime("%Y-%m-%d %H:%M:%S").where(bought_times.notna(), None)
+    return [(symbol, bought_time) if bought_time is not None else None
+            for symbol, bought_time in zip(symbols, bought_times)]
+
+
+def normalize_keys(symbols, bought_times):
+    """(Symbol, "YYYY-mm-dd HH:MM:SS") pairs, skipping rows whose time doesn't parse."""
+    return {key for key in row_keys(symbols, bought_times) if key is not None}
+
+
+def trade_keys(df):
+    """The same (Symbol, Bought Time) pairs normalize_keys() builds, for a frame of trades."""
+    bought_times = pd.to_datetime(df["Bought Time"], errors="coerce").dt.strftime("%Y-%m-%d %H:%M:%S")
+    return list(zip(df["Symbol"].astype(str).str.strip(), bought_times))
+
+
+def sheet_rows(df):
+    """Plain Python values for the Sheets API, blanks where a value is missing."""
+    df = df.assign(**{col: df[col].dt.strftime("%Y-%m-%d %H:%M:%S")
+                      for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])})
+    return df.astype(object).where(df.notna(), "").values.tolist()
+
+
+def same_cell(value, cell):
+    """True when a sheet cell (read back as text) holds `value`; "120" and 120.0 are the same number."""
+    if str(value) == cell:
+        return True
+    if isinstance(value, str) or isinstance(value, bool):
+        return False
+    try:
+        return float(value) == float(str(cell).replace(",", ""))
+    except (TypeError, ValueError):
+        return False
+
+
+def cell_ranges(row_number, cells):
+    """batch_update entries writing {1-based column: value} into a row, one range per run of adjacent columns."""
+    ranges = []
+    for column in sorted(cells):
+        if ranges and column == ranges[-1]["last"] + 1:
+            ranges[-1]["last"] = column
+            ranges[-1]["values"][0].append(cells[column])
+        else:
+            ranges.append({"first": column, "last": column, "values": [[cells[column]]]})
+    return [{"range": f"{column_letter(r['first'])}{row_number}:{column_letter(r['last'])}{row_number}",
+             "values": r["values"]} for r in ranges]
+
+
+class SheetsSync:
+    """Append new trades to a worksheet without downloading the whole sheet.
+
+    Existing trades are found by reading only the Symbol and Bought Time
+    columns, and the resulting key set is cached in `keys_path` so later runs
+    don't read the sheet at all. New rows go out through `append_rows` in
+    chunks of `chunk_rows`, each retried with backoff on its own.
+
+    The cache also keeps a digest of every cell written, so a trade that comes
+    back with changed fields is rewritten in place: only its changed cells,
+    all trades together in one `batch_update`. Unchanged trades cost no calls.
+    """
+
+    def __init__(self, sheet, sheet_name, keys_path=SHEETS_KEYS_FILE, chunk_rows=APPEND_CHUNK_ROWS,
+                 rate=SHEETS_REQUESTS_PER_SECOND, max_retries=5):
+        self.sheet = sheet
+        self.sheet_name = sheet_name
+        self.keys_path = keys_path
+        self.chunk_rows = chunk_rows
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(rate)
+        self.keys = None
+        self.columns = None  # Column names the cell digests line up with
+        self.digests = {}
+
+    def _call(self, func):
+        return call_with_retries(func, bucket=self.bucket, max_retries=self.max_retries, service="google_sheets")
+
+    def _load_cached_keys(self):
+        if not os.path.exists(self.keys_path):
+            return None
+        with open(self.keys_path) as f:
+            cache = json.load(f)
+        if cache.get("sheet") != self.sheet_name:
+            return None  # Cached for another sheet
+        keys = [tuple(key) for key in cache["keys"]]
+        self.columns = cache.get("columns")
+        self.digests = {key: digests for key, digests in zip(keys, cache.get("digests", [])) if digests}
+        return set(keys)
+
+    def save_keys(self):
+        keys = sorted(self.keys)
+        tmp_path = self.keys_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"sheet": self.sheet_name, "keys": keys, "columns": self.columns,
+                       "digests": [self.digests.get(key) for key in keys]}, f)
+        os.replace(tmp_path, self.keys_path)
+
+    def _read_key_columns(self):
+        """The header row and the Symbol and Bought Time cells below it, or None without those headers."""
+        headers = self._call(lambda: self.sheet.row_values(1))
+        if "Symbol" not in headers or "Bought Time" not in headers:
+            return None
+        symbol_column = column_letter(headers.index("Symbol") + 1)
+        bought_time_column = column_letter(headers.index("Bought Time") + 1)
+
+        symbols, bought_times = self._call(lambda: self.sheet.batch_get(
+            [f"{symbol_column}2:{symbol_column}", f"{bought_time_column}2:{bought_time_column}"]))
+        symbols = [row[0] if row else "" for row in symbols]
+        bought_times = [row[0] if row else "" for row in bought_times]
+
+        # Trailing blank cells are left out of a column range, so line both columns up
+        rows = max(len(symbols), len(bought_times))
+        symbols += [""] * (rows - len(symbols))
+        bought_times += [""] * (rows - len(bought_times))
+        return headers, symbols, bought_times
+
+    def read_keys(self):
+        """Read the Symbol and Bought Time columns (and nothing else) from the sheet."""
+        columns = self._read_key_columns()
+        if columns is None:
+            print("❌ Error fetching existing trades: the sheet has no Symbol / Bought Time header")
+            return set()
+        return normalize_keys(*columns[1:])
+
+    def existing_keys(self, refresh=False):
+        """The sheet's trade keys, from the local cache unless `refresh` is set or there is none."""
+        if self.keys is None and not refresh:
+            self.keys = self._load_cached_keys()
+        if self.keys is None or refresh:
+            self.keys = self.read_keys()
+            self.digests = {key: digests for key, digests in self.digests.items() if key in self.keys}
+            self.save_keys()
+        return self.keys
+
+    def _cell_digests(self, df, rows):
+        """Digests of the cells of each row, lined up with the cached ones (dropped if the columns moved)."""
+        columns = list(df.columns)
+        if self.columns != columns:
+            self.columns = columns
+            self.digests = {}
+        return [[value_digest(value) for value in row] for row in rows]
+
+    def new_trades(self, df):
+        """Rows of `df` whose (Symbol, Bought Time) is not in the sheet yet."""
+        existing = self.existing_keys()
+        keys = trade_keys(df)
+        is_new = np.fromiter((key not in existing for key in keys), dtype=bool, count=len(keys))
+        # A key listed twice goes in with its last row, like the trade store keeps it
+        return df[is_new & ~pd.Series(keys, index=df.index, dtype=object).duplicated(keep="last").to_numpy()]
+
+    def _seed_digests(self, df, keys, rows):
+        """Digests for trades in the sheet that the cache has none for, from the cells the sheet holds now.
+
+        A cell counts as unchanged when it reads back as the value that would
+        be written (numbers compared as numbers), so losing the cache doesn't
+        rewrite every row.
+        """
+        missing = {}
+        for key, values in zip(keys, rows):
+            if key in self.keys and key not in self.digests:
+                missing[key] = values
+        if not missing:
+            return
+        try:
+            columns = self._read_key_columns()
+            if columns is None:
+                return
+            headers, symbols, bought_times = columns
+            row_numbers = {}
+            for row_number, key in enumerate(row_keys(symbols, bought_times), start=2):
+                if key in missing:
+                    row_numbers.setdefault(key, row_number)
+            found = list(row_numbers)
+            last_column = column_letter(len(headers))
+            sheet_cells = []
+            for start in range(0, len(found), self.chunk_rows):
+                ranges = [f"A{row_numbers[key]}:{last_column}{row_numbers[key]}"
+                          for key in found[start:start + self.chunk_rows]]
+                sheet_cells += self._call(lambda: self.sheet.batch_get(ranges))
+        except Exception as e:
+            print(f"⚠️ Could not read the sheet rows the key cache has no digests for, they count as changed: {e}")
+            return
+
+        # Columns the header lacks can't be rewritten in place, so they aren't compared
+        positions = [headers.index(col) if col in headers else None for col in df.columns]
+        for key, cells in zip(found, sheet_cells):
+            cells = cells[0] if cells else []
+            live = [value if i is None else cells[i] if i < len(cells) else "" for value, i in
+                    zip(missing[key], positions)]
+            self.digests[key] = [value_digest(value if same_cell(value, cell) else cell)
+                                 for value, cell in zip(missing[key], live)]
+        self.save_keys()
+
+    def changed_trades(self, df):
+        """Rows of `df` already in the sheet whose cells differ from what was written there.
+
+        Trades the cache has no digests for are compared with their row in the sheet.
+        """
+        existing = self.existing_keys()
+        keys = trade_keys(df)
+        rows = sheet_rows(df)
+        digests = self._cell_digests(df, rows)
+        self._seed_digests(df, keys, rows)
+        latest = ~pd.Series(keys, index=df.index, dtype=object).duplicated(keep="last").to_numpy()
+        is_changed = np.fromiter((key in existing and self.digests.get(key) != cells
+                                  for key, cells in zip(keys, digests)), dtype=bool, count=len(keys))
+        return df[is_changed & latest]
+
+    def update(self, df):
+        """Rewrite the changed cells of trades already in the sheet with one batch_update.
+
+        Looks up the trades' rows by reading the key columns, so nothing is
+        read or written when `df` is empty. Returns the rows that could not be
+        written, including trades no longer found in the sheet.
+        """
+        if df.empty:
+            return df
+        self.existing_keys()
+        rows = sheet_rows(df)
+        digests = self._cell_digests(df, rows)
+        try:
+            columns = self._read_key_columns()
+        except Exception as e:
+            print(f"❌ Error looking up the rows of changed trades: {e}")
+            return df
+        if columns is None:
+            print("❌ Error updating trades: the sheet has no Symbol / Bought Time header")
+            return df
+        headers, symbols, bought_times = columns
+        row_numbers = {}
+        for row_number, key in enumerate(row_keys(symbols, bought_times), start=2):
+            row_numbers.setdefault(key, row_number)
+        sheet_columns = [headers.index(col) + 1 if col in headers else None for col in df.columns]
+
+        data, found = [], np.zeros(len(df), dtype=bool)
+        for position, (key, values, cells) in enumerate(zip(trade_keys(df), rows, digests)):
+            if key not in row_numbers:
+                print(f"⚠️ Trade {key} is no longer in the sheet, it will be appended again")
+                self.keys.discard(key)
+                self.digests.pop(key, None)
+                continue
+            found[position] = True
+            old = self.digests.get(key) or [None] * len(cells)
+            data += cell_ranges(row_numbers[key], {sheet_columns[i]: values[i] for i, (new, was)
+                                                   in enumerate(zip(cells, old))
+                                                   if new != was and sheet_columns[i] is not None})
+
+        if data:
+            try:
+                self._call(lambda: self.sheet.batch_update(data, value_input_option="RAW"))
+            except Exception as e:
+                print(f"❌ Error updating {found.sum()} changed trades: {e}")
+                self.save_keys()
+                return df
+        for key, cells, ok in zip(trade_keys(df), digests, found):
+            if ok:
+                self.digests[key] = cells
+        self.save_keys()
+        print(f"🔄 Updated {found.sum()} changed trades in place ({len(data)} ranges).")
+        return df[~found]
+
+    def _header_positions(self, df):
+        """0-based sheet column of each column of `df`, adding the ones the header row lacks to its end."""
+        headers = self._call(lambda: self.sheet.row_values(1))
+        missing = [col for col in df.columns if col not in headers]
+        if missing:
+            data = cell_ranges(1, {len(headers) + number: col for number, col in enumerate(missing, start=1)})
+            self._call(lambda: self.sheet.batch_update(data, value_input_option="RAW"))
+            headers = headers + missing
+        return [headers.index(col) for col in df.columns], len(headers)
+
+    def append(self, df):
+        """Append rows chunk by chunk, in the sheet's column order; returns the rows that could not be written."""
+        self.existing_keys()
+        if df.empty:
+            return df
+        try:
+            positions, width = self._header_positions(df)
+        except Exception as e:
+            print(f"❌ Error reading the sheet header: {e}")
+            return df
+        rows = sheet_rows(df)
+        digests = self._cell_digests(df, rows)
+        if positions != list(range(width)):
+            ordered = []
+            for row in rows:
+                cells = [""] * width
+                for position, value in zip(positions, row):
+                    cells[position] = value
+                ordered.append(cells)
+            rows = ordered
+
+        try:
+            for start in range(0, len(rows), self.chunk_rows):
+                chunk = rows[start:start + self.chunk_rows]
+                try:
+                    self._call(lambda: self.sheet.append_rows(chunk, value_input_option="RAW", table_range="A1"))
+                except Exception as e:
+                    print(f"❌ Error appending rows {start + 1}-{start + len(chunk)}: {e}")
+                    return df.iloc[start:]
+
+                # Remember what is in the sheet now, so a failure later on doesn't cause duplicates
+                chunk_keys = trade_keys(df.iloc[start:start + self.chunk_rows])
+                self.keys.update(chunk_keys)
+                self.digests.update(zip(chunk_keys, digests[start:start + self.chunk_rows]))
+                print(f"✅ Uploaded {start + len(chunk)}/{len(rows)} trades inside the table.")
+        finally:
+            self.save_keys()
+        return df.iloc[0:0]
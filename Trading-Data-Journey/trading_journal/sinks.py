@@ -0,0 +1,187 @@
+import sqlite3
+
+import pandas as pd
+
+from trading_journal.notion_sync import (FAILED_TRADES_FILE, NotionTradeIndex, NotionUploader, load_failed_trades,
+                                         replay_failed_trades, save_failed_trades)
+from trading_journal.sheets_sync import SheetsSync
+
+# -----------------------------
+# 👉 Trade Validation
+# -----------------------------
+
+REQUIRED_COLUMNS = ["Quantity", "Symbol", "Side", "Pnl", "Pts", "Result", "Drt Category", "Session",
+                    "ATR 1M", "ATR 5M", "Duration", "Buy Price", "Sell Price", "Bought Time", "Sold Time"]
+NUMERIC_COLUMNS = ["Pnl", "Pts", "ATR 1M", "ATR 5M", "Duration", "Buy Price", "Sell Price"]
+
+FAILED_SHEETS_TRADES_FILE = "failed_sheets_trades.csv"
+
+
+def validate_trades(df):
+    """Check the journal columns are there, coerce their types and drop unusable rows."""
+    missing_cols = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_cols:
+        raise ValueError(f"Missing columns: {missing_cols}")
+
+    df = df.copy()
+    df["Bought Time"] = pd.to_datetime(df["Bought Time"], errors="coerce")
+    df["Sold Time"] = pd.to_datetime(df["Sold Time"], errors="coerce")
+    df[NUMERIC_COLUMNS] = df[NUMERIC_COLUMNS].apply(pd.to_numeric, errors="coerce")
+    return df.dropna(subset=["Symbol", "Side", "Pnl", "Bought Time", "Sold Time"])
+
+
+# -----------------------------
+# 👉 Sinks
+# -----------------------------
+
+class Sink:
+    """Somewhere cleaned trades are sent.
+
+    `name` is the sink's sync mark in the TradeStore. write() gets validated
+    trades and owns everything sink-specific: dedup against what is already
+    there, rate limiting, and logging trades that fail so they are retried on
+    the next write. A trade the sink already has is updated in place when its
+    fields changed. Returns the number of trades written or updated.
+    """
+
+    name = None
+
+    def write(self, trades):
+        raise NotImplementedError
+
+
+class NotionSink(Sink):
+    """Notion database, deduplicated and change-checked through the local page index."""
+
+    name = "notion"
+
+    def __init__(self, notion, database_id, concurrency=3, replay_failed=True, full_index_rebuild=False,
+                 failed_path=FAILED_TRADES_FILE):
+        self.uploader = NotionUploader(notion, database_id, concurrency=concurrency)
+        self.index = NotionTradeIndex(notion, database_id, bucket=self.uploader.bucket)
+        self.replay_failed = replay_failed
+        self.full_index_rebuild = full_index_rebuild
+        self.failed_path = failed_path
+
+    def write(self, trades):
+        self.index.sync(full=self.full_index_rebuild)
+        existing_trades, digests = self.index.trades, self.index.digests
+        before, updated_before = len(existing_trades), self.uploader.updated
+
+        if self.replay_failed:
+            failed_trades = replay_failed_trades(self.uploader, existing_trades, self.failed_path, digests)
+        else:
+            failed_trades = load_failed_trades(self.failed_path).to_dict("records")
+        failed_trades += self.uploader.upload(trades, existing_trades, digests)
+
+        self.index.save()
+        save_failed_trades(failed_trades, self.failed_path)
+        return len(existing_trades) - before + self.uploader.updated - updated_before
+
+
+class SheetsSink(Sink):
+    """Google worksheet, deduplicated and change-checked through the cached keys and cell digests."""
+
+    name = "google_sheets"
+
+    def __init__(self, sheet, sheet_name, refresh_keys=False, failed_path=FAILED_SHEETS_TRADES_FILE, **options):
+        self.sync = SheetsSync(sheet, sheet_name, **options)
+        self.refresh_keys = refresh_keys
+        self.failed_path = failed_path
+
+    def write(self, trades):
+        self.sync.existing_keys(refresh=self.refresh_keys)
+        failed = load_failed_trades(self.failed_path)
+        trades = pd.concat([failed, trades], ignore_index=True) if not failed.empty else trades
+        trades = trades.fillna({"Duration": 1})
+
+        new_trades = self.sync.new_trades(trades)
+        failed = self.sync.append(new_trades)
+        changed_trades = self.sync.changed_trades(trades)
+        failed_updates = self.sync.update(changed_trades)
+        save_failed_trades(pd.concat([failed, failed_updates]).to_dict("records"), self.failed_path)
+        return len(new_trades) - len(failed) + len(changed_trades) - len(failed_updates)
+
+
+class SQLiteSink(Sink):
+    """Local SQLite table with a unique (Symbol, Bought Time) index.
+
+    A trade already in the table is overwritten when any of its fields
+    differ, so corrections reach it like they reach the other sinks.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path="trades.sqlite", table="trades"):
+        self.path = path
+        self.table = table
+
+    def write(self, trades):
+        columns = ", ".join(f'"{col}"' for col in trades.columns)
+        placeholders = ", ".join("?" for _ in trades.columns)
+        fields = [f'"{col}"' for col in trades.columns if col not in ("Symbol", "Bought Time")]
+        updates = ", ".join(f"{field} = excluded.{field}" for field in fields)
+        differs = " OR ".join(f'"{self.table}".{field} IS NOT excluded.{field}' for field in fields)
+        rows = trades.astype(object).where(trades.notna(), None)
+        for col in trades.columns:
+            if pd.api.types.is_datetime64_any_dtype(trades[col]):
+                rows[col] = trades[col].dt.strftime("%Y-%m-%d %H:%M:%S").where(trades[col].notna(), None)
+
+        with sqlite3.connect(self.path) as db:
+            trades.head(0).to_sql(self.table, db, index=False, if_exists="append")
+            # The table keeps the columns of its first write, so add the ones that came later (e.g. a new ATR)
+            known = {row[1] for row in db.execute(f'PRAGMA table_info("{self.table}")')}
+            for col in trades.columns:
+                if col not in known:
+                    kind = ("REAL" if pd.api.types.is_float_dtype(trades[col]) else
+                            "INTEGER" if pd.api.types.is_integer_dtype(trades[col]) else "TEXT")
+                    db.execute(f'ALTER TABLE "{self.table}" ADD COLUMN "{col}" {kind}')
+            db.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{self.table}_key" '
+                       f'ON "{self.table}" ("Symbol", "Bought Time")')
+            before = db.total_changes
+            # Rows whose fields all match are left alone, so they don't count as written
+            db.executemany(f'INSERT INTO "{self.table}" ({columns}) VALUES ({placeholders}) '
+                           f'ON CONFLICT ("Symbol", "Bought Time") DO UPDATE SET {updates} WHERE {differs}',
+                           rows.values.tolist())
+            return db.total_changes - before
+
+
+# -----------------------------
+# 👉 Building Sinks (API clients imported on demand)
+# -----------------------------
+
+SHEETS_SCOPE = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+
+
+def notion_sink(token, database_id, **options):
+    """NotionSink on a notion_client Client; `options` go to NotionSink."""
+    from notion_client import Client
+
+    return NotionSink(Client(auth=token), database_id, **options)
+
+
+def sheets_sink(credentials_file, sheet_name, **options):
+    """SheetsSink on the first worksheet of `sheet_name`, authorized with a service account file."""
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    creds = Credentials.from_service_account_file(credentials_file, scopes=SHEETS_SCOPE)
+    return SheetsSink(gspread.authorize(creds).open(sheet_name).sheet1, sheet_name, **options)
+
+
+def build_sinks(notion_token=None, database_id=None, credentials_file=None, sheet_name=None, sqlite_path=None,
+                notion_options=None, sheets_options=None):
+    """Every sink a run is set up for, importing only the enabled sinks' API clients.
+
+    Notion is enabled by a `database_id`, Google Sheets by a `sheet_name`
+    and SQLite by a `sqlite_path`; the options dicts go to the sink classes.
+    """
+    sinks = []
+    if database_id:
+        sinks.append(notion_sink(notion_token, database_id, **(notion_options or {})))
+    if sheet_name:
+        sinks.append(sheets_sink(credentials_file, sheet_name, **(sheets_options or {})))
+    if sqlite_path:
+        sinks.append(SQLiteSink(sqlite_path))
+    print(f"✅ Sinks ready: {', '.join(sink.name for sink in sinks) or 'none'}")
+    return sinks
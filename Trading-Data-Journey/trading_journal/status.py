@@ -0,0 +1,70 @@
+import csv
+import json
+import os
+
+# -----------------------------
+# 📌 Quick Status (no pandas)
+# -----------------------------
+# Everything here reads the store's files directly, so `python -m trading_journal status`
+# answers without paying for pandas, notion_client or gspread.
+
+FAILED_TRADE_FILES = {"notion": "failed_trades.csv", "google_sheets": "failed_sheets_trades.csv"}
+
+
+def _read_arrow(path, columns=None):
+    import pyarrow.ipc as ipc  # Feather v2 is the Arrow IPC file format; pyarrow.feather would pull in pandas
+
+    with ipc.open_file(path) as reader:
+        table = reader.read_all()
+    return table.select(columns) if columns else table
+
+
+def count_csv_rows(path):
+    """Data rows in a CSV file (0 when it doesn't exist)."""
+    if not os.path.exists(path):
+        return 0
+    with open(path, newline="") as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+
+def store_status(folder="Trade-Store", analytics_folder="Analytics"):
+    """Trade count, date range and each sink's sync position, read straight from the store's files."""
+    status = {"folder": folder, "trades": 0, "last_seq": -1, "first_date": None, "last_date": None, "sinks": {}}
+    # index.feather plus the delta files of later inserts, where a changed trade's newer row replaces the older one
+    index_paths = [os.path.join(folder, "index.feather")]
+    deltas_folder = os.path.join(folder, "index-deltas")
+    if os.path.isdir(deltas_folder):
+        index_paths += sorted(os.path.join(deltas_folder, f) for f in os.listdir(deltas_folder)
+                              if f.endswith(".feather"))
+    latest = {}
+    for path in index_paths:
+        if not os.path.exists(path):
+            continue
+        index = _read_arrow(path, ["Symbol", "Bought Time", "Trade Date", "Seq"])
+        bought = index.column("Bought Time").cast("int64")  # Plain numbers, datetimes would need pandas
+        for key, date, seq in zip(zip(index.column("Symbol").to_pylist(), bought.to_pylist()),
+                                  index.column("Trade Date").to_pylist(), index.column("Seq").to_pylist()):
+            if key not in latest or seq > latest[key][1]:
+                latest[key] = (date, seq)
+    seqs = [seq for _, seq in latest.values()]
+    if seqs:
+        dates = [date for date, _ in latest.values()]
+        status.update(trades=len(seqs), last_seq=max(seqs), first_date=min(dates), last_date=max(dates))
+
+    sync_path = os.path.join(folder, "sync_state.json")
+    marks = {}
+    if os.path.exists(sync_path):
+        with open(sync_path) as f:
+            marks = json.load(f)
+    for sink in sorted(set(marks) | set(FAILED_TRADE_FILES)):
+        mark = marks.get(sink, -1)
+        status["sinks"][sink] = {"synced_seq": mark, "pending": sum(seq > mark for seq in seqs),
+                                 "failed": count_csv_rows(FAILED_TRADE_FILES[sink]) if sink in FAILED_TRADE_FILES else 0}
+
+    cube_path = os.path.join(analytics_folder, "cube.feather")
+    if os.path.exists(cube_path):
+        metadata = _read_arrow(cube_path).schema.metadata or {}
+        cube_seq = json.loads(metadata.get(b"analytics", b"{}")).get("seq", -1)
+        status["sinks"]["analytics"] = {"synced_seq": cube_seq, "pending": sum(seq > cube_seq for seq in seqs),
+                                        "failed": 0}
+    return status
@@ -0,0 +1,263 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from trading_journal.hashing import content_hash
+from trading_journal.schema import compact_trades, expand_trades
+
+# -----------------------------
+# 📌 Append-Only Trade Store
+# -----------------------------
+
+STORE_FOLDER = "Trade-Store"
+KEY_COLUMNS = ["Symbol", "Bought Time"]
+
+# Index rows of later inserts go into small delta files, folded into index.feather once there are
+# this many of them or they hold as many rows as it does, so an insert never rewrites the whole index
+INDEX_DELTA_FILES = 64
+
+
+def _key_values(trades):
+    """(Symbol, Bought Time in ns) pairs identifying each trade."""
+    bought = pd.to_datetime(trades["Bought Time"]).to_numpy().astype("datetime64[ns]").astype(np.int64)
+    return list(zip(trades["Symbol"].astype(str), bought.tolist()))
+
+
+class TradeStore:
+    """Cleaned trades kept as Arrow files partitioned by trade date.
+
+    Every inserted trade gets an increasing `Seq` number. A small index of
+    (Symbol, Bought Time, Trade Date, Seq, Hash, First Seq) lives next to the
+    partitions, so duplicate and change checks are dict lookups and each sink
+    only reads the partitions holding trades newer than the last `Seq` it
+    synced. Each insert adds its index rows as a small delta file instead of
+    rewriting the index. Parts are written in the compact typed form of
+    schema.py and memory-mapped back, so loading them parses nothing.
+    """
+
+    def __init__(self, folder=STORE_FOLDER):
+        self.folder = folder
+        self.index_path = os.path.join(folder, "index.feather")
+        self.deltas_folder = os.path.join(folder, "index-deltas")
+        self.sync_state_path = os.path.join(folder, "sync_state.json")
+        self._index = None
+        self._index_sizes = None  # Rows in index.feather and in each delta file since it was written
+        self._last_seq = None
+        self._keys = None
+        self._sync_lock = threading.Lock()  # Sinks may finish at the same time
+
+    def _empty_index(self):
+        return pd.DataFrame({"Symbol": pd.Series(dtype=str), "Bought Time": pd.Series(dtype="datetime64[ns]"),
+                             "Trade Date": pd.Series(dtype=str), "Seq": pd.Series(dtype=np.int64),
+                             "Hash": pd.Series(dtype=np.uint64), "First Seq": pd.Series(dtype=np.int64)})
+
+    def _delta_files(self):
+        if not os.path.isdir(self.deltas_folder):
+            return []
+        return sorted(os.path.join(self.deltas_folder, f) for f in os.listdir(self.deltas_folder)
+                      if f.endswith(".feather"))
+
+    def _load_index(self):
+        """The index of the current version of every trade; a changed trade's newer row replaces the older one."""
+        if self._index is not None:
+            return self._index
+        if os.path.exists(self.index_path):
+            index = feather.read_table(self.index_path, memory_map=True).to_pandas()
+            if "Hash" not in index.columns:
+                index = self._add_hashes(index)
+        else:
+            index = self._empty_index()
+        deltas = [feather.read_table(path, memory_map=True).to_pandas() for path in self._delta_files()]
+        self._index_sizes = [len(index)] + [len(delta) for delta in deltas]
+        if deltas:
+            index = pd.concat([index, *deltas], ignore_index=True).sort_values("Seq")
+            index = index.drop_duplicates(subset=KEY_COLUMNS, keep="last").reset_index(drop=True)
+        self._index = index
+        return self._index
+
+    def _add_hashes(self, index):
+        """Hash the trades of a store written before content hashes, once."""
+        trades = self._read_partitions(set(index["Trade Date"]), listed_only=False)
+        hash_of = dict(zip(trades["Seq"].tolist(), content_hash(trades).tolist()))
+        index["Hash"] = np.array([hash_of.get(seq, 0) for seq in index["Seq"].tolist()], dtype=np.uint64)
+        index["First Seq"] = index["Seq"]
+        self._write_atomic(index, self.index_path)
+        return index
+
+    def _compact_index(self):
+        """Fold the delta files into index.feather."""
+        deltas = self._delta_files()
+        self._write_atomic(self._index, self.index_path)
+        for path in deltas:
+            os.remove(path)
+        self._index_sizes = [len(self._index)]
+
+    def _key_map(self):
+        """(Symbol, Bought Time) -> (Seq, Hash, First Seq) of every stored trade, built once an insert needs it."""
+        if self._keys is None:
+            index = self._load_index()
+            self._keys = dict(zip(_key_values(index), zip(index["Seq"].tolist(), index["Hash"].tolist(),
+                                                          index["First Seq"].tolist())))
+        return self._keys
+
+    def __len__(self):
+        return len(self._load_index())
+
+    def __contains__(self, key):
+        """`(symbol, bought_time) in store`"""
+        symbol, bought_time = key
+        return (symbol, pd.Timestamp(bought_time).as_unit("ns").value) in self._key_map()
+
+    @property
+    def last_seq(self):
+        if self._last_seq is None:
+            index = self._load_index()
+            self._last_seq = int(index["Seq"].max()) if len(index) else -1
+        return self._last_seq
+
+    def _write_atomic(self, table, path):
+        tmp_path = path + ".tmp"
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+
+    def insert(self, trades):
+        """Store new trades and new versions of changed ones; returns how many were written.
+
+        A trade already stored with the same content hash is skipped. One
+        whose fields changed (say it was re-cleaned with corrected fees) is
+        written again under a new Seq, so every sink sees it as pending, and
+        the index drops the old version's Seq, which hides its row.
+
+        The last row wins when a key comes up more than once, whether within
+        one batch or across batches, so re-inserting the same fills in any
+        chunking stores the same trades.
+        """
+        keys = self._key_map()
+        trades = trades.drop_duplicates(subset=KEY_COLUMNS, keep="last").copy()
+        trades["Bought Time"] = pd.to_datetime(trades["Bought Time"]).astype("datetime64[ns]")
+
+        hashes = content_hash(trades)
+        stored = [keys.get(key) for key in _key_values(trades)]
+        is_written = np.fromiter((entry is None or entry[1] != trade_hash for entry, trade_hash in zip(stored, hashes)),
+                                 dtype=bool, count=len(trades))
+        new_trades = trades[is_written].reset_index(drop=True)
+        if new_trades.empty:
+            return 0
+        hashes = hashes[is_written]
+        stored = [entry for entry, written in zip(stored, is_written) if written]  # Key map entry, None if new
+
+        first_seq = self.last_seq + 1
+        new_trades["Seq"] = np.arange(first_seq, first_seq + len(new_trades), dtype=np.int64)
+        trade_dates = new_trades["Bought Time"].dt.strftime("%Y-%m-%d")
+
+        # One new part file per trade date touched by this insert
+        for trade_date, part in new_trades.groupby(trade_dates):
+            partition = os.path.join(self.folder, trade_date)
+            os.makedirs(partition, exist_ok=True)
+            self._write_atomic(compact_trades(part.reset_index(drop=True)),
+                               os.path.join(partition, f"{part['Seq'].iloc[0]:012d}.feather"))
+
+        # A changed trade keeps the Seq it was first stored under, so readers can tell it was seen before
+        original_seqs = [entry[2] if entry else seq for entry, seq in zip(stored, new_trades["Seq"].tolist())]
+        new_index = pd.DataFrame({"Symbol": new_trades["Symbol"].astype(str), "Bought Time": new_trades["Bought Time"],
+                                  "Trade Date": trade_dates, "Seq": new_trades["Seq"], "Hash": hashes,
+                                  "First Seq": np.array(original_seqs, dtype=np.int64)})
+
+        # The delta file makes the insert visible; the versions it replaces drop out of the index
+        index = self._load_index()
+        os.makedirs(self.deltas_folder, exist_ok=True)
+        self._write_atomic(new_index, os.path.join(self.deltas_folder, f"{first_seq:012d}.feather"))
+        replaced_seqs = [entry[0] for entry in stored if entry]
+        if replaced_seqs:
+            index = index[~index["Seq"].isin(replaced_seqs)]
+        self._index = pd.concat([index, new_index], ignore_index=True)
+        self._index_sizes.append(len(new_index))
+        self._last_seq = int(new_trades["Seq"].iloc[-1])
+        keys.update(zip(_key_values(new_index), zip(new_index["Seq"].tolist(), hashes.tolist(), original_seqs)))
+
+        if len(self._index_sizes) > INDEX_DELTA_FILES or sum(self._index_sizes[1:]) >= self._index_sizes[0]:
+            self._compact_index()
+        return len(new_trades)
+
+    def _read_partitions(self, trade_dates, compact=False, listed_only=True):
+        tables = []
+        for trade_date in sorted(trade_dates):
+            partition = os.path.join(self.folder, trade_date)
+            if not os.path.isdir(partition):
+                continue
+            for name in sorted(os.listdir(partition)):
+                if name.endswith(".feather"):
+                    tables.append(feather.read_table(os.path.join(partition, name), memory_map=True))
+        if not tables:
+            return pd.DataFrame(columns=[*KEY_COLUMNS, "Seq"])
+
+        if all(table.schema.equals(tables[0].schema) for table in tables):
+            # One conversion for all parts; their category dictionaries are unified on the way
+            trades = pa.concat_tables(tables).to_pandas()
+        else:
+            # Parts written before the compact format have the journal columns
+            trades = pd.concat([expand_trades(table.to_pandas()) for table in tables], ignore_index=True)
+        trades = trades if compact else expand_trades(trades)
+
+        # Ignore part files left behind by an insert that never reached the index
+        return trades[trades["Seq"].isin(self._load_index()["Seq"])] if listed_only else trades
+
+    def load(self, since=None, until=None, compact=False):
+        """Trades bought in [since, until], reading only the matching date partitions.
+
+        With `compact=True` the trades keep their stored form (see schema.py)
+        instead of being expanded to the journal's columns.
+        """
+        index = self._load_index()
+        trade_dates = index["Trade Date"]
+        if since is not None:
+            trade_dates = trade_dates[trade_dates >= pd.Timestamp(since).strftime("%Y-%m-%d")]
+        if until is not None:
+            trade_dates = trade_dates[trade_dates <= pd.Timestamp(until).strftime("%Y-%m-%d")]
+
+        trades = self._read_partitions(set(trade_dates), compact=compact)
+        if since is not None:
+            trades = trades[trades["Bought Time"] >= pd.Timestamp(since)]
+        if until is not None:
+            trades = trades[trades["Bought Time"] <= pd.Timestamp(until)]
+        return trades.sort_values("Seq").reset_index(drop=True)
+
+    def _sync_state(self):
+        if not os.path.exists(self.sync_state_path):
+            return {}
+        with open(self.sync_state_path) as f:
+            return json.load(f)
+
+    def synced_seq(self, sink):
+        return self._sync_state().get(sink, -1)
+
+    def changed_after(self, seq):
+        """How many trades stored after `seq` are new versions of trades stored at or before it."""
+        index = self._load_index()
+        return int(((index["Seq"] > seq) & (index["First Seq"] <= seq)).sum())
+
+    def after(self, seq):
+        """Trades inserted after `seq`, reading only the partitions that hold them."""
+        index = self._load_index()
+        trades = self._read_partitions(set(index.loc[index["Seq"] > seq, "Trade Date"]))
+        return trades[trades["Seq"] > seq].sort_values("Seq").reset_index(drop=True)
+
+    def unsynced(self, sink):
+        """Trades inserted after the last one `sink` marked as synced."""
+        return self.after(self.synced_seq(sink))
+
+    def mark_synced(self, sink, seq):
+        """Record that `sink` has handled every trade up to and including `seq`."""
+        os.makedirs(self.folder, exist_ok=True)
+        with self._sync_lock:
+            state = self._sync_state()
+            state[sink] = max(int(seq), state.get(sink, -1))
+            tmp_path = self.sync_state_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_path, self.sync_state_path)
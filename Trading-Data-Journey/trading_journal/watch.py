@@ -0,0 +1,347 @@
+import ctypes
+import ctypes.util
+import glob
+import io
+import json
+import os
+import select
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+from trading_journal.atr import ATR_PERIOD, TIMEFRAMES, TRADE_CLOCK_OFFSET, IncrementalATR, atr_column
+from trading_journal.ingest import StreamingCleaner, is_tradovate_export
+from trading_journal.market_data import data_ticker
+from trading_journal.pipeline import publish
+
+# -----------------------------
+# 📌 Live Watch Mode
+# -----------------------------
+
+# Byte offset reached in each export, kept next to the trade store
+WATCH_STATE_FILE = "watch_offsets.json"
+
+# Seconds between checks when inotify is unavailable (and between release checks when it is)
+POLL_INTERVAL = 1.0
+
+# 1-minute ATR values kept in memory per contract root (about two trading days)
+RING_BARS = 2 * 23 * 60
+
+# Seconds between bar downloads for the same ticker while trades are newer than its last bar
+BAR_REFRESH_SECONDS = 30
+
+# inotify events that mean an export was created, grew or was moved into the folder
+IN_MODIFY, IN_CLOSE_WRITE, IN_MOVED_TO, IN_CREATE = 0x2, 0x8, 0x80, 0x100
+
+
+def trade_clock_now():
+    """The current time on the trades' clock (New York + 8 hours, no time zone)."""
+    return pd.Timestamp.now(tz="America/New_York").tz_localize(None) + TRADE_CLOCK_OFFSET
+
+
+def to_trade_clock(times):
+    """UTC bar times on the trades' clock, the way build_atr_frame() converts them."""
+    return times.dt.tz_convert("America/New_York").dt.tz_localize(None) + TRADE_CLOCK_OFFSET
+
+
+class ExportTail:
+    """Reads the complete rows appended to one export since the last call.
+
+    Only the bytes after `offset` are read; a trailing line without its
+    newline is left for the next call. A file that shrinks or is replaced is
+    read again from the top.
+    """
+
+    def __init__(self, path, offset=0):
+        self.path = path
+        self.offset = offset
+        self.header = None
+        self.inode = None
+
+    def read_new(self):
+        """New rows as a raw export frame, or None when nothing complete was added."""
+        stat = os.stat(self.path)
+        if stat.st_size < self.offset or (self.inode is not None and stat.st_ino != self.inode):
+            self.offset, self.header = 0, None
+        self.inode = stat.st_ino
+        if stat.st_size == self.offset:
+            return None
+
+        with open(self.path, "rb") as f:
+            if self.header is None:
+                header = f.readline()
+                if not header.endswith(b"\n"):
+                    return None  # Header still being written
+                self.header = header
+                self.offset = max(self.offset, len(header))
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return None
+        self.offset += end
+        return pd.read_csv(io.BytesIO(self.header + data[:end]))
+
+
+class Inotify:
+    """Wait for changes in one folder with Linux inotify, called through libc so no package is needed."""
+
+    def __init__(self, folder):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {folder}")
+
+    def wait(self, timeout):
+        """Block until something in the folder changes or `timeout` seconds pass."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass  # Drain the events, the watcher looks at every export anyway
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class LiveATR:
+    """ATR of one contract root kept current as 1-minute bars arrive.
+
+    The Wilder state lives in an IncrementalATR, so new bars cost O(1) each,
+    and the values of the last `ring_bars` bars stay in a ring buffer for the
+    as-of join. Higher timeframes get the value of their whole bar, as in
+    compute_atr(); only the bar that is still forming is provisional.
+    """
+
+    def __init__(self, symbol, bar_cache, timeframes=("1m", "5m"), periods=(ATR_PERIOD,), ring_bars=RING_BARS,
+                 refresh_seconds=BAR_REFRESH_SECONDS):
+        self.symbol = symbol
+        self.ticker = data_ticker(symbol)
+        self.bar_cache = bar_cache
+        self.timeframes = list(timeframes)
+        self.periods = list(periods)
+        self.refresh_seconds = refresh_seconds
+        self.atr = IncrementalATR(timeframes, periods)
+        self.ring = deque(maxlen=ring_bars)
+        self.last_bar = None
+        self._refreshed_at = None
+        self._frame = None
+
+    @property
+    def columns(self):
+        return [atr_column(tf, p) for tf in self.timeframes for p in self.periods]
+
+    def extend(self, bars):
+        """Feed the bars newer than the last one seen."""
+        if self.last_bar is not None:
+            bars = bars[bars["Datetime"] > self.last_bar]
+        if bars.empty:
+            return
+        self.ring.extend(self.atr.update(bars).itertuples(index=False, name=None))
+        self.last_bar = bars["Datetime"].max()
+        self._frame = None
+
+    def refresh(self, since=None):
+        """Download the bars after the last one (at most every `refresh_seconds`) and feed them in."""
+        now = time.monotonic()
+        if self._refreshed_at is not None and now - self._refreshed_at < self.refresh_seconds:
+            return
+        self._refreshed_at = now
+        self.bar_cache.refresh(self.ticker, "1m")
+        since = self.last_bar if self.last_bar is not None else since
+        self.extend(self.bar_cache.load(self.ticker, "1m", since=since))
+
+    def covers(self, first):
+        """True when the ring reaches back to an entry at `first` (trade clock); later ones use the last bar."""
+        frame = self.frame()
+        return not frame.empty and frame["Datetime"].iloc[0] <= first
+
+    def frame(self):
+        """The ring buffer as an ATR frame on the trades' clock, like build_atr_frame() returns."""
+        if self._frame is None:
+            atr = pd.DataFrame(list(self.ring), columns=["Datetime", *self.columns])
+            for timeframe in self.timeframes:
+                if timeframe == "1m":
+                    continue
+                bar_start = atr["Datetime"].dt.floor(TIMEFRAMES[timeframe])
+                columns = [atr_column(timeframe, p) for p in self.periods]
+                atr[columns] = atr.groupby(bar_start)[columns].transform("last")
+            if not atr.empty:
+                atr["Datetime"] = to_trade_clock(atr["Datetime"])
+            self._frame = atr.assign(symbol=self.symbol)
+        return self._frame
+
+
+class LiveCleaner(StreamingCleaner):
+    """StreamingCleaner whose ATR comes from per-symbol LiveATR ring buffers.
+
+    Trades older than a ring (a backlog being caught up on) fall back to the
+    windowed ATR of the streaming cleaner.
+    """
+
+    def __init__(self, bar_cache=None, ring_bars=RING_BARS, refresh_seconds=BAR_REFRESH_SECONDS,
+                 clock=trade_clock_now, **options):
+        super().__init__(bar_cache=bar_cache, **options)
+        self.ring_bars = ring_bars
+        self.refresh_seconds = refresh_seconds
+        self.clock = clock
+        self._live = {}
+
+    def _live_atr(self, symbol, first, last):
+        live = self._live.get(symbol)
+        if live is None:
+            if first < self.clock() - pd.Timedelta(minutes=self.ring_bars):
+                return None
+            live = self._live[symbol] = LiveATR(symbol, self.bar_cache, self.timeframes, self.periods,
+                                                ring_bars=self.ring_bars, refresh_seconds=self.refresh_seconds)
+            since = first - self.warmup - TRADE_CLOCK_OFFSET
+            live.refresh(since=since.tz_localize("America/New_York", ambiguous="NaT", nonexistent="shift_forward"))
+        elif live.frame().empty or last > live.frame()["Datetime"].iloc[-1]:
+            live.refresh()  # Trades newer than the last bar, fetch the tail
+        return live if live.covers(first) else None
+
+    def _atr_frame(self, trades):
+        frames, backlog = [], []
+        for symbol, entries in trades.groupby("symbol")["Trade Entry Time"]:
+            live = self._live_atr(symbol, entries.min(), entries.max())
+            if live is None:
+                backlog.append(symbol)
+            else:
+                frames.append(live.frame())
+        if backlog:
+            frames.append(super()._atr_frame(trades[trades["symbol"].isin(backlog)]))
+        return pd.concat(frames, ignore_index=True)
+
+
+class ExportWatcher:
+    """Tail the Tradovate exports in a folder and push finished trades to the sinks as they appear.
+
+    Each step reads only the bytes appended since the last one, runs them
+    through one long-lived LiveCleaner (so the 5-second merge state and the
+    ATR ring buffers stay in memory), stores the trades that are complete and
+    publishes them. A trade is complete once its first fill is more than the
+    merge window older than `clock()`, or a later fill starts another trade.
+    """
+
+    def __init__(self, folder, store, sinks, bar_cache=None, poll_interval=POLL_INTERVAL, use_inotify=True,
+                 state_path=None, clock=trade_clock_now, **options):
+        self.folder = folder
+        self.store = store
+        self.sinks = sinks
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.state_path = state_path or os.path.join(store.folder, WATCH_STATE_FILE)
+        self.clock = clock
+        self.cleaner = LiveCleaner(bar_cache=bar_cache, clock=clock, **options)
+        self.tails = {}  # path -> ExportTail
+        self.rows_read = 0
+        self._skipped = {}  # path -> size when it was last found not to be an export
+        self._offsets = self._load_offsets()
+
+    def _load_offsets(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def _save_offsets(self):
+        """Save how far each export was read, only while no fills are held back, so a restart never loses one."""
+        if self.cleaner.pending_rows:
+            return
+        offsets = {path: tail.offset for path, tail in self.tails.items()}
+        if offsets == self._offsets:
+            return
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(offsets, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+        self._offsets = offsets
+
+    def _tail(self, path):
+        tail = self.tails.get(path)
+        if tail is None:
+            size = os.path.getsize(path)
+            if os.path.basename(path).startswith("Cleaned_Trades_") or self._skipped.get(path) == size:
+                return None
+            if not is_tradovate_export(path):
+                self._skipped[path] = size  # Checked again once it changes, it may still be half written
+                return None
+            tail = self.tails[path] = ExportTail(path, self._offsets.get(path, 0))
+        return tail
+
+    def _new_rows(self):
+        chunks = []
+        for path in sorted(glob.glob(os.path.join(self.folder, "*.csv"))):
+            tail = self._tail(path)
+            rows = tail.read_new() if tail is not None else None
+            if rows is not None and len(rows):
+                chunks.append(rows)
+        return chunks
+
+    def step(self):
+        """Process what was written since the last step.
+
+        Returns the number of new or changed trades stored and publish()'s per-sink results.
+        """
+        finished = []
+        for rows in self._new_rows():
+            self.rows_read += len(rows)
+            finished.append(self.cleaner.process(rows))
+        finished.append(self.cleaner.release(self.clock()))
+        return self._store_and_publish(finished)
+
+    def _store_and_publish(self, finished):
+        finished = [trades for trades in finished if not trades.empty]
+        inserted, results = 0, {}
+        if finished:
+            inserted = self.store.insert(pd.concat(finished, ignore_index=True))
+            if inserted:
+                results = publish(self.store, self.sinks)
+        self._save_offsets()
+        return inserted, results
+
+    def flush(self):
+        """Store and publish the trades still held back (on shutdown)."""
+        return self._store_and_publish([self.cleaner.flush()])
+
+    def run(self, stop=None):
+        """Watch until interrupted (or `stop`, a threading.Event, is set), then flush."""
+        stop = stop if stop is not None else threading.Event()
+        notifier = None
+        if self.use_inotify:
+            try:
+                notifier = Inotify(self.folder)
+            except (OSError, AttributeError) as e:
+                print(f"⚠️ Warning: inotify unavailable, polling every {self.poll_interval}s instead - {e}")
+        print(f"👀 Watching {self.folder} for new fills ({'inotify' if notifier else 'polling'})")
+
+        try:
+            while not stop.is_set():
+                inserted, results = self.step()
+                if inserted:
+                    summary = ", ".join(f"{name}: {'failed' if isinstance(result, Exception) else result}"
+                                        for name, result in results.items())
+                    print(f"✅ {inserted} new or changed trades stored{' → ' + summary if summary else ''}")
+                if notifier is not None:
+                    notifier.wait(self.poll_interval)
+                else:
+                    stop.wait(self.poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            inserted, _ = self.flush()
+            if notifier is not None:
+                notifier.close()
+            print(f"🛑 Stopped watching, {inserted} held-back trades flushed")